@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to benchmark the hot paths of the sport of life program.
+Each case is timed at each tour size and reported as operations, matches, points and seasons per second.
+The odds case replays a tournament on a pool of processes, so with ``--table`` it also checks that the table players can be copied and pickled.
+The results can be saved as JSON and compared with a saved baseline.
+The program exits with 1 if any case is slower than the baseline by more than the threshold.
+
+    python benchmark.py --sizes 80 1000 --output baseline.json
+    python benchmark.py --sizes 80 1000 --baseline baseline.json --threshold 0.2
+'''
+
+# System libraries.
+import sys
+import argparse
+import io
+import json
+import platform
+import time
+
+# Application Libraries.
+from sport_of_life import Game
+from draw_index import DrawIndex
+from hall_of_fame import HallOfFame
+from champions import Champions
+import bracket
+import clock
+import match_engine
+import rng
+import tournament_odds
+
+
+
+# The tour sizes to benchmark.
+SIZES = (80, 1000, 10000, 100000)
+
+# The benchmark cases.
+CASES = ('match-fast', 'match-animated', 'round', 'open', 'seeded', 'world', 'odds', 'updateSkill', 'showRanking', 'season')
+
+# The number of matches in the match cases.
+NUM_MATCHES = 10000
+
+# The number of replicates and processes in the odds case.  Two processes so that the players are pickled to the workers.
+NUM_ODDS_REPLICATES = 16
+NUM_ODDS_PROCESSES = 2
+
+
+
+class BenchmarkGame(Game):
+    '''
+    Class to represent a game that counts the matches and points that it plays.
+    The output is captured in memory rather than displayed and the clock never sleeps.
+
+    :ivar int numMatches: The number of matches played.
+    :ivar int numPoints: The number of points played.
+    :ivar io.StringIO buffer: The captured output.
+    '''
+
+
+
+    def __init__(self, seed):
+        ''' Class constructor for the :py:class:`BenchmarkGame` class. '''
+        super().__init__()
+        self.setHeadless()
+        self.clock.speed = clock.VIRTUAL
+        self.streams = rng.RandomStreams(seed)
+        self.random = self.streams.season(0)
+        self.numMatches = 0
+        self.numPoints = 0
+        self.buffer = io.StringIO()
+
+
+
+    def captureOutput(self):
+        ''' Format the output as if there is a terminal, but write it to the buffer. '''
+        self.isHeadless = False
+        self.output = self.capture
+        self.buffer = io.StringIO()
+
+
+
+    def capture(self, *args, sep=' ', end='\n', flush=False):    # pylint: disable=unused-argument
+        ''' Replacement for print() that writes to the buffer. '''
+        self.buffer.write(sep.join(str(arg) for arg in args) + end)
+
+
+
+    def playMatch(self, player1, player2, winTarget):
+        ''' Play a match and count the matches and points. '''
+        result = super().playMatch(player1, player2, winTarget)
+        self.numMatches += 1
+        self.numPoints += self.lastScore[0] + self.lastScore[1]
+        return result
+
+
+
+def createGame(size, seed, isPlayerTable):
+    ''' Returns a new :py:class:`BenchmarkGame` with a tour of the specified size. '''
+    game = BenchmarkGame(seed)
+    game.isPlayerTable = isPlayerTable
+    game.players = game.createPlayers(size)
+    game.retiredPlayers = HallOfFame()
+    game.seasons = Champions()
+    game.showRanking(game.players, True, 0)
+    return game
+
+
+
+def runCase(game, case):
+    ''' Run one benchmark case once.  Returns the number of operations. '''
+    players = game.players
+    if case in ('match-fast', 'match-animated'):
+        game.engine = match_engine.FAST if case == 'match-fast' else match_engine.ANIMATED
+        numPlayers = len(players)
+        for matchIndex in range(NUM_MATCHES):
+            game.playMatch(players[matchIndex % numPlayers], players[(matchIndex * 7 + 1) % numPlayers], 9)
+        return NUM_MATCHES
+    if case == 'round':
+        game.engine = match_engine.FAST
+        for player in players:
+            player.round = 1
+        draw = DrawIndex(players, game.random)
+        game.playRound(draw, 1, 1, 2, 0, len(players) // 2, 6)
+        game.ratings.endRound()
+        return 1
+    if case in ('open', 'seeded', 'world'):
+        spec = {'open': bracket.OPEN, 'seeded': bracket.SEEDED, 'world': bracket.WORLD_CHAMPIONSHIP}[case]
+        game.playBracket(players, spec, case, 100000.0)
+        return 1
+    if case == 'odds':
+        if game.oddsEngine is None:
+            game.oddsEngine = tournament_odds.OddsEngine(NUM_ODDS_PROCESSES)
+        game.oddsEngine.odds(players, tournament_odds.SEEDED, NUM_ODDS_REPLICATES, game.streams.derive(rng.ODDS, game.seasonIndex))
+        return 1
+    if case == 'updateSkill':
+        game.updateSkill(players)
+        return 1
+    if case == 'showRanking':
+        game.captureOutput()
+        game.showRanking(players, True, 80)
+        game.setHeadless()
+        return 1
+    if case == 'season':
+        game.retiredPlayers = game.playSeason(players, game.seasons, game.retiredPlayers, game.seasonIndex, game.prizeMoney)
+        game.recordSeason(players, game.seasons, game.seasonIndex)
+        game.seasonIndex += 1
+        return 1
+    raise ValueError(f'Unknown benchmark case "{case}".')
+
+
+
+def benchmark(case, size, repeat, seed, isPlayerTable):
+    '''
+    Returns the result of the best of repeat runs of the case at the size.
+
+    :param str case: The benchmark case.
+    :param int size: The number of players on the tour.
+    :param int repeat: The number of times to run the case.  The fastest run is reported.
+    :param int seed: The master seed of the random numbers.
+    :param bool isPlayerTable: True to hold the players in a :py:class:`~player_table.PlayerTable`.
+    '''
+    game = createGame(size, seed, isPlayerTable)
+    best = None
+    for _repeat in range(repeat):
+        game.numMatches = 0
+        game.numPoints = 0
+        startTime = time.perf_counter()
+        numOperations = runCase(game, case)
+        elapsedTime = max(time.perf_counter() - startTime, 1e-9)
+        if best is None or elapsedTime < best['seconds']:
+            best = {
+                'seconds': elapsedTime,
+                'operationsPerSecond': numOperations / elapsedTime,
+                'matchesPerSecond': game.numMatches / elapsedTime,
+                'pointsPerSecond': game.numPoints / elapsedTime,
+            }
+            if case == 'season':
+                best['seasonsPerSecond'] = numOperations / elapsedTime
+    if game.oddsEngine is not None:
+        game.oddsEngine.close()
+    return best
+
+
+
+def isSameMode(results, baseline):
+    ''' Returns True if the results and the baseline hold the players in the same way.  A baseline without the mode used a list of players. '''
+    return results['isPlayerTable'] == baseline.get('isPlayerTable', False)
+
+
+
+def findRegressions(results, baseline, threshold):
+    '''
+    Returns a description of each case that is slower than the baseline by more than the threshold.
+    Raises ValueError if the baseline holds the players in a different way, the times of a list and a table can not be compared.
+    '''
+    if not isSameMode(results, baseline):
+        raise ValueError('The baseline and the results do not both use the --table option.')
+    regressions = []
+    for case, sizes in results['cases'].items():
+        for size, result in sizes.items():
+            expected = baseline.get('cases', {}).get(case, {}).get(size)
+            if expected is None:
+                continue
+            ratio = result['operationsPerSecond'] / expected['operationsPerSecond']
+            if ratio < 1.0 - threshold:
+                regressions.append(f'{case} at {size} players is {1.0 - ratio:.1%} slower than the baseline.')
+    return regressions
+
+
+
+def main():
+    ''' Run the benchmarks from the command line. '''
+    argParse = argparse.ArgumentParser(prog='benchmark', description='Benchmark the hot paths of the sport of life program.')
+    argParse.add_argument('-c', '--cases', help='The cases to run.', nargs='+', choices=CASES, default=list(CASES))
+    argParse.add_argument('-s', '--sizes', help='The tour sizes to run.', nargs='+', type=int, default=list(SIZES))
+    argParse.add_argument('-r', '--repeat', help='The number of runs of each case.  The fastest run is reported.', type=int, default=3)
+    argParse.add_argument('--seed', help='The master seed of the random numbers.', type=int, default=1968)
+    argParse.add_argument('-t', '--table', help='Hold the players in an array backed table (requires NumPy).', action='store_true')
+    argParse.add_argument('-o', '--output', help='Save the results to this JSON file.', default=None)
+    argParse.add_argument('-b', '--baseline', help='Compare the results with this JSON file.', default=None)
+    argParse.add_argument('--threshold', help='The fraction slower than the baseline that is a regression.', type=float, default=0.1)
+    args = argParse.parse_args()
+
+    results = {'python': platform.python_version(), 'platform': platform.platform(), 'isPlayerTable': args.table, 'cases': {}}
+
+    # Check the baseline before the cases are run.
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        if not isSameMode(results, baseline):
+            option = 'with' if baseline.get('isPlayerTable', False) else 'without'
+            print(f'The baseline {args.baseline} was run {option} the --table option.  Run the benchmark the same way to compare.')
+            sys.exit(1)
+
+    print(f'{"Case":<16}{"Players":>8}{"Seconds":>10}{"Ops/sec":>12}{"Matches/sec":>14}{"Points/sec":>14}')
+    for case in args.cases:
+        results['cases'][case] = {}
+        for size in args.sizes:
+            result = benchmark(case, size, args.repeat, args.seed, args.table)
+            results['cases'][case][str(size)] = result
+            print(f'{case:<16}{size:>8}{result["seconds"]:>10.4f}{result["operationsPerSecond"]:>12,.1f}{result["matchesPerSecond"]:>14,.0f}{result["pointsPerSecond"]:>14,.0f}')
+
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4)
+
+    if baseline is not None:
+        regressions = findRegressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(regression)
+        if regressions:
+            sys.exit(1)
+        print(f'No regressions compared with {args.baseline}.')
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the tournament draws of the sport of life program.
+A :py:class:`BracketSpec` is a declarative description of a draw.
+It is compiled once for a number of players into a :py:class:`BracketPlan`, a flat list of steps for :py:meth:`~sport_of_life.Game.playBracket`.
+The number of qualifying rounds grows with the number of players.
+A tour that is too small to fill the main draw plays a smaller main draw without the early rounds.
+
+For example a 256 player event with 32 seeds.
+
+    BracketSpec(' (Seeded)', numSeeds=32, qualifyingTarget=5, roundTargets=[6, 6, 9, 10, 13, 17], pointsTable=[0, 1, 2, 4, 8, 16, 32, 64])
+'''
+
+
+
+# The types of step in a compiled plan.
+# ('title', name) Display the name of the round.
+# ('round', keyHome, keyAway, keyWin, keyLose, numMatches, scoreTarget) Play a round, see Game.playRound().
+# ('merge', fromKey, toKey) Move all the players in one round into another round.
+TITLE = 'title'
+ROUND = 'round'
+MERGE = 'merge'
+
+# The names of the last rounds of a tournament.
+FINAL_ROUND_NAMES = ['Quarter Finals', 'Semi Finals', 'Final']
+
+# The names of the early rounds of a tournament.
+EARLY_ROUND_NAMES = ['One', 'Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten']
+
+# The seed order of the original 16 seed tournaments.  Each seed plays a qualifier, the winners of neighbouring matches meet.
+CLASSIC_SEED_ORDER = [1, 16, 9, 8, 5, 11, 13, 4, 3, 14, 12, 6, 7, 10, 15, 2]
+
+# The percentage of the prize money for each stage of the original tournaments.
+CLASSIC_MONEY_TABLE = [0, 13, 28, 42, 56, 75, 100]
+
+
+
+def standardSeedOrder(numSeeds):
+    ''' Returns the standard seed order for a draw, so that seeds 1 and 2 can only meet in the final. '''
+    order = [1]
+    while len(order) < numSeeds:
+        size = 2 * len(order)
+        order = [seed for top in order for seed in (top, size + 1 - top)]
+    return order
+
+
+
+def roundNames(numRounds):
+    ''' Returns the names of the main rounds of a tournament. '''
+    names = FINAL_ROUND_NAMES[-numRounds:]
+    for roundIndex in range(numRounds - len(names) - 1, -1, -1):
+        number = EARLY_ROUND_NAMES[roundIndex] if roundIndex < len(EARLY_ROUND_NAMES) else str(roundIndex + 1)
+        names.insert(0, f'Round {number}')
+    return names
+
+
+
+def defaultMoneyTable(numRounds):
+    ''' Returns the percentage of the prize money for each stage, the winner gets 100%. '''
+    return [0] + [round(100 * 0.75 ** (numRounds - stage)) for stage in range(numRounds + 1)]
+
+
+
+class BracketPlan:
+    '''
+    Class to represent a tournament draw compiled for a number of players.
+
+    :ivar int numPlayers: The number of players in the draw.
+    :ivar int numSeeds: The number of seeded players.  Seed n starts in round n, the unseeded players start in round numSeeds + 1.
+    :ivar list steps: The flat list of steps to play the draw.
+    :ivar list pointsTable: The ranking points for each stage.
+    :ivar list moneyTable: The percentage of the prize money for each stage.
+    :ivar list stageNames: The name of each stage.  Stage 0 is losing in qualifying and the last stage is the winner.
+    :ivar bool isWorldChampionship: True if the winner is the world champion.
+    '''
+
+
+
+    def __init__(self, numPlayers, numSeeds, steps, pointsTable, moneyTable, stageNames, isWorldChampionship):
+        ''' Class constructor for the :py:class:`BracketPlan` class. '''
+        self.numPlayers = numPlayers
+        self.numSeeds = numSeeds
+        self.steps = steps
+        self.pointsTable = pointsTable
+        self.moneyTable = moneyTable
+        self.stageNames = stageNames
+        self.isWorldChampionship = isWorldChampionship
+
+
+
+    @property
+    def numStages(self):
+        ''' The number of stages that a player can finish at. '''
+        return len(self.stageNames)
+
+
+
+class BracketSpec:
+    '''
+    Class to describe a tournament draw.
+    With seeds, each seed plays a qualifier in the first round and the bracket is fixed from then on.
+    Without seeds, the players are drawn at random in every round.
+    The number of qualifying rounds is derived from the number of players.
+
+    :ivar str heading: The text after the tournament title in the heading.
+    :ivar int numSeeds: The number of seeds.  0 for an open draw.
+    :ivar int qualifyingTarget: The race-to target in qualifying.
+    :ivar list roundTargets: The race-to target in each main round.
+    :ivar list pointsTable: The ranking points for each stage.
+    :ivar list moneyTable: The percentage of the prize money for each stage.
+    :ivar list seedOrder: The order the seeds are placed in the draw.
+    :ivar bool isWorldChampionship: True if the winner is the world champion.
+    '''
+
+
+
+    def __init__(self, heading, numSeeds, qualifyingTarget, roundTargets, pointsTable, moneyTable=None, seedOrder=None, isWorldChampionship=False):
+        ''' Class constructor for the :py:class:`BracketSpec` class. '''
+        numRounds = len(roundTargets)
+        if numSeeds != 0 and 2 * numSeeds != 2 ** numRounds:
+            raise ValueError(f'{numSeeds} seeds do not fill a main draw of {numRounds} rounds.')
+        if len(pointsTable) != numRounds + 2:
+            raise ValueError(f'The points table needs {numRounds + 2} stages.')
+        self.heading = heading
+        self.numSeeds = numSeeds
+        self.qualifyingTarget = qualifyingTarget
+        self.roundTargets = list(roundTargets)
+        self.pointsTable = list(pointsTable)
+        self.moneyTable = list(moneyTable) if moneyTable is not None else defaultMoneyTable(numRounds)
+        self.seedOrder = list(seedOrder) if seedOrder is not None else standardSeedOrder(numSeeds)
+        self.isWorldChampionship = isWorldChampionship
+        self.plans = {}
+
+
+
+    def plan(self, numPlayers):
+        ''' Returns the :py:class:`BracketPlan` for the specified number of players.  Each plan is only compiled once. '''
+        plan = self.plans.get(numPlayers)
+        if plan is None:
+            plan = self.compile(numPlayers)
+            self.plans[numPlayers] = plan
+        return plan
+
+
+
+    def compile(self, numPlayers):
+        ''' Returns a new :py:class:`BracketPlan` for the specified number of players. '''
+        if numPlayers < 2:
+            raise ValueError(f'{numPlayers} players can not play a tournament.')
+
+        # Drop the early rounds until the main draw fits the players.
+        numDropped = 0
+        while 2 ** (len(self.roundTargets) - numDropped) > numPlayers:
+            numDropped += 1
+        roundTargets = self.roundTargets[numDropped:]
+        pointsTable = self.pointsTable[:1] + self.pointsTable[1 + numDropped:]
+        moneyTable = self.moneyTable[:1] + self.moneyTable[1 + numDropped:]
+        numSeeds = self.numSeeds >> numDropped
+        seedOrder = self.seedOrder if numDropped == 0 else standardSeedOrder(numSeeds)
+
+        numRounds = len(roundTargets)
+        mainDrawSize = 2 ** numRounds
+        names = roundNames(numRounds)
+        steps = []
+
+        # Qualifying reduces the unseeded players to fill the main draw.
+        poolKey = numSeeds + 1
+        numQualifiers = mainDrawSize - numSeeds
+        numUnseeded = numPlayers - numSeeds
+        if numUnseeded < numQualifiers:
+            raise ValueError(f'{numPlayers} players can not fill a main draw of {mainDrawSize}.')
+        numQualifying = 0
+        while numQualifiers * 2 ** numQualifying < numUnseeded:
+            numQualifying += 1
+        nextKey = poolKey + 1
+        poolSize = numUnseeded
+        for qualifyingIndex in range(numQualifying):
+            targetSize = numQualifiers * 2 ** (numQualifying - qualifyingIndex - 1)
+            steps.append((TITLE, f'Qualifying {qualifyingIndex + 1}'))
+            steps.append((ROUND, poolKey, poolKey, nextKey, 0, poolSize - targetSize, self.qualifyingTarget))
+            if poolSize < 2 * targetSize:
+                # Players with a bye join the winners.
+                steps.append((MERGE, poolKey, nextKey))
+            poolKey = nextKey
+            nextKey += 1
+            poolSize = targetSize
+
+        # The main draw.
+        if numSeeds == 0:
+            # Open draw, the players are drawn at random in every round.
+            for roundIndex in range(numRounds):
+                keyWin = poolKey + 1 if roundIndex < numRounds - 1 else -(numRounds + 1)
+                steps.append((TITLE, names[roundIndex]))
+                steps.append((ROUND, poolKey, poolKey, keyWin, -(roundIndex + 1), mainDrawSize // 2 ** (roundIndex + 1), roundTargets[roundIndex]))
+                poolKey = keyWin
+        else:
+            # Seeded draw, each seed plays a qualifier and then the bracket is fixed.
+            keys = []
+            steps.append((TITLE, names[0]))
+            for matchIndex, seed in enumerate(seedOrder):
+                keyWin = nextKey + matchIndex // 2 if numRounds > 1 else -2
+                steps.append((ROUND, seed, poolKey, keyWin, -1, 1, roundTargets[0]))
+                if matchIndex % 2 == 0:
+                    keys.append(keyWin)
+            nextKey += len(keys)
+            for roundIndex in range(1, numRounds):
+                steps.append((TITLE, names[roundIndex]))
+                winKeys = []
+                for matchIndex, key in enumerate(keys):
+                    keyWin = nextKey + matchIndex // 2 if roundIndex < numRounds - 1 else -(numRounds + 1)
+                    steps.append((ROUND, key, key, keyWin, -(roundIndex + 1), 1, roundTargets[roundIndex]))
+                    if matchIndex % 2 == 0:
+                        winKeys.append(keyWin)
+                nextKey += len(winKeys)
+                keys = winKeys
+
+        stageNames = ['Qualifying'] + names + ['Winner']
+        return BracketPlan(numPlayers, numSeeds, steps, pointsTable, moneyTable, stageNames, self.isWorldChampionship)
+
+
+
+# The tournaments of the sport of life program.
+SEEDED = BracketSpec(' (Seeded)', 16, 5, [6, 9, 10, 13, 17], [0, 1, 2, 4, 8, 16, 32], CLASSIC_MONEY_TABLE, CLASSIC_SEED_ORDER)
+WORLD_CHAMPIONSHIP = BracketSpec('', 16, 10, [10, 13, 13, 17, 18], [0, 2, 4, 8, 16, 32, 64], CLASSIC_MONEY_TABLE, CLASSIC_SEED_ORDER, isWorldChampionship=True)
+# The world championship draw in a lower division of a league.  The winner is not the world champion.
+DIVISION_CHAMPIONSHIP = BracketSpec('', 16, 10, [10, 13, 13, 17, 18], [0, 2, 4, 8, 16, 32, 64], CLASSIC_MONEY_TABLE, CLASSIC_SEED_ORDER)
+OPEN = BracketSpec(' (Open)', 0, 5, [6, 6, 6, 9, 10], [0, 1, 2, 4, 8, 16, 32], CLASSIC_MONEY_TABLE)
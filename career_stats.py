@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement CareerStats, the statistics of many simulated tours of the sport of life program.
+The game passes each tournament, retirement and season to the statistics as it happens.
+Only running totals are kept, so the memory used does not depend on how many tours are played.
+The statistics from each worker process are merged at the end.
+
+    python career_stats.py --runs 1000 --seasons 40
+'''
+
+# System libraries.
+import argparse
+import collections
+import math
+import time
+
+# Application Libraries.
+from sport_of_life import Game
+from hall_of_fame import HallOfFame
+from champions import Champions
+import rng
+from process_pool import ProcessPool, defaultNumProcesses, splitChunks
+
+
+
+class RunningStats:
+    '''
+    Class to represent the count, mean, variance, minimum and maximum of a stream of values.
+    The mean and variance use Welford's method, so they are accurate for any number of values.
+
+    :ivar int count: The number of values.
+    :ivar float mean: The mean of the values.
+    :ivar float m2: The sum of the squared differences from the mean.
+    :ivar float minimum: The smallest value.
+    :ivar float maximum: The largest value.
+    '''
+
+
+
+    def __init__(self):
+        ''' Class constructor for the :py:class:`RunningStats` class. '''
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+
+
+    def add(self, value):
+        ''' Add a value to the statistics. '''
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+
+
+    def merge(self, other):
+        ''' Add the values of the other statistics to these statistics. '''
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+
+    def variance(self):
+        ''' Returns the sample variance of the values. '''
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+
+    def stdev(self):
+        ''' Returns the sample standard deviation of the values. '''
+        return math.sqrt(self.variance())
+
+
+
+class Histogram:
+    '''
+    Class to count values in bins of equal width.
+    Values outside the range are counted as underflow and overflow.
+
+    :ivar float low: The low edge of the first bin.
+    :ivar float width: The width of each bin.
+    :ivar list counts: The number of values in each bin.
+    :ivar int underflow: The number of values below the first bin.
+    :ivar int overflow: The number of values above the last bin.
+    '''
+
+
+
+    def __init__(self, low, high, numBins):
+        '''
+        Class constructor for the :py:class:`Histogram` class.
+
+        :param float low: The low edge of the first bin.
+        :param float high: The high edge of the last bin.
+        :param int numBins: The number of bins.
+        '''
+        self.low = low
+        self.width = (high - low) / numBins
+        self.counts = [0] * numBins
+        self.underflow = 0
+        self.overflow = 0
+
+
+
+    def add(self, value):
+        ''' Count a value in its bin. '''
+        binIndex = math.floor((value - self.low) / self.width)
+        if binIndex < 0:
+            self.underflow += 1
+        elif binIndex >= len(self.counts):
+            self.overflow += 1
+        else:
+            self.counts[binIndex] += 1
+
+
+
+    def merge(self, other):
+        ''' Add the counts of the other histogram, with the same bins, to this histogram. '''
+        self.counts = [count + otherCount for count, otherCount in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+
+
+    def lines(self, width=50):
+        ''' Returns the lines of a text bar chart of the histogram. '''
+        largest = max(self.counts) or 1
+        lines = []
+        for binIndex, count in enumerate(self.counts):
+            if count > 0:
+                lines.append(f'{self.low + binIndex * self.width:>8g} {count:>10,} {"#" * round(width * count / largest)}')
+        return lines
+
+
+
+class QuantileSketch:
+    '''
+    Class to estimate the quantiles of a stream of values that are not negative.
+    Each value is counted in a bucket that grows geometrically, so any quantile is within the relative accuracy of the true value.
+    The number of buckets only grows with the logarithm of the range of the values and two sketches merge by adding their counts.
+
+    :ivar float gamma: The ratio of the upper edge to the lower edge of each bucket.
+    :ivar float logGamma: The natural logarithm of gamma.
+    :ivar dict counts: The number of values in each bucket.
+    :ivar int zeroCount: The number of values that are zero.
+    :ivar int count: The number of values.
+    '''
+
+
+
+    def __init__(self, relativeAccuracy=0.01):
+        '''
+        Class constructor for the :py:class:`QuantileSketch` class.
+
+        :param float relativeAccuracy: The relative accuracy of the quantiles.
+        '''
+        self.gamma = (1.0 + relativeAccuracy) / (1.0 - relativeAccuracy)
+        self.logGamma = math.log(self.gamma)
+        self.counts = {}
+        self.zeroCount = 0
+        self.count = 0
+
+
+
+    def add(self, value):
+        ''' Count a value in its bucket. '''
+        self.count += 1
+        if value <= 0:
+            self.zeroCount += 1
+            return
+        bucket = math.ceil(math.log(value) / self.logGamma)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+
+
+
+    def merge(self, other):
+        ''' Add the counts of the other sketch, with the same accuracy, to this sketch. '''
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.zeroCount += other.zeroCount
+        self.count += other.count
+
+
+
+    def quantile(self, fraction):
+        ''' Returns the estimate of the specified quantile, for example 0.5 for the median, or None if there are no values. '''
+        if self.count == 0:
+            return None
+        rank = fraction * (self.count - 1)
+        total = self.zeroCount
+        if rank < total:
+            return 0.0
+        for bucket in sorted(self.counts):
+            total += self.counts[bucket]
+            if rank < total:
+                # The middle of the bucket has the smallest relative error.
+                return 2.0 * self.gamma ** bucket / (self.gamma + 1.0)
+        return 2.0 * self.gamma ** max(self.counts) / (self.gamma + 1.0)
+
+
+
+class Metric:
+    '''
+    Class to represent the running statistics, quantiles and histogram of one measurement.
+
+    :ivar str description: The description of the measurement.
+    :ivar RunningStats stats: The count, mean and variance of the values.
+    :ivar QuantileSketch sketch: The quantiles of the values.
+    :ivar Histogram histogram: The histogram of the values.
+    '''
+
+
+
+    def __init__(self, description, low, high, numBins):
+        '''
+        Class constructor for the :py:class:`Metric` class.
+
+        :param str description: The description of the measurement.
+        :param float low: The low edge of the histogram.
+        :param float high: The high edge of the histogram.
+        :param int numBins: The number of bins in the histogram.
+        '''
+        self.description = description
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch()
+        self.histogram = Histogram(low, high, numBins)
+
+
+
+    def add(self, value):
+        ''' Add a value to the statistics, quantiles and histogram. '''
+        self.stats.add(value)
+        self.sketch.add(value)
+        self.histogram.add(value)
+
+
+
+    def merge(self, other):
+        ''' Add the values of the other metric to this metric. '''
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+
+
+
+# The measurements.  Description, histogram low, histogram high, number of bins.
+METRICS = {
+    'careerLength': ('Seasons on the tour of a retired player that joined during the run', 0, 40, 40),
+    'careerWins': ('Tournament wins of a retired player that joined during the run', 0, 60, 30),
+    'retirementAge': ('Age of a player at retirement', 17, 57, 40),
+    'topSeedWin': ('1 if the number 1 seed won a tournament, 0 otherwise', 0, 2, 2),
+    'worldTopSeedWin': ('1 if the number 1 seed won the world championship, 0 otherwise', 0, 2, 2),
+    'seasonDominance': ('Share of the tournaments in a season won by the most successful player', 0, 1.0001, 6),
+    'numberOneWins': ('Career tournament wins of the season end number 1', 0, 60, 30),
+}
+
+
+
+class CareerStats:
+    '''
+    Class to collect the statistics of many simulated tours.
+    The state of the current run is bounded by the number of players on the tour and is cleared by :py:meth:`endRun`.
+
+    :ivar dict metrics: The :py:class:`Metric` of each measurement.
+    :ivar int numRuns: The number of runs.
+    :ivar int numSeasons: The number of seasons.
+    :ivar dict joinSeasons: The season that each player who joined during the current run joined the tour.
+    :ivar Counter seasonWins: The tournaments won by each player in the current season.
+    :ivar int numRunTournaments: The number of tournaments in the current run.
+    '''
+
+
+
+    def __init__(self):
+        ''' Class constructor for the :py:class:`CareerStats` class. '''
+        self.metrics = {name: Metric(*spec) for name, spec in METRICS.items()}
+        self.numRuns = 0
+        self.numSeasons = 0
+        self.joinSeasons = {}
+        self.seasonWins = collections.Counter()
+        self.numRunTournaments = 0
+
+
+
+    def addTournament(self, winner, isWorldChampionship):
+        ''' Add the winner of a tournament.  The ranking of the winner is still the ranking from before the tournament. '''
+        self.numRunTournaments += 1
+        self.seasonWins[winner.playerId] += 1
+        if self.numRunTournaments == 1:
+            # There is no ranking before the first tournament.
+            return
+        isTopSeed = 1 if winner.ranking == 1 else 0
+        self.metrics['topSeedWin'].add(isTopSeed)
+        if isWorldChampionship:
+            self.metrics['worldTopSeedWin'].add(isTopSeed)
+
+
+
+    def addRetirement(self, seasonIndex, retiredPlayer, newPlayer):
+        ''' Add a player that has retired in the specified season and the new player that replaced them. '''
+        self.metrics['retirementAge'].add(retiredPlayer.age)
+        joinSeason = self.joinSeasons.pop(retiredPlayer.playerId, None)
+        if joinSeason is not None:
+            # The players at the start of the run joined before the run, so their careers are not complete.
+            self.metrics['careerLength'].add(seasonIndex - joinSeason)
+            self.metrics['careerWins'].add(retiredPlayer.wins)
+        self.joinSeasons[newPlayer.playerId] = seasonIndex
+
+
+
+    def addSeason(self, players):
+        ''' Add the end of a season. '''
+        self.numSeasons += 1
+        numTournaments = sum(self.seasonWins.values())
+        if numTournaments > 0:
+            self.metrics['seasonDominance'].add(max(self.seasonWins.values()) / numTournaments)
+        for player in players:
+            if player.ranking == 1:
+                self.metrics['numberOneWins'].add(player.wins)
+        self.seasonWins.clear()
+
+
+
+    def endRun(self):
+        ''' End a run.  The players still on the tour have not finished their careers. '''
+        self.numRuns += 1
+        self.joinSeasons.clear()
+        self.seasonWins.clear()
+        self.numRunTournaments = 0
+
+
+
+    def merge(self, other):
+        ''' Add the statistics of the other runs to these statistics. '''
+        for name, metric in self.metrics.items():
+            metric.merge(other.metrics[name])
+        self.numRuns += other.numRuns
+        self.numSeasons += other.numSeasons
+
+
+
+    def report(self):
+        ''' Returns the lines of a summary of the statistics. '''
+        lines = [f'{self.numRuns:,} runs of {self.numSeasons:,} seasons.']
+        lines.append(f'{"Metric":<18}{"Count":>12}{"Mean":>10}{"StDev":>10}{"Min":>8}{"10%":>8}{"Median":>8}{"90%":>8}{"Max":>8}')
+        for name, metric in self.metrics.items():
+            stats = metric.stats
+            if stats.count == 0:
+                lines.append(f'{name:<18}{0:>12}')
+                continue
+            quantiles = ''.join(f'{metric.sketch.quantile(fraction):>8.3g}' for fraction in (0.1, 0.5, 0.9))
+            lines.append(f'{name:<18}{stats.count:>12,}{stats.mean:>10.4g}{stats.stdev():>10.4g}{stats.minimum:>8.3g}{quantiles}{stats.maximum:>8.3g}')
+        return lines
+
+
+
+def playRuns(firstRun, numRuns, numPlayers, numSeasons, seed):
+    '''
+    Returns the :py:class:`CareerStats` of the specified runs.
+    This is the worker function for the process pool.
+    Each run has its own random number streams, so the results do not depend on the number of processes.
+
+    :param int firstRun: The index of the first run.
+    :param int numRuns: The number of runs.
+    :param int numPlayers: The number of players on the tour.
+    :param int numSeasons: The number of seasons in each run.
+    :param int seed: The master seed.
+    '''
+    careerStats = CareerStats()
+    streams = rng.RandomStreams(seed)
+    for runIndex in range(firstRun, firstRun + numRuns):
+        game = Game()
+        game.setHeadless()
+        game.streams = rng.RandomStreams(streams.derive(rng.CAREER, runIndex))
+        game.careerStats = careerStats
+        game.players = game.createPlayers(numPlayers)
+        game.retiredPlayers = HallOfFame()
+        game.seasons = Champions()
+        game.run(numSeasons)
+        careerStats.endRun()
+    return careerStats
+
+
+
+def main():
+    ''' Play many tours from the command line and display the statistics. '''
+    argParse = argparse.ArgumentParser(prog='career_stats', description='Play many tours of the sport of life and display the statistics of the careers.')
+    argParse.add_argument('-r', '--runs', help='The number of tours to play.', type=int, default=100)
+    argParse.add_argument('-s', '--seasons', help='The number of seasons in each tour.', type=int, default=40)
+    argParse.add_argument('-p', '--players', help='The number of players on each tour.', type=int, default=80)
+    argParse.add_argument('--processes', help='The number of processes.  Default is one for each core.', type=int, default=None)
+    argParse.add_argument('--seed', help='The master seed of the random number streams.  The same seed gives the same statistics.', type=int, default=None)
+    argParse.add_argument('--histogram', help='Display the histogram of this metric.', choices=list(METRICS), default='careerLength')
+    args = argParse.parse_args()
+
+    seed = args.seed if args.seed is not None else rng.newSeed()
+    numProcesses = args.processes if args.processes is not None else defaultNumProcesses()
+    numProcesses = max(1, min(numProcesses, args.runs))
+
+    # Share the runs between the processes.
+    tasks = [(firstRun, numRuns, args.players, args.seasons, seed) for firstRun, numRuns in splitChunks(args.runs, numProcesses)]
+
+    startTime = time.perf_counter()
+    with ProcessPool(numProcesses) as pool:
+        results = pool.map(playRuns, tasks)
+    careerStats = CareerStats()
+    for result in results:
+        careerStats.merge(result)
+    elapsedTime = time.perf_counter() - startTime
+
+    print(f'Played in {elapsedTime:.2f}s with {numProcesses} processes.  Seed {seed}.')
+    print('\n'.join(careerStats.report()))
+    metric = careerStats.metrics[args.histogram]
+    print(f'{args.histogram}: {metric.description}')
+    print('\n'.join(metric.histogram.lines()))
+
+
+
+if __name__ == '__main__':
+    main()
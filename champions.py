@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement Champions, the history of the tournament winners in the sport of life program.
+The history is held in columns.
+There is one row for each tournament and one row for each season.
+Only a window of the seasons is formatted for display, so the display costs the same however long the history is.
+'''
+
+# System libraries.
+import array
+
+
+
+# The events of a season.  The value is the column of the event in the display.
+WORLD_CHAMPIONSHIP = 0
+CHINA_OPEN = 1
+GERMAN_MASTERS = 2
+UK_CHAMPIONSHIP = 3
+WELSH_OPEN = 4
+SHANGHAI_MASTERS = 5
+NUM_EVENTS = 6
+
+# The heading of the display.
+HEADINGS = ('     World                 China                 German                UK                    Welsh                 Shanghai', '     Champion              Open                  Masters               Championship          Open                  Masters')
+
+# The width of a name in the display.
+NAME_WIDTH = 22
+
+# The columns of the history.
+COLUMNS = ('eventYear', 'eventType', 'winnerId', 'seasonYear', 'numberOneId', 'numberOnePts', 'topEarnerId', 'topEarnerMoney')
+
+
+
+class Champions:
+    '''
+    Class to represent the history of the tournament winners as columns.
+    The class behaves like the list of formatted season lines that it replaces.
+
+    :ivar array.array eventYear: The season of each tournament row.
+    :ivar array.array eventType: The event of each tournament row.
+    :ivar array.array winnerId: The playerId of the winner of each tournament row.
+    :ivar array.array seasonYear: The season of each season row.
+    :ivar array.array numberOneId: The playerId of the season end number 1 of each season row.
+    :ivar array.array numberOnePts: The pts of the season end number 1 of each season row.
+    :ivar array.array topEarnerId: The playerId of the top earner of each season row.
+    :ivar array.array topEarnerMoney: The season prize money of the top earner of each season row.
+    :ivar dict names: The name of each playerId in the history.
+    :ivar dict playerEvents: The tournament rows won by each playerId.
+    :ivar dict eventRows: The tournament rows of each event.
+    :ivar dict seasonEvents: The first tournament row of each season.
+    '''
+
+
+
+    def __init__(self):
+        ''' Class constructor for the :py:class:`Champions` class. '''
+        self.eventYear = array.array('i')
+        self.eventType = array.array('B')
+        self.winnerId = array.array('q')
+        self.seasonYear = array.array('i')
+        self.numberOneId = array.array('q')
+        self.numberOnePts = array.array('i')
+        self.topEarnerId = array.array('q')
+        self.topEarnerMoney = array.array('d')
+        self.names = {}
+        self.playerEvents = {}
+        self.eventRows = {}
+        self.seasonEvents = {}
+
+
+
+    def __len__(self):
+        ''' Returns the number of completed seasons. '''
+        return len(self.seasonYear)
+
+
+
+    def __getitem__(self, index):
+        ''' Returns the formatted line of the specified season row. '''
+        return self.seasonLine(range(len(self.seasonYear))[index])
+
+
+
+    def __iter__(self):
+        ''' Iterate through the formatted lines of the seasons. '''
+        for row in range(len(self.seasonYear)):
+            yield self.seasonLine(row)
+
+
+
+    def buildIndexes(self):
+        ''' Build the indexes from the columns, for example after the columns have been loaded. '''
+        self.playerEvents = {}
+        self.eventRows = {}
+        self.seasonEvents = {}
+        self.indexRows(0)
+
+
+
+    def indexRows(self, firstRow):
+        ''' Add the tournament rows from firstRow onwards to the indexes. '''
+        for row in range(firstRow, len(self.eventYear)):
+            playerId = self.winnerId[row]
+            self.playerEvents.setdefault(playerId, []).append(row)
+            self.eventRows.setdefault(self.eventType[row], []).append(row)
+            self.seasonEvents.setdefault(self.eventYear[row], row)
+
+
+
+    def extend(self, other):
+        ''' Add the rows of another history to the end of this history, for example a season played in another process. '''
+        firstRow = len(self.eventYear)
+        for column in COLUMNS:
+            getattr(self, column).extend(getattr(other, column))
+        self.names.update(other.names)
+        self.indexRows(firstRow)
+
+
+
+    def addWinner(self, year, event, player):
+        ''' Add the winner of a tournament to the history. '''
+        row = len(self.eventYear)
+        self.eventYear.append(year)
+        self.eventType.append(event)
+        self.winnerId.append(player.playerId)
+        self.names[player.playerId] = player.name
+        self.playerEvents.setdefault(player.playerId, []).append(row)
+        self.eventRows.setdefault(event, []).append(row)
+        self.seasonEvents.setdefault(year, row)
+
+
+
+    def addSeason(self, year, numberOne, topEarner):
+        ''' Add the season end summary to the history. '''
+        self.seasonYear.append(year)
+        self.numberOneId.append(numberOne.playerId)
+        self.numberOnePts.append(numberOne.pts)
+        self.topEarnerId.append(topEarner.playerId)
+        self.topEarnerMoney.append(topEarner.seasonMoney)
+        self.names[numberOne.playerId] = numberOne.name
+        self.names[topEarner.playerId] = topEarner.name
+
+
+
+    def seasonWinners(self, year):
+        ''' Returns the names of the winners of each event in the specified season.  The events that have not been played are empty. '''
+        winners = [''] * NUM_EVENTS
+        row = self.seasonEvents.get(year)
+        if row is not None:
+            while row < len(self.eventYear) and self.eventYear[row] == year:
+                winners[self.eventType[row]] = self.names[self.winnerId[row]]
+                row += 1
+        return winners
+
+
+
+    def seasonLine(self, row):
+        ''' Returns the formatted line of the specified season row. '''
+        year = self.seasonYear[row]
+        description = ''.join(f'{name:<{NAME_WIDTH}}' for name in self.seasonWinners(year))
+        return f'{year} {description} {self.numberOnePts[row]:>4} {self.names[self.numberOneId[row]]:<22} {self.topEarnerMoney[row]:>12,.2f} {self.names[self.topEarnerId[row]]}'
+
+
+
+    def currentLine(self, year):
+        ''' Returns the formatted line of the events played so far in the current season. '''
+        winners = self.seasonWinners(year)
+        description = ''.join(f'{name:<{NAME_WIDTH}}' for name in winners).rstrip()
+        return f'{year} {description}'
+
+
+
+    def numPages(self, numSeasons):
+        ''' Returns the number of pages of numSeasons seasons. '''
+        return max(1, (len(self.seasonYear) + numSeasons - 1) // numSeasons)
+
+
+
+    def window(self, numSeasons, page=0):
+        '''
+        Returns the formatted lines of a window of the seasons, oldest first.
+
+        :param int numSeasons: The number of seasons in the window.
+        :param int page: The page of the window.  Page 0 is the latest seasons, page 1 the seasons before those and so on.
+        '''
+        stop = max(0, len(self.seasonYear) - page * numSeasons)
+        start = max(0, stop - numSeasons)
+        return [self.seasonLine(row) for row in range(start, stop)]
+
+
+
+    def winsOf(self, playerId):
+        ''' Returns the (year, event) of each tournament won by the player. '''
+        return [(self.eventYear[row], self.eventType[row]) for row in self.playerEvents.get(playerId, ())]
+
+
+
+    def winnersOf(self, event):
+        ''' Returns the (year, playerId) of each winner of the event. '''
+        return [(self.eventYear[row], self.winnerId[row]) for row in self.eventRows.get(event, ())]
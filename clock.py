@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement Clock, the pacing of the sport of life program.
+Every delay in the game goes through the clock, so one speed setting controls the throughput of the whole game.
+The clock counts the game time of every delay.  At an infinite speed the game time is virtual and the clock never sleeps.
+'''
+
+# System libraries.
+import math
+import time
+
+# Application Libraries.
+import profiler
+
+
+
+# The speeds of the clock.
+REAL_TIME = 1.0
+FAST = 10.0
+VIRTUAL = math.inf
+
+# The speeds in the order that they are selected.
+SPEEDS = (REAL_TIME, FAST, VIRTUAL)
+
+
+
+def speedName(speed):
+    ''' Returns the description of the specified speed. '''
+    if speed == VIRTUAL:
+        return 'no waits'
+    if speed == REAL_TIME:
+        return 'real time'
+    return f'{speed:g} times real time'
+
+
+
+class Clock:
+    '''
+    Class to represent the clock that every delay in the game goes through.
+
+    :ivar float speed: The speed multiplier.  The game time of each delay is divided by the speed, VIRTUAL never sleeps.
+    :ivar float time: The game time of all the delays so far in seconds.
+    :ivar bool isSkipping: True to skip the delays until :py:meth:`stopSkipping`, for example to complete a tournament.
+    :ivar bool isPaused: True if the game is paused.
+    :ivar int numSteps: The number of delays that may pass while the game is paused.
+    :ivar idle: The function to call while the game is paused.  This should process the keys that resume or step the game.
+    :ivar sleep: The function that sleeps for real time.
+    :ivar PhaseProfiler profiler: The profiler that the waiting time is added to, or None.
+    '''
+
+
+
+    def __init__(self, speed=REAL_TIME, sleep=time.sleep):
+        '''
+        Class constructor for the :py:class:`Clock` class.
+
+        :param float speed: The speed multiplier.
+        :param sleep: The function that sleeps for real time.
+        '''
+        self.speed = speed
+        self.time = 0.0
+        self.isSkipping = False
+        self.isPaused = False
+        self.numSteps = 0
+        self.idle = None
+        self.sleep = sleep
+        self.profiler = None
+
+
+
+    def wait(self, seconds):
+        ''' Wait for the specified number of seconds of game time.  A paused game waits here until it is resumed or stepped. '''
+        phaseProfiler = self.profiler
+        if phaseProfiler is not None:
+            startTime = phaseProfiler.clock()
+        while self.isPaused and self.numSteps == 0:
+            if self.idle is None:
+                # There is nothing to resume the game.
+                self.isPaused = False
+            else:
+                self.idle()
+        if self.numSteps > 0:
+            self.numSteps -= 1
+        self.time += seconds
+        if not self.isSkipping and self.speed != VIRTUAL:
+            self.sleep(seconds / self.speed)
+        if phaseProfiler is not None:
+            phaseProfiler.add(profiler.WAITING, phaseProfiler.clock() - startTime)
+
+
+
+    def nextSpeed(self):
+        ''' Select the next speed of :py:data:`SPEEDS` and return it. '''
+        index = SPEEDS.index(self.speed) + 1 if self.speed in SPEEDS else 0
+        self.speed = SPEEDS[index % len(SPEEDS)]
+        return self.speed
+
+
+
+    def skip(self):
+        ''' Skip the delays until :py:meth:`stopSkipping` is called. '''
+        self.isSkipping = True
+
+
+
+    def stopSkipping(self):
+        ''' Stop skipping the delays. '''
+        self.isSkipping = False
+
+
+
+    def pause(self):
+        ''' Pause the game, or resume the game if it is paused. '''
+        self.isPaused = not self.isPaused
+        self.numSteps = 0
+
+
+
+    def step(self):
+        ''' Let the paused game run to the next delay. '''
+        if self.isPaused:
+            self.numSteps += 1
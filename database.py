@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement Database, the SQLite store of the sport of life program.
+The database is in WAL mode, so it can be queried while a game is writing to it.
+The matches of a tournament are held in memory and written with the tournament in one transaction.
+The players are written once a season in one transaction.
+Each tournament holds the range of its matchIds, so the matches of a tournament do not need an index.
+The matches are indexed by the winner and the loser, so the matches of a player are found without reading the whole table.
+The number of matches won and lost by each player is counted in memory and added to the players table, so a career record does not count the matches.
+
+    python database.py FILE --champions
+    python database.py FILE --player ID
+'''
+
+# System libraries.
+import argparse
+import collections
+import sqlite3
+import sys
+
+
+
+# The tables and indexes of the database.
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS players (
+    playerId INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    skill INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    runnerUp INTEGER NOT NULL,
+    worldChampion INTEGER NOT NULL,
+    topRanking INTEGER NOT NULL,
+    prizeMoney REAL NOT NULL,
+    firstWin INTEGER,
+    lastWin INTEGER,
+    isRetired INTEGER NOT NULL,
+    matchesWon INTEGER NOT NULL,
+    matchesLost INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS playersName ON players (name);
+CREATE TABLE IF NOT EXISTS tournaments (
+    tournamentId INTEGER PRIMARY KEY,
+    season INTEGER NOT NULL,
+    tournament INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    isWorldChampionship INTEGER NOT NULL,
+    prizeMoney REAL NOT NULL,
+    winnerId INTEGER,
+    runnerUpId INTEGER,
+    firstMatchId INTEGER NOT NULL,
+    lastMatchId INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tournamentsSeason ON tournaments (season, tournament);
+CREATE INDEX IF NOT EXISTS tournamentsWinner ON tournaments (winnerId);
+CREATE INDEX IF NOT EXISTS tournamentsWorldChampion ON tournaments (season) WHERE isWorldChampionship;
+CREATE TABLE IF NOT EXISTS matches (
+    matchId INTEGER PRIMARY KEY,
+    tournamentId INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    winnerId INTEGER NOT NULL,
+    loserId INTEGER NOT NULL,
+    winnerScore INTEGER NOT NULL,
+    loserScore INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matchesWinner ON matches (winnerId);
+CREATE INDEX IF NOT EXISTS matchesLoser ON matches (loserId);
+CREATE TABLE IF NOT EXISTS seasons (
+    season INTEGER PRIMARY KEY,
+    numberOneId INTEGER NOT NULL,
+    numberOnePts INTEGER NOT NULL,
+    topEarnerId INTEGER NOT NULL,
+    topEarnerMoney REAL NOT NULL
+);
+'''
+
+# Insert a player or update the career of an existing player.
+# The name of a player does not change, so the name index is not updated.  The matches are added to the existing totals.
+UPSERT_PLAYER = '''
+INSERT INTO players (playerId, name, age, skill, wins, runnerUp, worldChampion, topRanking, prizeMoney, firstWin, lastWin, isRetired, matchesWon, matchesLost) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (playerId) DO UPDATE SET age = excluded.age, skill = excluded.skill, wins = excluded.wins, runnerUp = excluded.runnerUp, worldChampion = excluded.worldChampion,
+    topRanking = excluded.topRanking, prizeMoney = excluded.prizeMoney, firstWin = excluded.firstWin, lastWin = excluded.lastWin, isRetired = excluded.isRetired,
+    matchesWon = players.matchesWon + excluded.matchesWon, matchesLost = players.matchesLost + excluded.matchesLost
+'''
+
+CareerRecord = collections.namedtuple('CareerRecord', ['playerId', 'name', 'age', 'wins', 'runnerUp', 'worldChampion', 'prizeMoney', 'firstWin', 'lastWin', 'isRetired', 'matchesWon', 'matchesLost', 'titles'])
+
+# The open databases by file name.  A pickled player finds the database again when it is unpickled in the same process.
+openDatabases = {}
+
+
+
+def findDatabase(fileName):
+    ''' Returns the open database with the specified file name or None if the database is not open in this process. '''
+    return openDatabases.get(fileName)
+
+
+
+class Database:
+    '''
+    Class to store the players, tournaments, matches and seasons of the game in a SQLite database.
+
+    :ivar str fileName: The name of the database file.
+    :ivar bool isReadOnly: True if the database is only queried.
+    :ivar sqlite3.Connection connection: The connection to the database.
+    :ivar int tournamentId: The tournamentId of the tournament being played.
+    :ivar int matchId: The last matchId in the database.
+    :ivar tuple tournament: The (tournamentId, season, tournament, event, isWorldChampionship, prizeMoney) of the tournament being played.
+    :ivar list matches: The (tournamentId, round, winnerId, loserId, winnerScore, loserScore) of the matches of the tournament being played.
+    :ivar list retiredPlayers: The players that have retired since the players were last written.
+    :ivar Counter matchesWon: The number of matches won by each playerId since the players were last written.
+    :ivar Counter matchesLost: The number of matches lost by each playerId since the players were last written.
+    '''
+
+
+
+    def __init__(self, fileName, isReadOnly=False):
+        '''
+        Class constructor for the :py:class:`Database` class.
+        The tables are created if they do not exist.
+        A read only database must already exist and is never changed, for example to query a database that a game is writing.
+
+        :param str fileName: The name of the database file.
+        :param bool isReadOnly: True to only query the database.
+        '''
+        self.fileName = fileName
+        self.isReadOnly = isReadOnly
+        if isReadOnly:
+            self.connection = sqlite3.connect(f'file:{fileName}?mode=ro', uri=True)
+        else:
+            self.connection = sqlite3.connect(fileName)
+            self.connection.execute('PRAGMA journal_mode = WAL')
+            self.connection.execute('PRAGMA synchronous = NORMAL')
+            self.connection.executescript(SCHEMA)
+        # The tournamentId is given to each match as it is played, so the rows are ready to write.
+        self.tournamentId, = self.connection.execute('SELECT COALESCE(MAX(tournamentId), 0) FROM tournaments').fetchone()
+        self.matchId, = self.connection.execute('SELECT COALESCE(MAX(matchId), 0) FROM matches').fetchone()
+        self.tournament = None
+        self.matches = []
+        self.retiredPlayers = []
+        self.matchesWon = collections.Counter()
+        self.matchesLost = collections.Counter()
+        openDatabases[fileName] = self
+
+
+
+    def __reduce__(self):
+        ''' Pickle the database as its file name. '''
+        return findDatabase, (self.fileName,)
+
+
+
+    def close(self):
+        ''' Write the retired players and close the database. '''
+        if self.connection is None:
+            return
+        if not self.isReadOnly:
+            with self.connection:
+                self.writePlayers([])
+        self.connection.close()
+        self.connection = None
+        if openDatabases.get(self.fileName) is self:
+            del openDatabases[self.fileName]
+
+
+
+    def playerRow(self, player, isRetired):
+        ''' Returns the row of the players table for the player.  The matches are the matches since the player was last written. '''
+        playerId = player.playerId
+        return (playerId, player.name, int(player.age), int(player.skill), int(player.wins), int(player.runnerUp), int(player.worldChampion), int(player.topRanking), float(player.prizeMoney), player.firstWin, player.lastWin, isRetired, self.matchesWon[playerId], self.matchesLost[playerId])
+
+
+
+    def writePlayers(self, players):
+        ''' Write the retired players and the specified players in the current transaction. '''
+        rows = [self.playerRow(player, True) for player in self.retiredPlayers]
+        rows.extend([self.playerRow(player, False) for player in players])
+        self.connection.executemany(UPSERT_PLAYER, rows)
+        self.retiredPlayers = []
+        self.matchesWon.clear()
+        self.matchesLost.clear()
+
+
+
+    def startTournament(self, season, tournament, event, isWorldChampionship, prizeMoney):
+        '''
+        Start holding the matches of a tournament.
+
+        :param int season: The season of the tournament.
+        :param int tournament: The index of the tournament in the season.
+        :param str event: The name of the tournament.
+        :param bool isWorldChampionship: True if the winner is the world champion.
+        :param float prizeMoney: The prize money of the tournament.
+        '''
+        self.tournamentId += 1
+        self.tournament = (self.tournamentId, season, tournament, event, isWorldChampionship, prizeMoney)
+        self.matches = []
+
+
+
+    def addMatch(self, roundIndex, winner, loser, winnerScore, loserScore):
+        '''
+        Add the result of a match to the tournament being played.
+
+        :param int roundIndex: The stage of the loser of the match.  0 is qualifying.
+        :param Player winner: The winner of the match.
+        :param Player loser: The loser of the match.
+        :param int winnerScore: The score of the winner.
+        :param int loserScore: The score of the loser.
+        '''
+        self.matches.append((self.tournamentId, roundIndex, winner.playerId, loser.playerId, winnerScore, loserScore))
+
+
+
+    def endTournament(self, winner):
+        ''' Write the tournament and all its matches in one transaction.  The runner up is the loser of the last match. '''
+        matches = self.matches
+        runnerUpId = matches[-1][3] if matches else None
+        firstMatchId = self.matchId + 1
+        self.matchId += len(matches)
+        with self.connection:
+            self.connection.execute('INSERT INTO tournaments (tournamentId, season, tournament, event, isWorldChampionship, prizeMoney, winnerId, runnerUpId, firstMatchId, lastMatchId) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', self.tournament + (winner.playerId, runnerUpId, firstMatchId, self.matchId))
+            # The matches are given the next matchIds in order.
+            self.connection.executemany('INSERT INTO matches (tournamentId, round, winnerId, loserId, winnerScore, loserScore) VALUES (?, ?, ?, ?, ?, ?)', matches)
+        self.matchesWon.update([match[2] for match in matches])
+        self.matchesLost.update([match[3] for match in matches])
+        self.tournament = None
+        self.matches = []
+
+
+
+    def retirePlayer(self, player):
+        ''' Hold the retired player until the players are next written. '''
+        self.retiredPlayers.append(player)
+
+
+
+    def endSeason(self, season, players, numberOne, topEarner):
+        '''
+        Write the season and the careers of the players in one transaction.
+
+        :param int season: The season.
+        :param players: The players on the tour.
+        :param Player numberOne: The season end number 1.
+        :param Player topEarner: The player with the most prize money in the season.
+        '''
+        with self.connection:
+            self.writePlayers(players)
+            self.connection.execute('INSERT OR REPLACE INTO seasons (season, numberOneId, numberOnePts, topEarnerId, topEarnerMoney) VALUES (?, ?, ?, ?, ?)', (season, numberOne.playerId, int(numberOne.pts), topEarner.playerId, float(topEarner.seasonMoney)))
+
+
+
+    def removeSeasons(self, season):
+        '''
+        Remove the tournaments, matches and seasons from the specified season onwards.
+        A game resumed from a snapshot plays these seasons again, so they would be stored twice.
+        The matches won and lost by each player are counted again from the remaining matches.
+        '''
+        with self.connection:
+            self.connection.execute('DELETE FROM matches WHERE matchId >= (SELECT MIN(firstMatchId) FROM tournaments WHERE season >= ?)', (season,))
+            self.connection.execute('DELETE FROM tournaments WHERE season >= ?', (season,))
+            self.connection.execute('DELETE FROM seasons WHERE season >= ?', (season,))
+            self.connection.execute('UPDATE players SET matchesWon = 0, matchesLost = 0')
+            self.connection.execute('UPDATE players SET matchesWon = counts.total FROM (SELECT winnerId, COUNT(*) AS total FROM matches GROUP BY winnerId) AS counts WHERE players.playerId = counts.winnerId')
+            self.connection.execute('UPDATE players SET matchesLost = counts.total FROM (SELECT loserId, COUNT(*) AS total FROM matches GROUP BY loserId) AS counts WHERE players.playerId = counts.loserId')
+        self.tournamentId, = self.connection.execute('SELECT COALESCE(MAX(tournamentId), 0) FROM tournaments').fetchone()
+        self.matchId, = self.connection.execute('SELECT COALESCE(MAX(matchId), 0) FROM matches').fetchone()
+        self.matchesWon.clear()
+        self.matchesLost.clear()
+        self.retiredPlayers = []
+
+
+
+    def careerRecord(self, playerId):
+        '''
+        Returns the :py:class:`CareerRecord` of the specified player or None if the player is not in the database.
+        The record is from the end of the last season written to the database.
+        '''
+        row = self.connection.execute('SELECT playerId, name, age, wins, runnerUp, worldChampion, prizeMoney, firstWin, lastWin, isRetired, matchesWon, matchesLost FROM players WHERE playerId = ?', (playerId,)).fetchone()
+        if row is None:
+            return None
+        titles = self.connection.execute('SELECT season, event FROM tournaments WHERE winnerId = ? ORDER BY season, tournament', (playerId,)).fetchall()
+        return CareerRecord(*row, titles)
+
+
+
+    def tournamentMatches(self, tournamentId):
+        ''' Returns the (round, winnerId, loserId, winnerScore, loserScore) of each match of the specified tournament in the order they were played. '''
+        return self.connection.execute('SELECT round, matches.winnerId, loserId, winnerScore, loserScore FROM tournaments JOIN matches ON matchId BETWEEN firstMatchId AND lastMatchId WHERE tournaments.tournamentId = ? ORDER BY matchId', (tournamentId,)).fetchall()
+
+
+
+    def playerMatches(self, playerId):
+        ''' Returns the (season, event, round, winnerId, loserId, winnerScore, loserScore) of every match of the player. '''
+        return self.connection.execute('SELECT season, event, round, matches.winnerId, loserId, winnerScore, loserScore FROM matches JOIN tournaments ON matchId BETWEEN firstMatchId AND lastMatchId '
+                                       'WHERE matchId IN (SELECT matchId FROM matches WHERE winnerId = ? UNION SELECT matchId FROM matches WHERE loserId = ?) ORDER BY matchId', (playerId, playerId)).fetchall()
+
+
+
+    def findPlayers(self, name):
+        ''' Returns the (playerId, name) of the players with the specified name. '''
+        return self.connection.execute('SELECT playerId, name FROM players WHERE name = ?', (name,)).fetchall()
+
+
+
+    def worldChampions(self):
+        ''' Returns the (season, playerId, name) of each world champion. '''
+        return self.connection.execute('SELECT tournaments.season, tournaments.winnerId, players.name FROM tournaments LEFT JOIN players ON players.playerId = tournaments.winnerId WHERE isWorldChampionship ORDER BY tournaments.season').fetchall()
+
+
+
+def main():
+    ''' Query a database from the command line. '''
+    argParse = argparse.ArgumentParser(prog='database', description='Query a sport of life database.')
+    argParse.add_argument('fileName', help='The database file.')
+    argParse.add_argument('-c', '--champions', help='Display all the world champions.', action='store_true')
+    argParse.add_argument('-p', '--player', help='Display the career record of the player with this id.', type=int, default=None)
+    argParse.add_argument('-n', '--name', help='Display the ids of the players with this name.', default=None)
+    args = argParse.parse_args()
+
+    try:
+        database = Database(args.fileName, isReadOnly=True)
+    except sqlite3.Error as error:
+        print(f'Can not open the database "{args.fileName}".  {error}.')
+        sys.exit(1)
+    if args.champions:
+        for season, playerId, name in database.worldChampions():
+            print(f'{season} {name} ({playerId})')
+    if args.name is not None:
+        for playerId, name in database.findPlayers(args.name):
+            print(f'{playerId:>8} {name}')
+    if args.player is not None:
+        record = database.careerRecord(args.player)
+        if record is None:
+            print(f'There is no player {args.player}.')
+        else:
+            print(f'{record.name} ({record.playerId}){" retired" if record.isRetired else ""} aged {record.age}')
+            print(f'Matches won {record.matchesWon} lost {record.matchesLost}')
+            print(f'Tournaments won {record.wins} runner up {record.runnerUp} world champion {record.worldChampion}')
+            print(f'Prize money {record.prizeMoney:,.2f}')
+            for season, event in record.titles:
+                print(f'    {season} {event}')
+    database.close()
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement DrawIndex, a class to find the players in a round of a tournament draw.
+'''
+
+# System libraries.
+import random
+
+
+
+class DrawIndex:
+    '''
+    Class to keep the players in a tournament draw bucketed by their round key.
+    Picking a random player from a round and moving a player to another round are both O(1).
+
+    :ivar dict buckets: The players in each round keyed by the round key.
+    :ivar rng: The random number generator used to pick players.
+    '''
+
+
+
+    def __init__(self, players, rng=random):
+        '''
+        Class constructor for the :py:class:`DrawIndex` class.
+
+        :param list players: The players in the draw.  The round key of each player must already be set.
+        :param rng: The random number generator used to pick players.
+        '''
+        self.rng = rng
+        self.buckets = {}
+        for player in players:
+            self.buckets.setdefault(player.round, []).append(player)
+
+
+
+    def count(self, key):
+        ''' Returns the number of players in the specified round. '''
+        return len(self.buckets.get(key, ()))
+
+
+
+    def pick(self, key):
+        ''' Remove and return a random player from the specified round.  Each player in the round is equally likely. '''
+        bucket = self.buckets[key]
+        index = int(self.rng.random() * len(bucket))
+        bucket[index], bucket[-1] = bucket[-1], bucket[index]
+        return bucket.pop()
+
+
+
+    def add(self, player, key):
+        ''' Add the player to the specified round. '''
+        player.round = key
+        self.buckets.setdefault(key, []).append(player)
+
+
+
+    def moveAll(self, fromKey, toKey):
+        ''' Move all the players in one round into another round. '''
+        bucket = self.buckets.pop(fromKey, [])
+        for player in bucket:
+            self.add(player, toKey)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement HallOfFame, the store of the retired players in the sport of life program.
+The careers of retired players never change, so a retired player that has dropped out of the top of every index can never return.
+These cold players are written to a spill file and only read back when the whole hall of fame is required.
+'''
+
+# System libraries.
+import pickle
+import tempfile
+
+# Application Libraries.
+from ranking_index import RankingIndex, winsKey
+
+
+
+def runnerUpKey(player):
+    ''' Returns the sort key for the runner up order. '''
+    return -player.runnerUp, -player.wins
+
+
+
+def worldChampionKey(player):
+    ''' Returns the sort key for the world titles order. '''
+    return -player.worldChampion, -player.wins
+
+
+
+def prizeMoneyKey(player):
+    ''' Returns the sort key for the prize money order. '''
+    return -player.prizeMoney
+
+
+
+# The indexes of the hall of fame.
+INDEX_KEYS = {'wins': winsKey, 'runnerUp': runnerUpKey, 'worldChampion': worldChampionKey, 'prizeMoney': prizeMoneyKey}
+
+
+
+class HallOfFame:
+    '''
+    Class to store the retired players.
+    The hall of fame behaves like a list of players that can only be appended to.
+    The players in the top numHot of any index are held in memory, the others are spilled to a file.
+
+    :ivar int numHot: The number of players in each index that are held in memory.  :py:meth:`topK` is exact up to this number.
+    :ivar dict indexes: The :py:class:`~ranking_index.RankingIndex` of the players in memory for each order.
+    :ivar int numCold: The number of players in the spill file.
+    :ivar list newPlayers: The players added since the last :py:meth:`takeNewPlayers`.
+    '''
+
+
+
+    def __init__(self, numHot=1000, fileName=None):
+        '''
+        Class constructor for the :py:class:`HallOfFame` class.
+
+        :param int numHot: The number of players in each index that are held in memory.
+        :param str fileName: The name of the spill file.  None for a temporary file.
+        '''
+        self.numHot = numHot
+        self.fileName = fileName
+        self.indexes = {name: RankingIndex(keyFunction) for name, keyFunction in INDEX_KEYS.items()}
+        self.hot = []
+        self.numCold = 0
+        self.numBatches = 0
+        self.spillFile = None
+        self.spillSize = 2 * numHot
+        self.newPlayers = []
+
+
+
+    def __len__(self):
+        ''' Returns the number of players in the hall of fame. '''
+        return len(self.hot) + self.numCold
+
+
+
+    def __iter__(self):
+        '''
+        Iterate through all the players in the hall of fame.
+        The cold players are read back from the spill file first, they retired before most of the players in memory.
+        '''
+        if self.spillFile is not None:
+            self.spillFile.flush()
+            self.spillFile.seek(0)
+            for _batch in range(self.numBatches):
+                yield from pickle.load(self.spillFile)
+            self.spillFile.seek(0, 2)
+        yield from self.hot
+
+
+
+    def append(self, player):
+        ''' Add a retired player to the hall of fame. '''
+        self.hot.append(player)
+        self.newPlayers.append(player)
+        for index in self.indexes.values():
+            index.add(player)
+        if len(self.hot) >= self.spillSize:
+            self.spill()
+
+
+
+    def extend(self, players):
+        ''' Add the retired players to the hall of fame. '''
+        for player in players:
+            self.append(player)
+
+
+
+    def takeNewPlayers(self):
+        ''' Returns the players added since the last call, in the order that they were added.  The snapshots only save these players. '''
+        newPlayers = self.newPlayers
+        self.newPlayers = []
+        return newPlayers
+
+
+
+    def spill(self):
+        ''' Write the players that are not in the top numHot of any index to the spill file. '''
+        keep = set()
+        for index in self.indexes.values():
+            keep.update(index.top(self.numHot))
+        cold = [player for player in self.hot if player not in keep]
+        # The players that are kept can not all be in the top of every index.  Wait for another numHot players before spilling again.
+        self.spillSize = len(keep) + self.numHot
+        if not cold:
+            return
+        for player in cold:
+            for index in self.indexes.values():
+                index.remove(player)
+        self.hot = [player for player in self.hot if player in keep]
+
+        if self.spillFile is None:
+            self.spillFile = tempfile.TemporaryFile() if self.fileName is None else open(self.fileName, 'w+b')  # pylint: disable=consider-using-with
+        pickle.dump(cold, self.spillFile, pickle.HIGHEST_PROTOCOL)
+        self.numBatches += 1
+        self.numCold += len(cold)
+
+
+
+    def topK(self, numPlayers, order='wins'):
+        '''
+        Returns the top players in the specified order.
+
+        :param int numPlayers: The number of players to return.  This is exact for up to numHot players.
+        :param str order: The order, one of 'wins', 'runnerUp', 'worldChampion' or 'prizeMoney'.
+        '''
+        return self.indexes[order].top(numPlayers)
+
+
+
+    def close(self):
+        ''' Close the spill file.  A temporary spill file is removed.  The length and :py:meth:`topK` still work, the iteration only returns the players in memory. '''
+        if self.spillFile is not None:
+            self.spillFile.close()
+            self.spillFile = None
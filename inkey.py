@@ -4,142 +4,174 @@
 '''
 Module to provide the BBC Basic function INKEY.
 Scan for a keyboard button press but do not block if no key is available.
+A single reader thread waits for the keys and queues them with the time that they arrived.
+Under Linux the terminal stays in cbreak mode until the :py:class:`InKey` is closed.
 Under Windows.
     This works under winpty ( but colours do not work in winpty).
     This does not work under minitty.
 '''
 
+# System libraries.
 import sys
-import _thread
+import os
+import codecs
+import queue
+import selectors
+import threading
 import time
 
 
 try:
-    # Try to import Windows version.
-    # print('Try to import Windows version')
-    # import msvcrt
-    from msvcrt import getwch # , kbhit
-    # print('Using Windows getwch().')
-    isLinux = False
+    # The Windows console.
+    from msvcrt import getwch
 except ImportError:
-    # Define non-Windows version.
-    # print('Using Linux getwch().')
-    isLinux = True
-    import tty
-    import termios
-    def getwch():
-        fd = sys.stdin.fileno()
-        global oldSettings
-        oldSettings = termios.tcgetattr(fd)
-        # print('tcgetattr({}) = {}'.format(fd, oldSettings))
-        try:
-            # This does not work !
-            # print('SetRaw')
-            # tty.setraw(sys.stdin.fileno())
-
-            # print('\nSetCBreak\n')
-            tty.setcbreak(sys.stdin.fileno())
+    getwch = None
 
-            ch = sys.stdin.read(1)
-        finally:
-            # This use to work without the | termios.ECHO.
-            # This does not work in the sport_of_life program for some reason.
-
-            #print('tcgetattr({}) = {}'.format(fd, oldSettings))
-            # print('tcgetattr({}) = {}'.format(fd, termios.tcgetattr(fd)))
-            # print('\nRestore termios\n')
-            oldSettings[3] = oldSettings[3] | termios.ECHO
-            termios.tcsetattr(fd, termios.TCSADRAIN, oldSettings)
-            # print('tcgetattr({}) = {}'.format(fd, termios.tcgetattr(fd)))
+try:
+    # The POSIX terminal.
+    import termios
+    import tty
+except ImportError:
+    termios = None
+    tty = None
 
-            # Use 'stty --all' to see all terminal settings.
-            # Use 'stty echo' to turn echo back on (for example).
-        return ch
+# Use the Windows version only when the Windows console is available.
+isLinux = getwch is None
 
 
 
 class InKey:
-    ''' Class to provide a keyboard scan function like BBC Basic InKey(). '''
+    '''
+    Class to provide a keyboard scan function like BBC Basic InKey().
+
+    :ivar queue.Queue keys: The (time, key) of each key press that has not been read yet.
+    '''
 
 
 
     def __init__(self):
         ''' Class constructor. '''
-        # print('CInKey class constructor.')
-        self.lastKey = None
-        # print('_thread.start_new_thread.')
-        _thread.start_new_thread(self._keypress, ())
-        # print('InKey class constructor finished.')
+        self.keys = queue.Queue()
+        self.isClosed = False
+        self.oldSettings = None
+        if isLinux:
+            self.fd = sys.stdin.fileno()
+            if os.isatty(self.fd):
+                # Keep the terminal in cbreak mode for the whole session.
+                self.oldSettings = termios.tcgetattr(self.fd)
+                tty.setcbreak(self.fd)
+            # The reader thread also waits on this pipe, so that close() can wake it.
+            self.wakeRead, self.wakeWrite = os.pipe()
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.wakeRead, selectors.EVENT_READ)
+            try:
+                self.selector.register(self.fd, selectors.EVENT_READ)
+            except (ValueError, OSError):
+                # stdin can not be waited on, for example a regular file.  There will be no keys.
+                pass
+            self.thread = threading.Thread(target=self._readLinux, name='InKey', daemon=True)
+        else:
+            self.thread = threading.Thread(target=self._readWindows, name='InKey', daemon=True)
+        self.thread.start()
 
 
 
     def __del__(self):
         ''' Class destructor. '''
-        # print('InKey class destructor.')
         self.close()
 
 
 
     def close(self):
-        ''' Restore the terminal. Sometimes there is an extra setcbreak() call.  So call here at the end to restore the ECHO after this setcbreak() call.'''
-        # print('close')
+        ''' Stop the reader thread and restore the terminal. '''
+        if self.isClosed:
+            return
+        self.isClosed = True
         if isLinux:
-            global oldSettings
-            oldSettings[3] = oldSettings[3] | termios.ECHO
-            fd = sys.stdin.fileno()
-            termios.tcsetattr(fd, termios.TCSADRAIN, oldSettings)
+            os.write(self.wakeWrite, b'x')
+            self.thread.join(1.0)
+            self.selector.close()
+            os.close(self.wakeRead)
+            os.close(self.wakeWrite)
+            if self.oldSettings is not None:
+                termios.tcsetattr(self.fd, termios.TCSADRAIN, self.oldSettings)
+
 
 
+    def _readLinux(self):
+        ''' The reader thread under Linux.  Wait until stdin is readable and queue every key. '''
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        while True:
+            for key, _events in self.selector.select():
+                if key.fileobj == self.wakeRead:
+                    return
+                data = os.read(self.fd, 1024)
+                if not data:
+                    # End of the input.
+                    return
+                keyTime = time.monotonic()
+                for character in decoder.decode(data):
+                    self.keys.put((keyTime, character))
 
-    def _keypress(self):
-        ''' Fetch the last character into a buffer. '''
-        # print('_keypress().start')
-        # if msvcrt.kbhit():
-        # print('_keypress().start')
-        # This does not work under minitty.
-        # print ('_keypress.getwch()')
-        self.lastKey = getwch()
-        # print('_keypress().finish')
+
+
+    def _readWindows(self):
+        ''' The reader thread under Windows.  getwch() blocks until a key is pressed. '''
+        while not self.isClosed:
+            character = getwch()
+            self.keys.put((time.monotonic(), character))
+
+
+
+    def getKeyEvent(self, timeout=0.0):
+        '''
+        Returns the (time, key) of the next key press or None if there is no key press within the timeout.
+        The time is from time.monotonic() when the key arrived.
+
+        :param float timeout: The maximum time to wait in seconds.  0 to not wait, None to wait for ever.
+        '''
+        try:
+            if timeout == 0.0:
+                return self.keys.get_nowait()
+            return self.keys.get(timeout=timeout)
+        except queue.Empty:
+            return None
 
 
 
     def scanKey(self):
-        ''' Return the last (current) keypress or None for no keypress. '''
-        if self.lastKey == None:
-            result = None
-            # print('No Key pressed.')
-        else:
-            result = self.lastKey
-            # print('"{}" key pressed.'.format(result))
-            self.lastKey = None
-            _thread.start_new_thread(self._keypress, ())
-        return result
+        ''' Return the next keypress or None for no keypress.  This does not wait. '''
+        event = self.getKeyEvent()
+        return None if event is None else event[1]
+
+
+
+    def waitKey(self, timeout=None):
+        '''
+        Return the next keypress, waiting for up to timeout seconds.  Returns None if there is no keypress.
+
+        :param float timeout: The maximum time to wait in seconds.  None to wait for ever.
+        '''
+        event = self.getKeyEvent(timeout)
+        return None if event is None else event[1]
 
 
 
 def main():
-    # print('Hello from modInKey.py')
+    ''' Display the keys as they are pressed. '''
     inKey = InKey()
-    # print('CInkey object created.')
     wait = 10000
     while wait > 0:
-        character = inKey.scanKey()
-        if character == None:
-            pass
+        event = inKey.getKeyEvent(1.0)
+        if event is None:
             print('No Key pressed.')
         else:
-            print('"{}" key pressed.'.format(character))
+            keyTime, character = event
+            print(f'"{character}" key pressed {1000 * (time.monotonic() - keyTime):.3f}ms ago.')
             if character == 'q' or character == '\x1b':  # x1b is ESC
                 break
-                wait = 10
-        time.sleep(1)
         wait -= 1
 
-    time.sleep(1)
-    time.sleep(1)
-    time.sleep(1)
-    time.sleep(1)
-    time.sleep(1)
     inKey.close()
 
 
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the event journal of the sport of life program.
+The journal is an append only binary file of fixed size records.
+:py:class:`Journal` buffers the records in memory and writes them in large chunks.
+:py:class:`JournalReader` maps the file into memory for random access to the records without reading the whole file.
+'''
+
+# System libraries.
+import argparse
+import bisect
+import collections
+import mmap
+import operator
+import os
+import struct
+
+
+
+# The file header.  Magic, version, record size.
+MAGIC = b'SOLJ'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+
+# The record.  Type, tournament, round, season, player 1 id, player 2 id, value 1, value 2.
+RECORD = struct.Struct('<BBbxIIIii')
+
+# The types of record.
+MATCH = 1           # player1 beat player2.  value1, value2 is the score.  round is the stage of the loser.
+SKILL = 2           # The skill of player1 changed.  value1 is the new skill, value2 is the change.
+INJURY = 3          # player1 has an injury.  value1 is the new skill, value2 is the skill offset.
+BOOST = 4           # player1 has a boost.  value1 is the new skill, value2 is the skill offset.
+RETIREMENT = 5      # player1 retired and was replaced by player2.  value1 is the age, value2 is the wins.
+RANKING = 6         # Snapshot of the ranking of player1.  value1 is the ranking, value2 is the pts.
+JOIN = 7            # player1 joined the tour.  value1 is the skill, value2 is the age.
+
+RECORD_NAMES = {MATCH: 'Match', SKILL: 'Skill', INJURY: 'Injury', BOOST: 'Boost', RETIREMENT: 'Retirement', RANKING: 'Ranking', JOIN: 'Join'}
+
+# The number of records to buffer before writing to the file.
+BUFFER_RECORDS = 4096
+
+JournalRecord = collections.namedtuple('JournalRecord', ['recordType', 'tournament', 'round', 'season', 'player1', 'player2', 'value1', 'value2'])
+
+
+
+def checkHeader(header):
+    ''' Raise a ValueError if the header is not a journal header of this version. '''
+    if len(header) < HEADER.size:
+        raise ValueError('The journal has no header.')
+    magic, version, recordSize = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError('The file is not a sport of life journal.')
+    if version != VERSION or recordSize != RECORD.size:
+        raise ValueError(f'The journal is version {version} with {recordSize} byte records.  Expecting version {VERSION} with {RECORD.size} byte records.')
+
+
+
+class Journal:
+    '''
+    Class to write the events of the game to an append only journal file.
+
+    :ivar int season: The season of the records that are written.
+    :ivar int tournament: The tournament of the records that are written.
+    :ivar int numRecords: The number of records written by this journal.
+    '''
+
+
+
+    def __init__(self, fileName):
+        '''
+        Class constructor for the :py:class:`Journal` class.
+        An existing journal is appended to.
+
+        :param str fileName: The name of the journal file.
+        '''
+        self.fileName = fileName
+        self.season = 0
+        self.tournament = 0
+        self.numRecords = 0
+        self.buffer = bytearray(BUFFER_RECORDS * RECORD.size)
+        self.numBuffered = 0
+        isNew = not os.path.exists(fileName) or os.path.getsize(fileName) == 0
+        if not isNew:
+            with open(fileName, 'rb') as file:
+                checkHeader(file.read(HEADER.size))
+        self.file = open(fileName, 'ab')    # pylint: disable=consider-using-with
+        if isNew:
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+
+
+    def write(self, recordType, player1, player2=0, value1=0, value2=0, roundIndex=0):
+        ''' Add a record to the journal for the current season and tournament. '''
+        RECORD.pack_into(self.buffer, self.numBuffered * RECORD.size, recordType, self.tournament, roundIndex, self.season, player1, player2, value1, value2)
+        self.numBuffered += 1
+        self.numRecords += 1
+        if self.numBuffered == BUFFER_RECORDS:
+            self.flush()
+
+
+
+    def writeColumns(self, recordType, players1, values1, values2):
+        ''' Add a record for each row of the columns to the journal. '''
+        for player1, value1, value2 in zip(players1, values1, values2):
+            self.write(recordType, player1, 0, value1, value2)
+
+
+
+    def flush(self):
+        ''' Write the buffered records to the file. '''
+        if self.numBuffered > 0:
+            self.file.write(memoryview(self.buffer)[:self.numBuffered * RECORD.size])
+            self.numBuffered = 0
+        self.file.flush()
+
+
+
+    def removeSeasons(self, season):
+        '''
+        Remove the records of the specified season and all the seasons after it.
+        A game resumed from a snapshot plays these seasons again, so they would be in the journal twice.
+        The records are in season order, so the first record to remove is found with a binary search.
+        '''
+        self.flush()
+        with JournalReader(self.fileName) as reader:
+            numKeep = bisect.bisect_left(reader, season, key=operator.attrgetter('season'))
+        self.file.truncate(HEADER.size + numKeep * RECORD.size)
+
+
+
+    def close(self):
+        ''' Write the buffered records and close the file. '''
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+
+
+class JournalReader:
+    '''
+    Class to read a journal file.
+    The file is memory mapped, records are unpacked directly from the mapping when they are accessed.
+    '''
+
+
+
+    def __init__(self, fileName):
+        '''
+        Class constructor for the :py:class:`JournalReader` class.
+
+        :param str fileName: The name of the journal file.
+        '''
+        self.file = open(fileName, 'rb')    # pylint: disable=consider-using-with
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        checkHeader(self.map[:HEADER.size])
+        self.numRecords = (len(self.map) - HEADER.size) // RECORD.size
+
+
+
+    def __enter__(self):
+        return self
+
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+
+    def close(self):
+        ''' Release the mapping and close the file. '''
+        self.map.close()
+        self.file.close()
+
+
+
+    def __len__(self):
+        ''' Returns the number of records in the journal. '''
+        return self.numRecords
+
+
+
+    def __getitem__(self, index):
+        ''' Returns the record at the specified index. '''
+        if index < 0:
+            index += self.numRecords
+        if not 0 <= index < self.numRecords:
+            raise IndexError('journal index out of range')
+        return JournalRecord._make(RECORD.unpack_from(self.map, HEADER.size + index * RECORD.size))
+
+
+
+    def records(self, recordType=None, start=0, stop=None):
+        ''' Iterate through the records from start to stop, optionally only the records of the specified type. '''
+        stop = self.numRecords if stop is None else min(stop, self.numRecords)
+        view = memoryview(self.map)[HEADER.size + start * RECORD.size:HEADER.size + stop * RECORD.size]
+        try:
+            for fields in RECORD.iter_unpack(view):
+                if recordType is None or fields[0] == recordType:
+                    yield JournalRecord._make(fields)
+        finally:
+            view.release()
+
+
+
+def main():
+    ''' Display a summary of a journal file. '''
+    argParse = argparse.ArgumentParser(prog='journal', description='Display a summary of a sport of life journal.')
+    argParse.add_argument('fileName', help='The journal file.')
+    argParse.add_argument('-l', '--last', help='Display the last N records.', type=int, default=10)
+    args = argParse.parse_args()
+
+    with JournalReader(args.fileName) as reader:
+        counts = collections.Counter(record.recordType for record in reader.records())
+        print(f'{len(reader)} records.')
+        for recordType, count in sorted(counts.items()):
+            print(f'{RECORD_NAMES.get(recordType, recordType):<12}{count:>12,}')
+        for index in range(max(0, len(reader) - args.last), len(reader)):
+            record = reader[index]
+            print(f'{RECORD_NAMES.get(record.recordType, record.recordType):<12}{record.season:>6}{record.tournament:>3}{record.round:>4}{record.player1:>10}{record.player2:>10}{record.value1:>8}{record.value2:>8}')
+
+
+
+if __name__ == '__main__':
+    main()
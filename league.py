@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement League, several divisions of the sport of life program played at the same time.
+Each division is a tour that plays its season in a pool of processes.
+At the end of the season the divisions are merged back, the retired players join one hall of fame and the bottom players of each division swap with the top players of the division below.
+Each division has its own random number streams, so the results do not depend on the number of processes.
+
+    python league.py --divisions 4 --players 25000 --seasons 3
+'''
+
+# System libraries.
+import argparse
+import heapq
+import itertools
+import time
+
+# Application Libraries.
+from sport_of_life import Game
+from hall_of_fame import HallOfFame
+from champions import Champions
+import champions
+import player as player_module
+import ranking_index
+import rng
+from process_pool import ProcessPool, defaultNumProcesses
+
+
+
+def playDivisionSeason(players, seasonIndex, prizeMoney, seed, firstPlayerId, isTopDivision):
+    '''
+    Returns the players, the retired players and the :py:class:`~champions.Champions` of a season of one division.
+    This is the worker function for the process pool.
+
+    :param list players: The players in the division.
+    :param int seasonIndex: The season to play.
+    :param float prizeMoney: The prize money of the world championship in this division.
+    :param int seed: The master seed of the division.
+    :param int firstPlayerId: The first playerId for the players that join the division this season.
+    :param bool isTopDivision: True for the top division.  Only the top division awards the world title.
+    '''
+    # Each division has its own range of playerIds, so the new players are unique across the processes.
+    player_module.playerIds = itertools.count(firstPlayerId)
+
+    game = Game()
+    game.setHeadless()
+    game.streams = rng.RandomStreams(seed)
+    game.seasonIndex = seasonIndex
+    game.isWorldTitle = isTopDivision
+    retiredPlayers = []
+    seasons = Champions()
+    game.playSeason(players, seasons, retiredPlayers, seasonIndex, prizeMoney)
+    game.recordSeason(players, seasons, seasonIndex)
+
+    return players, retiredPlayers, seasons
+
+
+
+class League:
+    '''
+    Class to represent several divisions of players with promotion and relegation.
+
+    :ivar list divisions: The players in each division, the top division first.
+    :ivar list seasons: The :py:class:`~champions.Champions` of each division.
+    :ivar HallOfFame retiredPlayers: The retired players of all the divisions.
+    :ivar int numPromoted: The number of players promoted from each division at the end of each season.
+    :ivar RandomStreams streams: The random number streams of the league.
+    :ivar int seasonIndex: The next season to play.
+    :ivar float prizeMoney: The prize money of the world championship in the top division.
+    :ivar int nextPlayerId: The first playerId that has not been given to a player.
+    :ivar ProcessPool pool: The pool of processes that play the divisions.
+    '''
+
+
+
+    def __init__(self, numDivisions, numPlayers, numPromoted=4, seed=None, numProcesses=None):
+        '''
+        Class constructor for the :py:class:`League` class.
+
+        :param int numDivisions: The number of divisions.
+        :param int numPlayers: The number of players in each division.
+        :param int numPromoted: The number of players promoted from each division at the end of each season.
+        :param int seed: The master seed.  None for a random master seed.
+        :param int numProcesses: The number of processes in the pool.  None for one for each division, up to the number of cores.
+        '''
+        if numDivisions > 1 and 2 * numPromoted > numPlayers:
+            raise ValueError(f'A division of {numPlayers} players can not promote and relegate {numPromoted} players.')
+        self.numPromoted = numPromoted
+        self.streams = rng.RandomStreams(seed)
+        self.seasonIndex = 1968
+        self.prizeMoney = 200000.0
+        self.retiredPlayers = HallOfFame()
+        self.seasons = [Champions() for _ in range(numDivisions)]
+
+        # Create the players of each division.
+        self.divisions = []
+        for divisionIndex in range(numDivisions):
+            game = Game()
+            game.setHeadless()
+            game.streams = rng.RandomStreams(self.divisionSeed(divisionIndex))
+            self.divisions.append(game.createPlayers(numPlayers))
+        self.nextPlayerId = next(player_module.playerIds)
+        player_module.playerIds = itertools.count(self.nextPlayerId)
+
+        self.pool = ProcessPool(numProcesses if numProcesses is not None else defaultNumProcesses(numDivisions))
+
+
+
+    def close(self):
+        ''' Shutdown the pool of processes and remove the hall of fame spill file. '''
+        self.pool.close()
+        self.retiredPlayers.close()
+
+
+
+    def divisionSeed(self, divisionIndex):
+        ''' Returns the master seed of the specified division. '''
+        return self.streams.derive(rng.DIVISION, divisionIndex)
+
+
+
+    def playSeason(self):
+        ''' Play a season in every division, merge the results and then promote and relegate the players. '''
+        # Play the divisions.
+        tasks = []
+        firstPlayerId = self.nextPlayerId
+        for divisionIndex, players in enumerate(self.divisions):
+            # A player can only retire once a season and each retirement uses two playerIds, one for the retired copy of the player and one for the new player.
+            tasks.append((players, self.seasonIndex, self.prizeMoney / 2 ** divisionIndex, self.divisionSeed(divisionIndex), firstPlayerId, divisionIndex == 0))
+            firstPlayerId += 2 * len(players)
+        results = self.pool.map(playDivisionSeason, tasks)
+
+        # Merge the results.
+        for divisionIndex, (players, retiredPlayers, seasons) in enumerate(results):
+            self.divisions[divisionIndex] = players
+            self.retiredPlayers.extend(retiredPlayers)
+            self.seasons[divisionIndex].extend(seasons)
+        self.nextPlayerId = firstPlayerId
+        player_module.playerIds = itertools.count(self.nextPlayerId)
+
+        movements = self.promote()
+        self.prizeMoney *= 1.03
+        self.seasonIndex += 1
+        return movements
+
+
+
+    def promote(self):
+        '''
+        Swap the lowest ranked players in each division with the highest ranked players in the division below.
+        The players that move lose their ranking points.  The points were won against the players of the old division, so they would put a promoted player straight to the top of the new division.
+        Returns the (promoted, relegated) players between each pair of divisions.
+        '''
+        # Choose all the players before any move, so a relegated player is not relegated again.
+        swaps = []
+        for upper, lower in zip(self.divisions, self.divisions[1:]):
+            relegated = heapq.nlargest(self.numPromoted, range(len(upper)), key=lambda index, players=upper: players[index].ranking)
+            promoted = heapq.nsmallest(self.numPromoted, range(len(lower)), key=lambda index, players=lower: players[index].ranking)
+            swaps.append((upper, lower, promoted, relegated))
+
+        movements = []
+        for upper, lower, promoted, relegated in swaps:
+            movements.append(([lower[index] for index in promoted], [upper[index] for index in relegated]))
+            for upperIndex, lowerIndex in zip(relegated, promoted):
+                upper[upperIndex], lower[lowerIndex] = lower[lowerIndex], upper[upperIndex]
+                upper[upperIndex].clearPoints()
+                lower[lowerIndex].clearPoints()
+        return movements
+
+
+
+    def topWins(self, numPlayers):
+        ''' Returns the players with the most tournament wins in all the divisions and the hall of fame. '''
+        active = heapq.nsmallest(numPlayers, itertools.chain.from_iterable(self.divisions), key=ranking_index.winsKey)
+        retired = self.retiredPlayers.topK(numPlayers)
+        return list(heapq.merge(active, retired, key=ranking_index.winsKey))[:numPlayers]
+
+
+
+def main():
+    ''' Play a league from the command line and display a summary of each season. '''
+    argParse = argparse.ArgumentParser(prog='league', description='Play several divisions of the sport of life with promotion and relegation.')
+    argParse.add_argument('-d', '--divisions', help='The number of divisions.', type=int, default=4)
+    argParse.add_argument('-p', '--players', help='The number of players in each division.', type=int, default=80)
+    argParse.add_argument('--promoted', help='The number of players promoted and relegated between each pair of divisions.', type=int, default=4)
+    argParse.add_argument('-s', '--seasons', help='The number of seasons to play.', type=int, default=10)
+    argParse.add_argument('--processes', help='The number of processes.  Default is one for each division, up to the number of cores.', type=int, default=None)
+    argParse.add_argument('--seed', help='The master seed of the random number streams.  The same seed plays the same league.', type=int, default=None)
+    args = argParse.parse_args()
+
+    startTime = time.perf_counter()
+    league = League(args.divisions, args.players, args.promoted, args.seed, args.processes)
+    print(f'{args.divisions} divisions of {args.players:,} players created in {time.perf_counter() - startTime:.2f}s.')
+    for _seasonCount in range(args.seasons):
+        seasonIndex = league.seasonIndex
+        startTime = time.perf_counter()
+        movements = league.playSeason()
+        elapsedTime = time.perf_counter() - startTime
+        _year, playerId = league.seasons[0].winnersOf(champions.WORLD_CHAMPIONSHIP)[-1]
+        print(f'{seasonIndex} played in {elapsedTime:.2f}s.  World Champion {league.seasons[0].names[playerId]}.')
+        for divisionIndex, (promoted, _relegated) in enumerate(movements, 1):
+            print(f'    Promoted to division {divisionIndex}: {", ".join(player.name for player in promoted)}')
+
+    # Display the summary.
+    print(f'{len(league.retiredPlayers):,} players retired.')
+    for divisionIndex, seasons in enumerate(league.seasons, 1):
+        print(f'Division {divisionIndex} {seasons[-1]}')
+    print('Most wins')
+    for count, player in enumerate(league.topWins(10), 1):
+        print(f'{count:>5} {player.nameWithYearRange():<28}{player.wins:>4}{player.wins + player.runnerUp:>4}{player.worldChampion:>8}{player.prizeMoney:>16,.2f}')
+    league.close()
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the match engines for the sport of life program.
+The animated engine plays every point (see :py:meth:`~sport_of_life.Game.playMatch`).
+The fast engine samples the final score of the match in a single step.
+'''
+
+# System libraries.
+import random
+
+
+
+# The match engines that a tournament can be played with.
+ANIMATED = 'animated'
+FAST = 'fast'
+ENGINES = (ANIMATED, FAST)
+
+
+
+def pointProbability(skill1, skill2):
+    '''
+    Returns the probability that player 1 wins a point.
+    This is the exact probability that random.randrange(skill1) >= random.randrange(skill2), which is how the animated engine decides a point.
+
+    :param int skill1: The skill of player 1.
+    :param int skill2: The skill of player 2.
+    '''
+    if skill1 >= skill2:
+        return 1.0 - (skill2 - 1) / (2.0 * skill1)
+    return (skill1 + 1) / (2.0 * skill2)
+
+
+
+def sampleScore(probability, winTarget, rng=random):
+    '''
+    Returns a final score (score1, score2) for a race to winTarget points.
+    The score is sampled directly from the race to winTarget distribution.
+    The probability of player 1 winning winTarget - j is C(winTarget - 1 + j, j) p^winTarget q^j.
+
+    :param float probability: The probability that player 1 wins a point.
+    :param int winTarget: The number of points required to win the match.
+    :param rng: The random number generator to use.
+    '''
+    p = probability
+    q = 1.0 - probability
+    term1 = p ** winTarget
+    term2 = q ** winTarget
+    u = rng.random()
+    for j in range(winTarget):
+        u -= term1
+        if u < 0.0:
+            return winTarget, j
+        u -= term2
+        if u < 0.0:
+            return j, winTarget
+        factor = (winTarget + j) / (j + 1)
+        term1 *= q * factor
+        term2 *= p * factor
+
+    # Rounding errors left some probability over.  Give the match to the favourite.
+    if p >= q:
+        return winTarget, winTarget - 1
+    return winTarget - 1, winTarget
+
+
+
+def playFastMatch(skill1, skill2, winTarget, rng=random):
+    '''
+    Returns a final score (score1, score2) for a match between players with the specified skills.
+
+    :param int skill1: The skill of player 1.
+    :param int skill2: The skill of player 2.
+    :param int winTarget: The number of points required to win the match.
+    :param rng: The random number generator to use.
+    '''
+    return sampleScore(pointProbability(skill1, skill2), winTarget, rng)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement MatchExport, the export of every match result in the sport of life program.
+The results are held in memory and written to the file in batches, so the memory used does not grow with the number of matches.
+The format of the file is chosen from the extension.
+
+    .csv        Comma separated values.
+    .parquet    Parquet, one row group per batch (requires pyarrow).
+    .arrow      Arrow IPC file, one record batch per batch (requires pyarrow).
+'''
+
+# System libraries.
+import bisect
+import csv
+import io
+import os
+
+try:
+    # pyarrow is optional.  It is only required for the columnar formats.
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+
+# The formats of the export.
+CSV = 'csv'
+PARQUET = 'parquet'
+ARROW = 'arrow'
+
+# The formats of each file extension.
+EXTENSIONS = {'.csv': CSV, '.parquet': PARQUET, '.arrow': ARROW, '.feather': ARROW}
+
+# The columns of the file.  round is the stage of the loser, 0 is qualifying.
+COLUMN_NAMES = ('season', 'tournament', 'event', 'round', 'player1Id', 'player2Id', 'skill1', 'skill2', 'score1', 'score2')
+
+# The columns that are the same for every match in a tournament.
+TOURNAMENT_COLUMNS = 3
+
+# The number of matches to hold in memory before writing to the file.
+BATCH_MATCHES = 16384
+
+
+
+def fileFormat(fileName):
+    ''' Returns the format of the export for the specified file name. '''
+    return EXTENSIONS.get(os.path.splitext(fileName)[1].lower(), CSV)
+
+
+
+def isAvailable(fileName):
+    ''' Returns True if the format of the specified file name can be written. '''
+    return fileFormat(fileName) == CSV or pyarrow is not None
+
+
+
+class MatchExport:
+    '''
+    Class to export the result of every match to a file.
+    Each match is held as a tuple of the columns that change from match to match.
+    The season, tournament and event are held once for each tournament and only repeated for each match when the batch is written.
+
+    :ivar int numMatches: The number of matches written by this export.
+    :ivar int batchSize: The number of matches to hold in memory before writing to the file.
+    :ivar list rows: The (round, player1Id, player2Id, skill1, skill2, score1, score2) of each match held in memory.
+    :ivar list segments: The (first row, season, tournament, event) of each tournament in the rows.
+    '''
+
+
+
+    def __init__(self, fileName, batchSize=BATCH_MATCHES):
+        '''
+        Class constructor for the :py:class:`MatchExport` class.
+        An existing file is replaced, unless :py:meth:`removeSeasons` keeps the start of it.
+
+        :param str fileName: The name of the export file.  The format is chosen from the extension.
+        :param int batchSize: The number of matches to hold in memory before writing to the file.
+        '''
+        self.fileName = fileName
+        self.format = fileFormat(fileName)
+        if self.format != CSV and pyarrow is None:
+            raise ImportError(f'The {self.format} format requires pyarrow.')
+        self.numMatches = 0
+        self.batchSize = batchSize
+        self.rows = []
+        self.segments = [(0, 0, 0, '')]
+        self.file = None
+        self.writer = None
+
+
+
+    def startTournament(self, season, tournament, event):
+        '''
+        Set the tournament of the matches that follow.
+
+        :param int season: The season of the tournament.
+        :param int tournament: The index of the tournament in the season.
+        :param str event: The name of the tournament.
+        '''
+        self.segments.append((len(self.rows), season, tournament, event))
+
+
+
+    def write(self, roundIndex, player1, player2, score1, score2):
+        '''
+        Add the result of a match to the export.
+
+        :param int roundIndex: The stage of the loser of the match.  0 is qualifying.
+        :param Player player1: The player on the left.
+        :param Player player2: The player on the right.
+        :param int score1: The score of player 1.
+        :param int score2: The score of player 2.
+        '''
+        rows = self.rows
+        rows.append((roundIndex, player1.playerId, player2.playerId, player1.skill, player2.skill, score1, score2))
+        if len(rows) >= self.batchSize:
+            self.flush()
+
+
+
+    def flush(self):
+        ''' Write the matches held in memory to the file. '''
+        if not self.rows:
+            return
+        # The (first row, last row, season, tournament, event) of each tournament in the batch.
+        lastRows = [segment[0] for segment in self.segments[1:]] + [len(self.rows)]
+        ranges = [(segment[0], lastRow) + segment[1:] for segment, lastRow in zip(self.segments, lastRows)]
+        if self.format == CSV:
+            self._writeCsv(ranges)
+        else:
+            self._writeColumnar(ranges)
+        self.numMatches += len(self.rows)
+        self.rows = []
+        # The next batch starts in the current tournament.
+        self.segments = [(0,) + self.segments[-1][1:]]
+
+
+
+    def _writeCsv(self, ranges):
+        ''' Write the matches held in memory as comma separated values. '''
+        if self.file is None:
+            self.file = open(self.fileName, 'w', encoding='utf-8', newline='')  # pylint: disable=consider-using-with
+            csv.writer(self.file).writerow(COLUMN_NAMES)
+        lines = []
+        for first, last, season, tournament, event in ranges:
+            # The tournament columns are formatted once, with the quoting of the csv module.
+            prefix = io.StringIO()
+            csv.writer(prefix, lineterminator=',').writerow((season, tournament, event))
+            template = prefix.getvalue().replace('%', '%%') + ','.join(['%d'] * (len(COLUMN_NAMES) - TOURNAMENT_COLUMNS)) + '\r\n'
+            lines.extend([template % row for row in self.rows[first:last]])
+        self.file.write(''.join(lines))
+
+
+
+    def _writeColumnar(self, ranges):
+        ''' Write the matches held in memory as a Parquet row group or an Arrow record batch. '''
+        seasons = []
+        tournaments = []
+        events = []
+        for first, last, season, tournament, event in ranges:
+            seasons.extend([season] * (last - first))
+            tournaments.extend([tournament] * (last - first))
+            events.extend([event] * (last - first))
+        arrays = [pyarrow.array(seasons, pyarrow.int32()), pyarrow.array(tournaments, pyarrow.int32()), pyarrow.array(events, pyarrow.string())]
+        for column in zip(*self.rows):
+            arrays.append(pyarrow.array(column, pyarrow.int64()))
+        batch = pyarrow.RecordBatch.from_arrays(arrays, names=list(COLUMN_NAMES))
+        if self.writer is None:
+            if self.format == PARQUET:
+                self.writer = pyarrow.parquet.ParquetWriter(self.fileName, batch.schema)
+            else:
+                self.writer = pyarrow.ipc.new_file(self.fileName, batch.schema)
+        if self.format == PARQUET:
+            self.writer.write_table(pyarrow.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+
+
+
+    def removeSeasons(self, season):
+        '''
+        Keep the matches in the existing file from before the specified season and continue the export after them.
+        A game resumed from a snapshot plays the later seasons again, so they would be in the export twice.
+        The matches are in season order, so the copy stops at the first match of the specified season.
+
+        :param int season: The first season to remove.
+        '''
+        if self.file is not None or self.writer is not None or not os.path.exists(self.fileName):
+            return
+        oldFileName = self.fileName + '.old'
+        os.replace(self.fileName, oldFileName)
+        if self.format == CSV:
+            self._copyCsv(oldFileName, season)
+        else:
+            self._copyColumnar(oldFileName, season)
+        os.remove(oldFileName)
+
+
+
+    def _copyCsv(self, oldFileName, season):
+        ''' Copy the comma separated values from before the specified season into a new file. '''
+        self.file = open(self.fileName, 'w', encoding='utf-8', newline='')  # pylint: disable=consider-using-with
+        with open(oldFileName, 'r', encoding='utf-8', newline='') as oldFile:
+            self.file.write(oldFile.readline())
+            for line in oldFile:
+                if int(line.split(',', 1)[0]) >= season:
+                    break
+                self.file.write(line)
+                self.numMatches += 1
+
+
+
+    def _copyColumnar(self, oldFileName, season):
+        ''' Copy the Parquet row groups or Arrow record batches from before the specified season into a new file. '''
+        if self.format == PARQUET:
+            oldFile = pyarrow.parquet.ParquetFile(oldFileName)
+            schema = oldFile.schema_arrow
+            tables = (oldFile.read_row_group(index) for index in range(oldFile.num_row_groups))
+            self.writer = pyarrow.parquet.ParquetWriter(self.fileName, schema)
+        else:
+            oldFile = pyarrow.ipc.open_file(oldFileName)
+            schema = oldFile.schema
+            tables = (pyarrow.Table.from_batches([oldFile.get_batch(index)]) for index in range(oldFile.num_record_batches))
+            self.writer = pyarrow.ipc.new_file(self.fileName, schema)
+        for table in tables:
+            numKeep = bisect.bisect_left(table.column('season').to_pylist(), season)
+            if numKeep > 0:
+                self.writer.write_table(table.slice(0, numKeep))
+                self.numMatches += numKeep
+            if numKeep < table.num_rows:
+                break
+        if self.format == PARQUET:
+            oldFile.close()
+
+
+
+    def close(self):
+        ''' Write the rest of the matches and close the file. '''
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.writer = None
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement NameIndex, a class to find the players on a tour by name or by playerId.
+The names of new players are kept unique.  A new player that would share a name is given a numeral, for example "Steve Davis II".
+A player that already has a career is never renamed, even when a league moves them to a tour with a player of the same name.
+'''
+
+
+
+# The numerals added to a duplicate name.  Larger numbers are added as digits.
+NUMERALS = ['', '', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
+
+
+
+def numberedName(name, number):
+    ''' Returns the name with the numeral of the specified number, for example "Steve Davis III". '''
+    numeral = NUMERALS[number] if number < len(NUMERALS) else str(number)
+    return f'{name} {numeral}'
+
+
+
+class NameIndex:
+    '''
+    Class to find the players on a tour by name or by playerId.
+    Removing and finding a player are O(1).  Adding a player is amortised O(1), each name keeps the next numeral to try.
+
+    :ivar dict names: The player with each name.  If players share a name this is the first of them.
+    :ivar dict playerIds: The player with each playerId.
+    :ivar dict nextNumbers: The next numeral to try for each name that has been given a numeral.
+    :ivar source: The list of players that the index was built from.
+    '''
+
+
+
+    def __init__(self, players=(), source=None):
+        '''
+        Class constructor for the :py:class:`NameIndex` class.
+
+        :param players: The initial players in the index.  These players are not renamed.
+        :param source: The list of players that the index was built from.
+        '''
+        self.source = source
+        self.names = {}
+        self.playerIds = {}
+        self.nextNumbers = {}
+        for player in players:
+            self.add(player)
+
+
+
+    def __len__(self):
+        ''' Returns the number of players in the index. '''
+        return len(self.playerIds)
+
+
+
+    def uniqueName(self, name):
+        '''
+        Returns the name, with a numeral if another player already has the name.
+        The numerals of a name are only ever tried once, so a popular name does not search all its numerals again.
+        '''
+        if name not in self.names:
+            return name
+        number = self.nextNumbers.get(name, 2)
+        while numberedName(name, number) in self.names:
+            number += 1
+        self.nextNumbers[name] = number + 1
+        return numberedName(name, number)
+
+
+
+    def add(self, player):
+        ''' Add a player that already has a career to the index.  The player is never renamed. '''
+        self.names.setdefault(player.name, player)
+        self.playerIds[player.playerId] = player
+
+
+
+    def addNew(self, player):
+        ''' Add a new player to the index.  The player is given a numeral if another player already has the name. '''
+        if self.names.get(player.name, player) is not player:
+            player.name = self.uniqueName(player.name)
+        self.add(player)
+
+
+
+    def remove(self, player):
+        ''' Remove the player from the index, for example before the player is reset. '''
+        if self.names.get(player.name) is player:
+            del self.names[player.name]
+        if self.playerIds.get(player.playerId) is player:
+            del self.playerIds[player.playerId]
+
+
+
+    def findName(self, name):
+        ''' Returns the player with the specified name or None. '''
+        return self.names.get(name)
+
+
+
+    def findId(self, playerId):
+        ''' Returns the player with the specified playerId or None. '''
+        return self.playerIds.get(playerId)
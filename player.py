@@ -5,19 +5,100 @@ Module to implement Player, a class to represent a player in the sport of life p
 '''
 
 # System libraries.
+import array
+import itertools
 import random
 
 
 
+# The number of events in the points history of a player.
+HISTORY_LENGTH = 12
+
+# The Elo rating of a new player.
+INITIAL_RATING = 1500.0
+
+# The source of the player ids.  Each new player gets the next id.
+playerIds = itertools.count(1)
+
+
+
+class PointsHistory:
+    '''
+    Class to represent the ranking points of a player from the last :py:data:`HISTORY_LENGTH` events.
+    The points are held in a fixed size ring buffer.
+
+    :ivar array.array values: The ring buffer of points.
+    :ivar int start: The position of the oldest event in the ring buffer.
+    :ivar int count: The number of events in the history.
+    '''
+    __slots__ = ('values', 'start', 'count')
+
+
+
+    def __init__(self):
+        ''' Class constructor for the :py:class:`PointsHistory` class. '''
+        self.values = array.array('H', bytes(2 * HISTORY_LENGTH))
+        self.start = 0
+        self.count = 0
+
+
+
+    def __copy__(self):
+        ''' Returns a copy of the history. '''
+        history = PointsHistory()
+        history.values[:] = self.values
+        history.start = self.start
+        history.count = self.count
+        return history
+
+
+
+    def __len__(self):
+        ''' Returns the number of events in the history. '''
+        return self.count
+
+
+
+    def __iter__(self):
+        ''' Iterate through the points from the oldest event to the newest. '''
+        values = self.values
+        for index in range(self.start, self.start + self.count):
+            yield values[index % HISTORY_LENGTH]
+
+
+
+    def append(self, pts):
+        '''
+        Add the points from an event to the history.
+        Returns the points from the event that dropped out of the history, 0 if the history was not full.
+        '''
+        if self.count < HISTORY_LENGTH:
+            self.values[(self.start + self.count) % HISTORY_LENGTH] = pts
+            self.count += 1
+            return 0
+        oldest = self.values[self.start]
+        self.values[self.start] = pts
+        self.start = (self.start + 1) % HISTORY_LENGTH
+        return oldest
+
+
+
 class Player:
     '''
     Class to represent a player in the sport of life program.
 
-    :ivar Database database: The database that this player is stored in.
+    :ivar Database database: The database that this player is stored in or None.
+    :ivar int playerId: The unique id of the player.
     :ivar str name: The name of the player.
     :ivar int skill: The skill level of the player.
     :ivar int age: The age of the player.
+    :ivar PointsHistory history: The ranking points from the last 12 events.
+    :ivar int pts: The total of the ranking points in the history.
+    :ivar float rating: The Elo rating of the player from the results of the matches.
+    :ivar tuple rankingCache: The (name, ranking, text) of the last :py:meth:`nameWithRanking` or None.
+    :ivar tuple yearsCache: The (name, firstWin, lastWin, text) of the last :py:meth:`nameWithYearRange` or None.
     '''
+    __slots__ = ('database', 'playerId', 'name', 'skill', 'round', 'pts', 'history', 'ranking', 'wins', 'runnerUp', 'worldChampion', 'topRanking', 'age', 'firstWin', 'lastWin', 'skillOffset', 'prizeMoney', 'seasonMoney', 'rating', 'rankingCache', 'yearsCache')
 
 
 
@@ -25,15 +106,15 @@ class Player:
         '''
         Class constructor for the :py:class:`Player` class.
 
-        :param CDatabase database: Specifies the :py:class:`~modDatabase.CDatabase` database.
+        :param Database database: The :py:class:`~database.Database` that the player is stored in or None.
         '''
-        # The database that this sport is stored in.
         self.database = database
+        self.playerId: int = int()
         self.name: str = str()
         self.skill: int = int()
         self.round: int = int()
         self.pts: int = int()
-        self.history = []
+        self.history = PointsHistory()
         self.ranking: int = int()
         self.wins: int = int()
         self.runnerUp: int = int()
@@ -45,17 +126,21 @@ class Player:
         self.skillOffset: int = int()
         self.prizeMoney: int = int()
         self.seasonMoney: int = int()
+        self.rating: float = float()
+        self.rankingCache = None
+        self.yearsCache = None
         self.reset()
 
 
 
     def reset(self):
-        ''' Reset the player to the initial state. '''
+        ''' Reset the player to the initial state.  The player is a new player with a new id. '''
+        self.playerId = next(playerIds)
         self.name = 'No Name'
         self.skill = 500
         self.round = 0
         self.pts = 0
-        self.history = []
+        self.history = PointsHistory()
         self.ranking = 128
         self.wins = 0
         self.runnerUp = 0
@@ -67,17 +152,19 @@ class Player:
         self.skillOffset = 0
         self.prizeMoney = 0
         self.seasonMoney = 0
+        self.rating = INITIAL_RATING
 
 
 
     def retire(self):
         ''' Returns a retired copy of the player. '''
         retiredPlayer = Player(self.database)
+        retiredPlayer.playerId = self.playerId
         retiredPlayer.name = self.name
         retiredPlayer.skill = 0
         retiredPlayer.round = 0
         retiredPlayer.pts = 0
-        retiredPlayer.history = []
+        retiredPlayer.history = PointsHistory()
         retiredPlayer.ranking = 9999
         retiredPlayer.wins = self.wins
         retiredPlayer.runnerUp = self.runnerUp
@@ -87,30 +174,64 @@ class Player:
         retiredPlayer.firstWin = self.firstWin
         retiredPlayer.lastWin = self.lastWin
         retiredPlayer.prizeMoney = self.prizeMoney
+        retiredPlayer.rating = self.rating
 
         return retiredPlayer
 
 
 
+    def careerRecord(self):
+        ''' Returns the :py:class:`~database.CareerRecord` of the player from the database or None if the player is not stored in a database. '''
+        if self.database is None:
+            return None
+        return self.database.careerRecord(self.playerId)
+
+
+
+    def addPoints(self, pts):
+        ''' Add the ranking points from an event to the history.  The total pts is updated in O(1). '''
+        self.pts += pts - self.history.append(pts)
+
+
+
+    def clearPoints(self):
+        ''' Remove all the ranking points of the player.  The player starts again at the bottom of the ranking. '''
+        self.pts = 0
+        self.history = PointsHistory()
+
+
+
     def nameWithRanking(self):
-        ''' Returns the name with ranking if top 8. '''
+        ''' Returns the name with ranking if top 16.  The text is cached until the name or the ranking changes. '''
+        cache = self.rankingCache
+        if cache is not None and cache[0] is self.name and cache[1] == self.ranking:
+            return cache[2]
         if self.ranking > 16:
-            return self.name
-        return f'{self.name} ({self.ranking})'
+            text = self.name
+        else:
+            text = f'{self.name} ({self.ranking})'
+        self.rankingCache = (self.name, self.ranking, text)
+        return text
 
 
 
     def nameWithYearRange(self):
-        ''' Returns the name with a year range, if available. '''
+        ''' Returns the name with a year range, if available.  The text is cached until the name, firstWin or lastWin changes. '''
+        cache = self.yearsCache
+        if cache is not None and cache[0] is self.name and cache[1] == self.firstWin and cache[2] == self.lastWin:
+            return cache[3]
         if self.firstWin is None:
-            return self.name
-        if self.firstWin == self.lastWin:
-            return f'{self.name} ({self.firstWin})'
-        return f'{self.name} ({self.firstWin}-{self.lastWin})'
+            text = self.name
+        elif self.firstWin == self.lastWin:
+            text = f'{self.name} ({self.firstWin})'
+        else:
+            text = f'{self.name} ({self.firstWin}-{self.lastWin})'
+        self.yearsCache = (self.name, self.firstWin, self.lastWin, text)
+        return text
 
 
 
-    def getNames(self, cultureIndex):   # pylint: disable=no-self-use
+    def getNames(self, cultureIndex):
         ''' Return the list of possible first names and last names in the specified culture. '''
         if cultureIndex == 1:
             # Chinese names.
@@ -124,15 +245,21 @@ class Player:
 
 
 
-    def randomName(self, cultureIndex):
-        ''' Give the player a random name. '''
+    def randomName(self, cultureIndex, rng=random):
+        '''
+        Give the player a random name.  Returns True if the name gives the player a boost.
+
+        :param int cultureIndex: The culture of the name.
+        :param rng: The random number generator to use.
+        '''
         firstNames, lastNames = self.getNames(cultureIndex)
 
-        firstNameIndex = random.randint(0, len(firstNames)-1)
-        lastNameIndex = random.randint(0, len(lastNames)-1)
+        firstNameIndex = rng.randint(0, len(firstNames)-1)
+        lastNameIndex = rng.randint(0, len(lastNames)-1)
         self.name = f'{firstNames[firstNameIndex]} {lastNames[lastNameIndex]}'
         if firstNameIndex == lastNameIndex:
-            print(f'Boost for {self.name}. ', end='')
             self.skill += 200
             if firstNameIndex == 0 and cultureIndex == 0:
                 self.skill += 200
+            return True
+        return False
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement PlayerTable, an array backed store of players for the sport of life program.
+The players are held as NumPy columns so that the season updates can be vectorized.
+:py:class:`PlayerView` is a thin :py:class:`~player.Player` on a row of the table so that the existing code keeps working.
+'''
+
+# Application Libraries.
+from player import Player, PointsHistory, HISTORY_LENGTH
+
+try:
+    # NumPy is optional.  It is only required for the array backed player table.
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+# The integer columns in the table.
+INTEGER_COLUMNS = ('playerId', 'skill', 'round', 'pts', 'ranking', 'wins', 'runnerUp', 'worldChampion', 'topRanking', 'age', 'skillOffset', 'historyCount')
+
+# The floating point columns in the table.
+FLOAT_COLUMNS = ('prizeMoney', 'seasonMoney', 'rating')
+
+# The columns held as Python lists.
+OBJECT_COLUMNS = ('name', 'firstWin', 'lastWin')
+
+
+
+def isAvailable():
+    ''' Returns True if the array backed player table is available. '''
+    return numpy is not None
+
+
+
+def _integerColumn(column):
+    ''' Returns a property for an integer column of the table. '''
+    def getter(self):
+        return int(getattr(self.table, column)[self.index])
+    def setter(self, value):
+        getattr(self.table, column)[self.index] = value
+    return property(getter, setter)
+
+
+
+def _floatColumn(column):
+    ''' Returns a property for a floating point column of the table. '''
+    def getter(self):
+        return float(getattr(self.table, column)[self.index])
+    def setter(self, value):
+        getattr(self.table, column)[self.index] = value
+    return property(getter, setter)
+
+
+
+def _objectColumn(column):
+    ''' Returns a property for a Python list column of the table. '''
+    def getter(self):
+        return getattr(self.table, column)[self.index]
+    def setter(self, value):
+        getattr(self.table, column)[self.index] = value
+    return property(getter, setter)
+
+
+
+class PlayerView(Player):
+    '''
+    Class to represent a player that is a row in a :py:class:`PlayerTable`.
+    The attributes of :py:class:`~player.Player` are properties on the columns of the table.
+
+    :ivar PlayerTable table: The table that holds this player.
+    :ivar int index: The row of this player in the table.
+    '''
+    __slots__ = ('table', 'index')
+
+
+
+    def __init__(self, table, index):    # pylint: disable=super-init-not-called
+        '''
+        Class constructor for the :py:class:`PlayerView` class.
+        The player is not reset.  The row of the table already holds the player.
+
+        :param PlayerTable table: The table that holds this player.
+        :param int index: The row of this player in the table.
+        '''
+        self.table = table
+        self.index = index
+        self.rankingCache = None
+        self.yearsCache = None
+
+
+
+    def __copy__(self):
+        ''' Returns another view of the same row.  The slots of :py:class:`~player.Player` can not be copied because the columns are properties. '''
+        return PlayerView(self.table, self.index)
+
+
+
+    def __reduce__(self):
+        ''' Pickle the view as its table and row.  The table is pickled once for all the views of a list. '''
+        return PlayerView, (self.table, self.index)
+
+
+
+    def toPlayer(self):
+        ''' Returns a :py:class:`~player.Player` with a copy of this row that is not attached to the table.  The player keeps the same id. '''
+        player = Player.__new__(Player)
+        for column in INTEGER_COLUMNS + FLOAT_COLUMNS + OBJECT_COLUMNS:
+            if column != 'historyCount':
+                setattr(player, column, getattr(self, column))
+        player.database = self.table.database
+        player.history = PointsHistory()
+        for pts in self.history:
+            player.history.append(pts)
+        player.rankingCache = None
+        player.yearsCache = None
+        return player
+
+
+
+    @property
+    def database(self):
+        ''' The database that this player is stored in. '''
+        return self.table.database
+
+
+
+    @property
+    def history(self):
+        ''' The points history of the player, oldest first.  This is a copy, use the table to change the history. '''
+        count = int(self.table.historyCount[self.index])
+        return self.table.history[self.index, :count].tolist()
+
+
+
+    @history.setter
+    def history(self, value):
+        ''' Replace the points history of the player. '''
+        value = list(value)[-HISTORY_LENGTH:]
+        self.table.history[self.index, :] = 0
+        self.table.history[self.index, :len(value)] = value
+        self.table.historyCount[self.index] = len(value)
+
+
+
+    def addPoints(self, pts):
+        ''' Add the ranking points from an event to the history of the player. '''
+        row = self.table.history[self.index]
+        count = int(self.table.historyCount[self.index])
+        if count == HISTORY_LENGTH:
+            row[:-1] = row[1:].copy()
+            count -= 1
+        row[count] = pts
+        self.table.historyCount[self.index] = count + 1
+        self.table.pts[self.index] = row.sum()
+
+
+
+for _column in INTEGER_COLUMNS:
+    setattr(PlayerView, _column, _integerColumn(_column))
+for _column in FLOAT_COLUMNS:
+    setattr(PlayerView, _column, _floatColumn(_column))
+for _column in OBJECT_COLUMNS:
+    setattr(PlayerView, _column, _objectColumn(_column))
+
+
+
+class PlayerTable:
+    '''
+    Class to represent a tour of players as NumPy columns.
+    The table behaves like a list of :py:class:`PlayerView` objects.
+
+    :ivar Database database: The database that the players are stored in.
+    :ivar numpy.ndarray history: The points history of each player, oldest first.
+    '''
+
+
+
+    def __init__(self, numPlayers, database=None):
+        '''
+        Class constructor for the :py:class:`PlayerTable` class.
+        The players are in the initial state of :py:meth:`~player.Player.reset`.
+
+        :param int numPlayers: The number of players in the table.
+        :param Database database: The database that the players are stored in.
+        '''
+        if numpy is None:
+            raise ImportError('The player table requires NumPy.')
+        self.database = database
+        # addHistory() replaces these columns with new arrays.  Game.settleTournamentTable() compares the old and new pts.
+        self.historyCount = None
+        self.pts = None
+        for column in INTEGER_COLUMNS:
+            setattr(self, column, numpy.zeros(numPlayers, dtype=numpy.int64))
+        for column in FLOAT_COLUMNS:
+            setattr(self, column, numpy.zeros(numPlayers, dtype=numpy.float64))
+        for column in OBJECT_COLUMNS:
+            setattr(self, column, [None] * numPlayers)
+        self.history = numpy.zeros((numPlayers, HISTORY_LENGTH), dtype=numpy.int64)
+        self.views = [PlayerView(self, index) for index in range(numPlayers)]
+        for view in self.views:
+            view.reset()
+
+
+
+    @classmethod
+    def fromPlayers(cls, players):
+        ''' Returns a new table holding copies of the specified players. '''
+        table = cls(len(players), players[0].database if players else None)
+        for view, player in zip(table.views, players):
+            for column in INTEGER_COLUMNS + FLOAT_COLUMNS + OBJECT_COLUMNS:
+                if column != 'historyCount':
+                    setattr(view, column, getattr(player, column))
+            view.history = player.history
+        return table
+
+
+
+    def __len__(self):
+        ''' Returns the number of players in the table. '''
+        return len(self.views)
+
+
+
+    def __getitem__(self, index):
+        ''' Returns the :py:class:`PlayerView` for the specified row. '''
+        return self.views[index]
+
+
+
+    def __iter__(self):
+        ''' Iterate through the :py:class:`PlayerView` of each row. '''
+        return iter(self.views)
+
+
+
+    def __add__(self, other):
+        ''' Returns a list of the players in this table followed by the other players. '''
+        return self.views + list(other)
+
+
+
+    def addHistory(self, pts):
+        '''
+        Add an event to the points history of every player and update the pts column.
+
+        :param numpy.ndarray pts: The points that each player scored in the event.
+        '''
+        isFull = self.historyCount == HISTORY_LENGTH
+        self.history[isFull, :-1] = self.history[isFull, 1:]
+        column = numpy.minimum(self.historyCount, HISTORY_LENGTH - 1)
+        self.history[numpy.arange(len(self.views)), column] = pts
+        self.historyCount = numpy.minimum(self.historyCount + 1, HISTORY_LENGTH)
+        self.pts = self.history.sum(axis=1)
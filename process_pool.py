@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement ProcessPool, the pool of processes for the parallel parts of the sport of life program.
+The league, the tournament odds and the career statistics all split their work into chunks with :py:func:`splitChunks` and play the chunks on a :py:class:`ProcessPool`.
+With one process the chunks are played in this process and no pool is started.
+'''
+
+# System libraries.
+import concurrent.futures
+import os
+
+
+
+def defaultNumProcesses(maxProcesses=None):
+    ''' Returns the number of cores, up to maxProcesses if specified. '''
+    numProcesses = os.cpu_count() or 1
+    if maxProcesses is not None:
+        numProcesses = min(numProcesses, maxProcesses)
+    return max(1, numProcesses)
+
+
+
+def splitChunks(numItems, numChunks):
+    '''
+    Returns the (first, count) of each chunk when the items are shared between the chunks.
+    The first chunks have one more item than the others when the items do not share equally.  There are never more chunks than items.
+
+    :param int numItems: The number of items to share.
+    :param int numChunks: The number of chunks.
+    '''
+    numChunks = max(1, min(numChunks, numItems))
+    chunks = []
+    first = 0
+    for chunkIndex in range(numChunks):
+        count = numItems // numChunks + (1 if chunkIndex < numItems % numChunks else 0)
+        chunks.append((first, count))
+        first += count
+    return chunks
+
+
+
+class ProcessPool:
+    '''
+    Class to represent a pool of processes that plays tasks in parallel.
+
+    :ivar int numProcesses: The number of processes in the pool.
+    :ivar concurrent.futures.ProcessPoolExecutor executor: The pool of processes or None to play the tasks in this process.
+    '''
+
+
+
+    def __init__(self, numProcesses=None):
+        '''
+        Class constructor for the :py:class:`ProcessPool` class.
+
+        :param int numProcesses: The number of processes in the pool.  None for the number of cores.
+        '''
+        self.numProcesses = numProcesses if numProcesses is not None else defaultNumProcesses()
+        self.executor = None
+        if self.numProcesses > 1:
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.numProcesses)
+
+
+
+    def __enter__(self):
+        ''' Returns the pool for a with statement. '''
+        return self
+
+
+
+    def __exit__(self, excType, excValue, traceback):
+        ''' Shutdown the pool at the end of a with statement. '''
+        self.close()
+
+
+
+    def map(self, function, tasks):
+        '''
+        Returns the result of function(*task) for each task, in the order of the tasks.
+
+        :param function: The worker function.  This must be a module level function so that it can be pickled.
+        :param list tasks: The tuple of arguments of each task.
+        '''
+        if self.executor is None:
+            return [function(*task) for task in tasks]
+        futures = [self.executor.submit(function, *task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+
+    def close(self):
+        ''' Shutdown the pool of processes. '''
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
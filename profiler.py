@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement PhaseProfiler, the timing of the phases of the sport of life program.
+The game only calls the profiler when one is attached, so there is no cost when profiling is disabled.
+The phases are timed with the monotonic time.perf_counter().
+Listeners receive the times of each season, for example to pass them on to monitoring.
+'''
+
+# System libraries.
+import threading
+import time
+
+
+
+# The phases of the game.
+PAIRING = 'pairing'         # Picking the players for the matches in Game.playRound().
+POINTS = 'points'           # Playing the matches in Game.playMatch().
+SETTLEMENT = 'settlement'   # Allocating points and prize money in Game.settleTournament().
+RANKING = 'ranking'         # Walking the ranking order in Game.showRanking().
+RENDERING = 'rendering'     # Formatting the wins and champions tables and painting the display.
+SKILL = 'skill'             # Game.updateSkill().
+AGE = 'age'                 # Game.addAge(), including the retirements.
+ODDS = 'odds'               # Game.showOdds().
+WAITING = 'waiting'         # Clock.wait().
+PHASES = (PAIRING, POINTS, SETTLEMENT, RANKING, RENDERING, SKILL, AGE, ODDS, WAITING)
+
+
+
+class PhaseProfiler:
+    '''
+    Class to accumulate the time spent in each phase of the game.
+    Phases can overlap, for example the waits in an animated match are also counted in the points phase.
+
+    :ivar clock: Function that returns the current time in seconds.
+    :ivar dict seasonTimes: The seconds in each phase this season.
+    :ivar dict seasonCounts: The number of times each phase was timed this season.
+    :ivar dict totalTimes: The seconds in each phase in the completed seasons.
+    :ivar dict totalCounts: The number of times each phase was timed in the completed seasons.
+    :ivar int numSeasons: The number of completed seasons.
+    :ivar list listeners: Functions called with (seasonIndex, seasonTimes, seasonCounts) at the end of each season.
+    '''
+
+
+
+    def __init__(self, clock=time.perf_counter):
+        '''
+        Class constructor for the :py:class:`PhaseProfiler` class.
+
+        :param clock: Function that returns the current time in seconds.
+        '''
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.seasonTimes = dict.fromkeys(PHASES, 0.0)
+        self.seasonCounts = dict.fromkeys(PHASES, 0)
+        self.totalTimes = dict.fromkeys(PHASES, 0.0)
+        self.totalCounts = dict.fromkeys(PHASES, 0)
+        self.numSeasons = 0
+        self.listeners = []
+
+
+
+    def add(self, phase, seconds):
+        ''' Add the time of one occurrence of a phase.  This can be called from any thread. '''
+        with self.lock:
+            self.seasonTimes[phase] += seconds
+            self.seasonCounts[phase] += 1
+
+
+
+    def addListener(self, listener):
+        ''' Add a function to call with (seasonIndex, seasonTimes, seasonCounts) at the end of each season. '''
+        self.listeners.append(listener)
+
+
+
+    def endSeason(self, seasonIndex):
+        ''' Pass the times of the season to the listeners and add them to the totals. '''
+        with self.lock:
+            seasonTimes = self.seasonTimes
+            seasonCounts = self.seasonCounts
+            self.seasonTimes = dict.fromkeys(PHASES, 0.0)
+            self.seasonCounts = dict.fromkeys(PHASES, 0)
+            for phase in PHASES:
+                self.totalTimes[phase] += seasonTimes[phase]
+                self.totalCounts[phase] += seasonCounts[phase]
+            self.numSeasons += 1
+        for listener in self.listeners:
+            listener(seasonIndex, seasonTimes, seasonCounts)
+
+
+
+    def report(self, times=None, counts=None):
+        ''' Returns the lines of a table of the times and counts of each phase.  Defaults to the totals. '''
+        times = self.totalTimes if times is None else times
+        counts = self.totalCounts if counts is None else counts
+        totalTime = sum(seconds for phase, seconds in times.items() if phase != WAITING)
+        lines = [f'{"Phase":<12}{"Seconds":>10}{"Share":>8}{"Count":>12}{"us each":>10}']
+        for phase in PHASES:
+            share = times[phase] / totalTime if totalTime > 0.0 and phase != WAITING else 0.0
+            each = 1e6 * times[phase] / counts[phase] if counts[phase] > 0 else 0.0
+            lines.append(f'{phase:<12}{times[phase]:>10.4f}{share:>8.1%}{counts[phase]:>12,}{each:>10.1f}')
+        return lines
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement RankingIndex, a class to keep players in ranking order.
+The order is maintained incrementally, only the players that change are repositioned.
+A large batch of changes, for example the settlement of a tournament, is repositioned with one sort of the nearly sorted entries.
+'''
+
+# System libraries.
+import bisect
+
+
+
+# The largest batch of changes that is repositioned one player at a time.  Each reposition moves O(n) entries.
+MAX_SINGLE_UPDATES = 8
+
+
+class RankingIndex:
+    '''
+    Class to keep players sorted by a key.
+    Players with equal keys stay in the order that they were added, like a stable sort.
+
+    :ivar keyFunction: Function that returns the sort key of a player.  Lower keys rank higher.
+    :ivar list entries: The sorted list of (key, order, player) entries.
+    :ivar dict playerEntries: The current entry of each player.
+    :ivar source: The list of players that the index was built from.
+    '''
+
+
+
+    def __init__(self, keyFunction, players=(), source=None):
+        '''
+        Class constructor for the :py:class:`RankingIndex` class.
+
+        :param keyFunction: Function that returns the sort key of a player.  Lower keys rank higher.
+        :param players: The initial players in the index.
+        :param source: The list of players that the index was built from.
+        '''
+        self.keyFunction = keyFunction
+        self.source = source
+        self.nextOrder = 0
+        self.entries = []
+        self.playerEntries = {}
+        for player in players:
+            entry = (keyFunction(player), self.nextOrder, player)
+            self.nextOrder += 1
+            self.entries.append(entry)
+            self.playerEntries[player] = entry
+        self.entries.sort()
+
+
+
+    def __len__(self):
+        ''' Returns the number of players in the index. '''
+        return len(self.entries)
+
+
+
+    def __iter__(self):
+        ''' Iterate through the players in ranking order. '''
+        for entry in self.entries:
+            yield entry[2]
+
+
+
+    def __contains__(self, player):
+        ''' Returns True if the player is in the index. '''
+        return player in self.playerEntries
+
+
+
+    def add(self, player):
+        ''' Add a player to the index. '''
+        entry = (self.keyFunction(player), self.nextOrder, player)
+        self.nextOrder += 1
+        bisect.insort(self.entries, entry)
+        self.playerEntries[player] = entry
+
+
+
+    def remove(self, player):
+        ''' Remove a player from the index. '''
+        entry = self.playerEntries.pop(player)
+        del self.entries[bisect.bisect_left(self.entries, entry)]
+
+
+
+    def update(self, player):
+        ''' Reposition the player if their key has changed.  Returns True if the player moved. '''
+        entry = self.playerEntries.get(player)
+        if entry is None:
+            return False
+        key = self.keyFunction(player)
+        if key == entry[0]:
+            return False
+        del self.entries[bisect.bisect_left(self.entries, entry)]
+        entry = (key, entry[1], player)
+        bisect.insort(self.entries, entry)
+        self.playerEntries[player] = entry
+        return True
+
+
+
+    def updateMany(self, players):
+        '''
+        Reposition the players whose keys have changed.  Returns the number of players that moved.
+        A large batch is repositioned with one sort, the entries are nearly sorted so this is close to O(n) rather than O(n) for every player.
+        '''
+        changed = []
+        playerEntries = self.playerEntries
+        keyFunction = self.keyFunction
+        for player in players:
+            entry = playerEntries.get(player)
+            if entry is None:
+                continue
+            key = keyFunction(player)
+            if key != entry[0]:
+                changed.append((entry, (key, entry[1], player)))
+        if len(changed) <= MAX_SINGLE_UPDATES:
+            for oldEntry, entry in changed:
+                del self.entries[bisect.bisect_left(self.entries, oldEntry)]
+                bisect.insort(self.entries, entry)
+                playerEntries[entry[2]] = entry
+        else:
+            for _oldEntry, entry in changed:
+                playerEntries[entry[2]] = entry
+            # The orders are unique, so the sort never compares the players.
+            self.entries = [playerEntries[entry[2]] for entry in self.entries]
+            self.entries.sort()
+        return len(changed)
+
+
+
+    def top(self, numPlayers):
+        ''' Returns the top numPlayers players in ranking order. '''
+        return [entry[2] for entry in self.entries[:numPlayers]]
+
+
+
+    def rankOf(self, player):
+        ''' Returns the position (1 for the top) of the player in the index. '''
+        return bisect.bisect_left(self.entries, self.playerEntries[player]) + 1
+
+
+
+def pointsKey(player):
+    ''' Returns the sort key for the ranking points order. '''
+    return -player.pts
+
+
+
+def winsKey(player):
+    ''' Returns the sort key for the tournament wins order. '''
+    return -player.wins, -player.runnerUp
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement EloRatings, the Elo ratings of the players in the sport of life program.
+The rating of each player is held on the player, so an update is O(1) for each match.
+The ratings are either updated as each match finishes or in a batch at the end of each round.
+A batch of players in a :py:class:`~player_table.PlayerTable` is updated with NumPy.
+'''
+
+# Application Libraries.
+from player_table import PlayerView, numpy
+
+
+
+# The change in the rating of the winner of a match between equal players is half the K factor.
+K_FACTOR = 24.0
+
+# A difference of this many rating points is odds of 10 to 1.
+SCALE = 400.0
+
+
+
+def ratingChange(winnerRating, loserRating, kFactor=K_FACTOR):
+    ''' Returns the rating points that the winner of a match gains and the loser of the match loses. '''
+    return kFactor / (1.0 + 10.0 ** ((winnerRating - loserRating) / SCALE))
+
+
+
+def updateArrays(ratings, winners, losers, kFactor=K_FACTOR):
+    '''
+    Update a NumPy array of ratings with the results of a batch of matches.
+    All the changes are calculated from the ratings before the batch.
+    A row can be in more than one match, so this can update the ratings of a whole Monte Carlo replicate at once.
+
+    :param numpy.ndarray ratings: The ratings to update.
+    :param winners: The row of the winner of each match.
+    :param losers: The row of the loser of each match.
+    :param float kFactor: The K factor of the ratings.
+    '''
+    winners = numpy.asarray(winners, dtype=numpy.intp)
+    losers = numpy.asarray(losers, dtype=numpy.intp)
+    changes = kFactor / (1.0 + 10.0 ** ((ratings[winners] - ratings[losers]) / SCALE))
+    numpy.add.at(ratings, winners, changes)
+    numpy.subtract.at(ratings, losers, changes)
+
+
+
+class EloRatings:
+    '''
+    Class to update the Elo ratings of the players from the results of the matches.
+
+    :ivar float kFactor: The K factor of the ratings.
+    :ivar bool isBatched: True to update the ratings at the end of each round, False to update as each match finishes.
+    :ivar int numMatches: The number of matches that have updated the ratings.
+    :ivar list winners: The winners of the matches in the current batch.
+    :ivar list losers: The losers of the matches in the current batch.
+    '''
+
+
+
+    def __init__(self, kFactor=K_FACTOR, isBatched=False):
+        '''
+        Class constructor for the :py:class:`EloRatings` class.
+
+        :param float kFactor: The K factor of the ratings.
+        :param bool isBatched: True to update the ratings at the end of each round, False to update as each match finishes.
+        '''
+        self.kFactor = kFactor
+        self.isBatched = isBatched
+        self.numMatches = 0
+        self.winners = []
+        self.losers = []
+
+
+
+    def update(self, winner, loser):
+        ''' Update the ratings of the players from the result of a match. '''
+        change = self.kFactor / (1.0 + 10.0 ** ((winner.rating - loser.rating) / SCALE))
+        winner.rating += change
+        loser.rating -= change
+        self.numMatches += 1
+
+
+
+    def add(self, winner, loser):
+        ''' Add the result of a match.  The ratings are updated now or at the end of the round. '''
+        if self.isBatched:
+            self.winners.append(winner)
+            self.losers.append(loser)
+        else:
+            self.update(winner, loser)
+
+
+
+    def endRound(self):
+        ''' Update the ratings from the results of the matches in the round.  All the changes are calculated from the ratings before the round. '''
+        winners = self.winners
+        losers = self.losers
+        if not winners:
+            return
+        if numpy is not None and isinstance(winners[0], PlayerView):
+            # The players are rows in a table.
+            updateArrays(winners[0].table.rating, [player.index for player in winners], [player.index for player in losers], self.kFactor)
+        else:
+            changes = [ratingChange(winner.rating, loser.rating, self.kFactor) for winner, loser in zip(winners, losers)]
+            for winner, loser, change in zip(winners, losers, changes):
+                winner.rating += change
+                loser.rating -= change
+        self.numMatches += len(winners)
+        self.winners = []
+        self.losers = []
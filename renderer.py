@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement Renderer, a class to draw the sport of life program on the console.
+The renderer runs on its own thread and repaints at a capped frame rate.
+The game publishes the latest live state (the score line) and writes the text of the tables.
+A live state that is replaced before the next frame is never drawn.
+'''
+
+# System libraries.
+import sys
+import threading
+
+# Application Libraries.
+import profiler
+
+
+
+class Renderer:
+    '''
+    Class to draw the console output at a capped frame rate on its own thread.
+
+    :ivar float framePeriod: The minimum time between frames in seconds.
+    :ivar formatLive: Function that returns the text of the live line for a published state.
+    :ivar int numPublished: The number of live states published.
+    :ivar int numFrames: The number of frames painted.
+    :ivar PhaseProfiler profiler: The profiler that the painting time is added to, or None.
+    '''
+
+
+
+    def __init__(self, framesPerSecond=30, stream=None):
+        '''
+        Class constructor for the :py:class:`Renderer` class.
+
+        :param float framesPerSecond: The maximum number of frames per second.
+        :param stream: The stream to draw on.  Defaults to sys.stdout.
+        '''
+        self.stream = stream if stream is not None else sys.stdout
+        self.framePeriod = 1.0 / framesPerSecond
+        self.formatLive = str
+        self.lock = threading.Lock()
+        self.paintLock = threading.Lock()
+        self.pending = []
+        self.live = None
+        self.isLiveChanged = False
+        self.numPublished = 0
+        self.numFrames = 0
+        self.profiler = None
+        self.stopEvent = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='Renderer', daemon=True)
+
+
+
+    def start(self):
+        ''' Start the renderer thread. '''
+        self.thread.start()
+
+
+
+    def close(self):
+        ''' Stop the renderer thread and paint anything that is left. '''
+        self.stopEvent.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        self.paint()
+
+
+
+    def write(self, *args, sep=' ', end='\n', flush=False):    # pylint: disable=unused-argument
+        ''' Replacement for print() that queues the text for the next frame. '''
+        text = sep.join(str(arg) for arg in args) + end
+        with self.lock:
+            self.pending.append(text)
+
+
+
+    def publish(self, state):
+        ''' Publish the latest live state.  This replaces any state that has not been painted yet. '''
+        with self.lock:
+            self.live = state
+            self.isLiveChanged = True
+            self.numPublished += 1
+
+
+
+    def commit(self):
+        ''' Finish the live line.  The latest live state is written as a permanent line. '''
+        with self.lock:
+            if self.live is not None:
+                self.pending.append(self.formatLive(self.live) + '\n')
+            self.live = None
+            self.isLiveChanged = False
+
+
+
+    def paint(self):
+        ''' Paint a frame.  This is called by the renderer thread, or call it directly to flush the output now. '''
+        with self.paintLock:
+            with self.lock:
+                text = ''.join(self.pending)
+                self.pending.clear()
+                live = self.live
+                isLiveChanged = self.isLiveChanged
+                self.isLiveChanged = False
+            if not text and not isLiveChanged:
+                return
+            if self.profiler is not None:
+                startTime = self.profiler.clock()
+            if text:
+                self.stream.write(text)
+            if live is not None:
+                # The text overwrote the live line, so redraw it even if it has not changed.
+                self.stream.write(self.formatLive(live) + '\r')
+            self.stream.flush()
+            self.numFrames += 1
+            if self.profiler is not None:
+                self.profiler.add(profiler.RENDERING, self.profiler.clock() - startTime)
+
+
+
+    def flush(self):
+        ''' Paint everything that is queued now. '''
+        self.paint()
+
+
+
+    def _run(self):
+        ''' The renderer thread.  Paint a frame every frame period until stopped. '''
+        while not self.stopEvent.wait(self.framePeriod):
+            self.paint()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the random number streams of the sport of life program.
+Every stream is derived from one master seed and the key of the stream, for example ('tournament', 1970, 3).
+A stream does not depend on how many numbers the other streams have used, so the results do not depend on the order that things run in.
+'''
+
+# System libraries.
+import hashlib
+import random
+
+
+
+# The streams of the game.
+PLAYERS = 'players'
+SEASON = 'season'
+TOURNAMENT = 'tournament'
+ODDS = 'odds'
+DIVISION = 'division'
+CAREER = 'career'
+
+# The largest master seed.  The master seed is a 64 bit unsigned integer so that it fits in a snapshot.
+MAX_SEED = 2 ** 64 - 1
+
+
+
+def newSeed():
+    ''' Returns a new random master seed. '''
+    return random.SystemRandom().getrandbits(64)
+
+
+
+class RandomStreams:
+    '''
+    Class to derive independent random number streams from a master seed.
+
+    :ivar int seed: The master seed.
+    '''
+
+
+
+    def __init__(self, seed=None):
+        '''
+        Class constructor for the :py:class:`RandomStreams` class.
+
+        :param int seed: The master seed.  None for a random master seed.
+        '''
+        self.seed = newSeed() if seed is None else seed
+
+
+
+    def derive(self, *key):
+        ''' Returns the 64 bit seed of the stream with the specified key. '''
+        text = ' '.join(str(part) for part in (self.seed,) + key)
+        return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+
+    def stream(self, *key):
+        ''' Returns a new random number generator for the stream with the specified key. '''
+        return random.Random(self.derive(*key))
+
+
+
+    def season(self, seasonIndex):
+        ''' Returns the stream for the events between the tournaments of a season. '''
+        return self.stream(SEASON, seasonIndex)
+
+
+
+    def tournament(self, seasonIndex, tournamentIndex):
+        ''' Returns the stream for the draw and the matches of a tournament. '''
+        return self.stream(TOURNAMENT, seasonIndex, tournamentIndex)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement ScoreLine, the score line of a match in the sport of life program.
+The parts of the line that do not change during a match are built once when the match starts.
+Each point only joins the prebuilt parts with the prebuilt text of the scores.
+'''
+
+# Application Libraries.
+import ansi
+
+
+
+# The text of the scores on each side of the line.
+LEFT_SCORES = [f'{score:>2}' for score in range(100)]
+RIGHT_SCORES = [f'{score:<2}' for score in range(100)]
+
+
+
+class ScoreLine:
+    '''
+    Class to represent the prebuilt parts of the score line of a match.
+
+    :ivar int highlightId: The playerId of the highlighted player when the line was built.
+    :ivar int closeScore: The score that both players must reach for the score to be close.
+    :ivar str left: The colour and name of player 1 followed by the score colour.
+    :ivar str closeLeft: The left of the line when the score is close.
+    :ivar str right: The colour and name of player 2.
+    :ivar str closeRight: The right of the line when the score is close.
+    '''
+
+
+
+    def __init__(self, player1, player2, winTarget, highlightId):
+        '''
+        Class constructor for the :py:class:`ScoreLine` class.
+
+        :param Player player1: The player on the left.
+        :param Player player2: The player on the right.
+        :param int winTarget: The number of points to win the match.
+        :param int highlightId: The playerId of the highlighted player.
+        '''
+        player1Colour = ansi.MAGENTA if player1.playerId == highlightId else ''
+        player2Colour = ansi.MAGENTA if player2.playerId == highlightId else ''
+        player1Name = f'{player1Colour}{player1.nameWithRanking():>22}'
+        player2Name = f'{player2.nameWithRanking():<22}{ansi.RESET_ALL}'
+        self.highlightId = highlightId
+        self.closeScore = winTarget - 1
+        self.left = f'{player1Name}{ansi.RESET_ALL} '
+        self.closeLeft = f'{player1Name}{ansi.RED} '
+        self.right = f' {player2Colour}{player2Name}'
+        self.closeRight = f' {player2Colour or ansi.RESET_ALL}{player2Name}'
+
+
+
+    def format(self, score1, score2):
+        ''' Returns the score line for the specified score.  A close score is shown in red. '''
+        scoreText1 = LEFT_SCORES[score1] if score1 < 100 else str(score1)
+        scoreText2 = RIGHT_SCORES[score2] if score2 < 100 else str(score2)
+        if score1 >= self.closeScore and score2 >= self.closeScore:
+            return ''.join((self.closeLeft, scoreText1, ' - ', scoreText2, self.closeRight))
+        return ''.join((self.left, scoreText1, ' - ', scoreText2, self.right))
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to implement the snapshots of the sport of life program.
+A snapshot holds the full state of a :py:class:`~sport_of_life.Game` at the end of a season so that the game can be resumed.
+The random numbers of each season come from streams derived from the master seed, so the master seed is the whole random number state.
+The players are written as packed columns, so saving and loading is quick even for very large tours.
+The retired players never change, so each snapshot only appends the players that retired since the last snapshot to a retired file next to the snapshot.
+'''
+
+# System libraries.
+import array
+import collections
+import itertools
+import operator
+import os
+import struct
+
+# Application Libraries.
+from player import Player, PointsHistory, HISTORY_LENGTH
+import player as player_module
+from player_table import PlayerTable
+from rng import RandomStreams
+from hall_of_fame import HallOfFame
+from champions import Champions
+import champions
+
+
+
+# The file header.  Magic, version.
+MAGIC = b'SOLS'
+VERSION = 6
+HEADER = struct.Struct('<4sH')
+
+# The game state.  Season, prize money, average skill, next player id, master seed, highlighted player id.
+GAME = struct.Struct('<qddqQq')
+
+# The length of a section.
+LENGTH = struct.Struct('<Q')
+
+# The integer columns of a player.
+INTEGER_COLUMNS = ('playerId', 'skill', 'round', 'pts', 'ranking', 'wins', 'runnerUp', 'worldChampion', 'topRanking', 'age', 'skillOffset')
+
+# The floating point columns of a player.
+FLOAT_COLUMNS = ('prizeMoney', 'seasonMoney', 'rating')
+
+# The season columns of a player.  None is held as -1.
+SEASON_COLUMNS = ('firstWin', 'lastWin')
+
+
+
+def _packBytes(parts, data):
+    ''' Add a length prefixed section to the parts of the snapshot. '''
+    parts.append(LENGTH.pack(len(data)))
+    parts.append(data)
+
+
+
+def _packStrings(parts, strings):
+    ''' Add a section of strings to the parts of the snapshot. '''
+    _packBytes(parts, '\n'.join(strings).encode('utf-8'))
+
+
+
+def _column(players, column):
+    ''' Returns the values of a column of the players as a list. '''
+    if isinstance(players, PlayerTable):
+        values = getattr(players, column)
+        return values if isinstance(values, list) else values.tolist()
+    return list(map(operator.attrgetter(column), players))
+
+
+
+def _packPlayers(parts, players):
+    ''' Add the columns of the players to the parts of the snapshot. '''
+    _packBytes(parts, LENGTH.pack(len(players)))
+    for column in INTEGER_COLUMNS:
+        _packBytes(parts, array.array('q', _column(players, column)).tobytes())
+    for column in FLOAT_COLUMNS:
+        _packBytes(parts, array.array('d', _column(players, column)).tobytes())
+    for column in SEASON_COLUMNS:
+        _packBytes(parts, array.array('q', [-1 if season is None else season for season in _column(players, column)]).tobytes())
+    _packStrings(parts, _column(players, 'name'))
+
+    # The points histories as ring buffers.
+    if isinstance(players, PlayerTable):
+        _packBytes(parts, bytes(len(players)))
+        _packBytes(parts, array.array('B', players.historyCount.tolist()).tobytes())
+        _packBytes(parts, players.history.astype('<u2').tobytes())
+    else:
+        histories = _column(players, 'history')
+        _packBytes(parts, array.array('B', map(operator.attrgetter('start'), histories)).tobytes())
+        _packBytes(parts, array.array('B', map(operator.attrgetter('count'), histories)).tobytes())
+        _packBytes(parts, b''.join([history.values.tobytes() for history in histories]))
+
+
+
+def retiredFileName(fileName):
+    ''' Returns the name of the file that holds the retired players of the specified snapshot. '''
+    return f'{fileName}.retired'
+
+
+
+def _setColumn(objects, column, values):
+    ''' Set an attribute of each object from a column of values. '''
+    collections.deque(map(setattr, objects, itertools.repeat(column), values), maxlen=0)
+
+
+
+def _packChampions(parts, seasons):
+    ''' Add the columns of the history of the champions to the parts of the snapshot. '''
+    for column in champions.COLUMNS:
+        _packBytes(parts, getattr(seasons, column).tobytes())
+    _packBytes(parts, array.array('q', seasons.names.keys()).tobytes())
+    _packStrings(parts, seasons.names.values())
+
+
+
+class _Unpacker:
+    ''' Class to read the sections of a snapshot. '''
+
+
+
+    def __init__(self, data):
+        ''' Class constructor for the :py:class:`_Unpacker` class. '''
+        self.data = memoryview(data)
+        self.offset = 0
+
+
+
+    def unpack(self, layout):
+        ''' Returns the fields of a struct at the current position. '''
+        fields = layout.unpack_from(self.data, self.offset)
+        self.offset += layout.size
+        return fields
+
+
+
+    def bytes(self):
+        ''' Returns the next length prefixed section. '''
+        length, = self.unpack(LENGTH)
+        data = self.data[self.offset:self.offset + length]
+        if len(data) != length:
+            raise ValueError('The snapshot is truncated.')
+        self.offset += length
+        return data
+
+
+
+    def array(self, typecode):
+        ''' Returns the next section as an array. '''
+        values = array.array(typecode)
+        values.frombytes(self.bytes())
+        return values
+
+
+
+    def strings(self):
+        ''' Returns the next section as a list of strings. '''
+        text = bytes(self.bytes()).decode('utf-8')
+        return text.split('\n') if text else []
+
+
+
+    def champions(self):
+        ''' Returns the next section as the history of the champions. '''
+        seasons = Champions()
+        for column in champions.COLUMNS:
+            getattr(seasons, column).frombytes(self.bytes())
+        seasons.names = dict(zip(self.array('q'), self.strings()))
+        seasons.buildIndexes()
+        return seasons
+
+
+
+    def players(self):
+        ''' Returns the next section as a list of players. '''
+        numPlayers, = LENGTH.unpack(self.bytes())
+
+        # Bypass the constructors, they would use new player ids.  The players are filled in column by column.
+        players = [Player.__new__(Player) for _index in range(numPlayers)]
+        _setColumn(players, 'database', itertools.repeat(None))
+        _setColumn(players, 'rankingCache', itertools.repeat(None))
+        _setColumn(players, 'yearsCache', itertools.repeat(None))
+        for column in INTEGER_COLUMNS:
+            _setColumn(players, column, self.array('q'))
+        for column in FLOAT_COLUMNS:
+            _setColumn(players, column, self.array('d'))
+        for column in SEASON_COLUMNS:
+            _setColumn(players, column, [None if season == -1 else season for season in self.array('q')])
+        _setColumn(players, 'name', self.strings())
+
+        # The points histories.
+        histories = [PointsHistory.__new__(PointsHistory) for _index in range(numPlayers)]
+        _setColumn(histories, 'start', self.array('B'))
+        _setColumn(histories, 'count', self.array('B'))
+        values = self.array('H')
+        _setColumn(histories, 'values', [values[offset:offset + HISTORY_LENGTH] for offset in range(0, numPlayers * HISTORY_LENGTH, HISTORY_LENGTH)])
+        _setColumn(players, 'history', histories)
+        return players
+
+
+
+def save(fileName, game):
+    '''
+    Save the state of the game to a snapshot file.
+    The file is replaced atomically, a crash while saving leaves the previous snapshot.
+    The new retired players are appended to the retired file first.  The snapshot holds the size of the retired file, so a crash after the append is ignored.
+
+    :param str fileName: The name of the snapshot file.
+    :param Game game: The game to save.
+    '''
+    # Peek at the next player id and put it back.
+    nextPlayerId = next(player_module.playerIds)
+    player_module.playerIds = itertools.count(nextPlayerId)
+
+    # Append the new retired players.  The retired file is started again if all the retired players are new.
+    newPlayers = game.retiredPlayers.takeNewPlayers()
+    retiredParts = []
+    _packPlayers(retiredParts, newPlayers)
+    with open(retiredFileName(fileName), 'wb' if len(newPlayers) == len(game.retiredPlayers) else 'ab') as file:
+        file.write(b''.join(retiredParts))
+        file.flush()
+        os.fsync(file.fileno())
+        retiredSize = file.tell()
+
+    parts = [HEADER.pack(MAGIC, VERSION), GAME.pack(game.seasonIndex, game.prizeMoney, game.avgSkill, nextPlayerId, game.streams.seed, game.highlightId), LENGTH.pack(retiredSize)]
+    _packChampions(parts, game.seasons)
+    _packPlayers(parts, game.players)
+
+    temporaryName = f'{fileName}.tmp'
+    with open(temporaryName, 'wb') as file:
+        file.write(b''.join(parts))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporaryName, fileName)
+
+
+
+def load(fileName, game):
+    '''
+    Restore the state of the game from a snapshot file.
+    This includes the master seed, so the game continues exactly as if it had not stopped.
+    The players are restored into a :py:class:`~player_table.PlayerTable` if the game uses one.
+
+    :param str fileName: The name of the snapshot file.
+    :param Game game: The game to restore.
+    '''
+    with open(fileName, 'rb') as file:
+        unpacker = _Unpacker(file.read())
+    magic, version = unpacker.unpack(HEADER)
+    if magic != MAGIC:
+        raise ValueError('The file is not a sport of life snapshot.')
+    if version != VERSION:
+        raise ValueError(f'The snapshot is version {version}.  Expecting version {VERSION}.')
+    game.seasonIndex, game.prizeMoney, game.avgSkill, nextPlayerId, seed, game.highlightId = unpacker.unpack(GAME)
+    retiredSize, = unpacker.unpack(LENGTH)
+    game.streams = RandomStreams(seed)
+    game.seasons = unpacker.champions()
+    players = unpacker.players()
+    _setColumn(players, 'database', itertools.repeat(game.database))
+
+    # The retired players are in batches, one for each snapshot.  Anything after the size in the snapshot is from a snapshot that did not complete.
+    with open(retiredFileName(fileName), 'r+b') as file:
+        retiredUnpacker = _Unpacker(file.read(retiredSize))
+        if len(retiredUnpacker.data) != retiredSize:
+            raise ValueError('The retired players file is truncated.')
+        file.truncate(retiredSize)
+    game.retiredPlayers = HallOfFame()
+    while retiredUnpacker.offset < retiredSize:
+        game.retiredPlayers.extend(retiredUnpacker.players())
+    game.retiredPlayers.takeNewPlayers()
+    game.players = PlayerTable.fromPlayers(players) if game.isPlayerTable else players
+    player_module.playerIds = itertools.count(nextPlayerId)
+
+    # The indexes are rebuilt from the restored players.
+    game.rankingIndex = None
+    game.winsIndex = None
+    game.nameIndex = None
+    game.lastWinner = None
+
+    # The database, the journal and the match export may already hold the seasons after the snapshot.
+    if game.database is not None:
+        game.database.removeSeasons(game.seasonIndex)
+    if game.journal is not None:
+        game.journal.removeSeasons(game.seasonIndex)
+    if game.matchExport is not None:
+        game.matchExport.removeSeasons(game.seasonIndex)
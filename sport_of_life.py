@@ -13,11 +13,41 @@ import argparse
 import platform
 import time
 import random
+import heapq
 
 # Application Libraries.
 from player import Player
+from draw_index import DrawIndex
+import bracket
+from player_table import PlayerTable, numpy
+import player_table
+from ranking_index import RankingIndex
+import ranking_index
+from name_index import NameIndex
+from score_line import ScoreLine
+from hall_of_fame import HallOfFame
+from renderer import Renderer
 from inkey import InKey
 import ansi
+import match_engine
+import tournament_odds
+import champions
+from champions import Champions
+import journal
+import match_export
+from database import Database
+from ratings import EloRatings
+from clock import Clock
+import clock
+import snapshot
+import rng
+import profiler
+from profiler import PhaseProfiler
+
+
+
+def discardOutput(*_args, **_kwargs):
+    ''' Replacement for print() that discards the output. '''
 
 
 
@@ -28,45 +58,141 @@ class Game:
 
     def __init__(self):
         ''' Class constructor. '''
-        self.isWait = True
+        self.clock = Clock()
         self.isFullRanking = False
         self.isExitGame = False
-        self.highlight = ''
+        self.highlightId = 0
         self.avgSkill = 0.0
+        self.matchEngine = match_engine.ANIMATED
+        self.engine = self.matchEngine
+        self.isPlayerTable = False
+        self.isHeadless = False
+        self.keyboard = None
+        self.output = print
+        self.oddsEngine = None
+        self.numOddsReplicates = 0
+        self.rankingIndex = None
+        self.winsIndex = None
+        self.nameIndex = None
+        self.lastWinner = None
+        self.framesPerSecond = 30
+        self.renderer = None
+        self.journal = None
+        self.matchExport = None
+        self.database = None
+        self.ratings = EloRatings()
+        self.careerStats = None
+        self.lastScore = (0, 0)
+        self.numPlayers = 80
+        self.isWorldTitle = True
+        self.players = None
+        self.retiredPlayers = None
+        self.seasons = None
+        self.seasonIndex = 1968
+        self.prizeMoney = 200000.0
+        self.snapshotFile = None
+        self.streams = rng.RandomStreams()
+        self.random = random
+        self.tournamentIndex = 0
+        self.numShowWins = 40
+        self.numShowSeasons = 20
+        self.championsPage = 0
+        self.profiler = None
+
+
+
+    def setHeadless(self):
+        '''
+        Run the game without a terminal.
+        There is no keyboard, no console output, no waits and the matches use the fast match engine.
+        '''
+        self.isHeadless = True
+        self.clock.speed = clock.VIRTUAL
+        self.keyboard = None
+        self.output = discardOutput
+        self.matchEngine = match_engine.FAST
+        self.engine = self.matchEngine
+        # Nobody watches the ratings change during a round.
+        self.ratings.isBatched = True
+
+
+
+    def selectEngine(self, engine):
+        ''' Select the match engine for the current tournament.  None selects the default match engine. '''
+        self.engine = self.matchEngine if engine is None else engine
 
 
 
     def playMatch(self, player1, player2, winTarget):
-        ''' Play a match between the specified players. '''
+        ''' Play a match between the specified players with the selected match engine. '''
+        if self.engine == match_engine.FAST:
+            return self.playMatchFast(player1, player2, winTarget)
+        return self.playMatchAnimated(player1, player2, winTarget)
+
+
+
+    def playMatchFast(self, player1, player2, winTarget):
+        ''' Play a match between the specified players in a single step. '''
+        score1, score2 = match_engine.playFastMatch(player1.skill, player2.skill, winTarget, self.random)
+        self.lastScore = (score1, score2)
+
+        if self.isHeadless:
+            if score1 > score2:
+                return player1, player2
+            return player2, player1
+
+        player1Colour = ansi.MAGENTA if player1.playerId == self.highlightId else ''
+        player2Colour = ansi.MAGENTA if player2.playerId == self.highlightId else ''
+        self.output(f'{player1Colour}{player1.nameWithRanking():>22}{ansi.RESET_ALL} {score1:>2} - {score2:<2} {player2Colour}{player2.nameWithRanking():<22}{ansi.RESET_ALL}')
+
+        self.processKeys(player1, player2)
+
+        # Return the winner and loser.
+        if score1 > score2:
+            return player1, player2
+        return player2, player1
+
+
+
+    def formatScore(self, state):
+        ''' Returns the score line for the live state (scoreLine, score1, score2) of a match. '''
+        scoreLine, score1, score2 = state
+        return scoreLine.format(score1, score2)
+
+
+
+    def playMatchAnimated(self, player1, player2, winTarget):
+        ''' Play a match between the specified players point by point. '''
         score1 = 0
         score2 = 0
+        # The parts of the score line that do not change are built once for the match.
+        scoreLine = ScoreLine(player1, player2, winTarget, self.highlightId)
         while score1 < winTarget and score2 < winTarget:
-            if random.randrange(player1.skill) >= random.randrange(player2.skill):
+            if self.random.randrange(player1.skill) >= self.random.randrange(player2.skill):
                 score1 += 1
             else:
                 score2 += 1
-            player1Colour = ansi.MAGENTA if self.highlight == player1.name else ''
-            player2Colour = ansi.MAGENTA if self.highlight == player2.name else ''
-            resetScore = ansi.RESET_ALL
-
-            # Highlight a close score.
-            if score1 >= winTarget - 1  and score2 >= winTarget - 1:
-                resetScore = ansi.RED
-                if player2Colour == '':
-                    player2Colour = ansi.RESET_ALL
-
-            print(f'{player1Colour}{player1.nameWithRanking():>22}{resetScore} {score1:>2} - {score2:<2} {player2Colour}{player2.nameWithRanking():<22}{ansi.RESET_ALL}', end='\r', flush=True)
+            if self.renderer is None:
+                self.output(scoreLine.format(score1, score2), end='\r', flush=True)
+            else:
+                self.renderer.publish((scoreLine, score1, score2))
 
             self.processKeys(player1, player2)
+            if scoreLine.highlightId != self.highlightId:
+                # The highlight was changed during the match.
+                scoreLine = ScoreLine(player1, player2, winTarget, self.highlightId)
 
-            if self.isWait:
-                # Wait.
-                time.sleep(0.25)
-                # Extra wait before
-                if score1 == winTarget - 1  and score2 == winTarget - 1:
-                    time.sleep(1.0)
+            # Wait.
+            self.clock.wait(0.25)
+            # Extra wait before the deciding point.
+            if score1 == winTarget - 1 and score2 == winTarget - 1:
+                self.clock.wait(1.0)
 
-        print()
+        if self.renderer is None:
+            self.output()
+        else:
+            self.renderer.commit()
+        self.lastScore = (score1, score2)
 
         # Return the winner and loser.
         if score1 > score2:
@@ -75,324 +201,266 @@ class Game:
 
 
 
-    def playRound(self, players, keyHome, keyAway, keyWin, keyLose, numMatches, scoreTarget):
-        ''' Play a round of a tournament. '''
+    def playRound(self, draw, keyHome, keyAway, keyWin, keyLose, numMatches, scoreTarget):
+        ''' Play a round of a tournament.  The caller ends the round of the ratings, a round of a seeded draw is several calls. '''
+        phaseProfiler = self.profiler
         for _matchCount in range(numMatches):
-            # Find 2 players that are in this round.
-            player1Index = random.randint(0, len(players)-1)
-            while players[player1Index].round != keyHome:
-                player1Index = random.randint(0, len(players)-1)
-            players[player1Index].round = keyWin
+            if phaseProfiler is not None:
+                startTime = phaseProfiler.clock()
 
-            player2Index = random.randint(0, len(players)-1)
-            while players[player2Index].round != keyAway:
-                player2Index = random.randint(0, len(players)-1)
-            players[player2Index].round = keyWin
+            # Find 2 players that are in this round.
+            player1 = draw.pick(keyHome)
+            player2 = draw.pick(keyAway)
 
             # Swap the players, so lowest ranking player in on the left.
-            if players[player2Index].ranking < players[player1Index].ranking:
-                player1Index, player2Index = player2Index, player1Index
-
-            # Play the match.
-            _winner, loser = self.playMatch(players[player1Index], players[player2Index], scoreTarget)
-            loser.round = keyLose
-
+            if player2.ranking < player1.ranking:
+                player1, player2 = player2, player1
 
+            if phaseProfiler is not None:
+                pairTime = phaseProfiler.clock()
+                phaseProfiler.add(profiler.PAIRING, pairTime - startTime)
 
-    def playSeededTournament(self, players, title, prizeMoney):
+            # Play the match.
+            winner, loser = self.playMatch(player1, player2, scoreTarget)
+            if phaseProfiler is not None:
+                phaseProfiler.add(profiler.POINTS, phaseProfiler.clock() - pairTime)
+            draw.add(winner, keyWin)
+            draw.add(loser, keyLose)
+            if self.journal is not None:
+                self.journal.write(journal.MATCH, winner.playerId, loser.playerId, max(self.lastScore), min(self.lastScore), -keyLose)
+            if self.matchExport is not None:
+                self.matchExport.write(-keyLose, player1, player2, *self.lastScore)
+            if self.database is not None:
+                self.database.addMatch(-keyLose, winner, loser, max(self.lastScore), min(self.lastScore))
+            self.ratings.add(winner, loser)
+
+
+
+    def playBracket(self, players, spec, title, prizeMoney, engine=None):
         '''
-        Play a tournament with seeded players.
-        64 Unseeded players in 2 qualifying rounds.
-         '''
-        print(f'{" " * 15}{title} (Seeded)')
-        self.isWait = True
-
-        # Sort by pts.
-        players = sorted(players, key=lambda Player: Player.pts, reverse=True)
-
-        # Seed the players.
-        count = 1
+        Play a tournament with the draw described by the :py:class:`~bracket.BracketSpec`.
+        The draw is compiled once for the number of players and then replayed step by step.
+        The engine selects the match engine for this tournament, None for the default.
+        The draw and the matches use the random number stream of this tournament.
+        '''
+        plan = spec.plan(len(players))
+        self.output(f'{" " * 15}{title}{spec.heading}')
+        self.selectEngine(engine)
+        self.tournamentIndex += 1
+        seasonRandom = self.random
+        self.random = self.streams.tournament(self.seasonIndex, self.tournamentIndex)
+        if self.journal is not None:
+            self.journal.tournament = self.tournamentIndex
+        if self.matchExport is not None:
+            self.matchExport.startTournament(self.seasonIndex, self.tournamentIndex, title)
+        if self.database is not None:
+            self.database.startTournament(self.seasonIndex, self.tournamentIndex, title, plan.isWorldChampionship, prizeMoney)
+
+        # Seed the top players by pts.
         for player in players:
-            player.round = count
-            if count < 17:
-                count += 1
-            # print('{:>5} {:<22}{:>4}'.format(count, player.nameWithRanking(), player.round), end='\n')
-
-
-        # Qualifiying.
-        print(f'{title} Qualifying 1')
-        self.playRound(players, 17, 17, 18, 0, 32, 5)
-
-        print(f'{title} Qualifying 2')
-        self.playRound(players, 18, 18, 19, 0, 16, 5)
-
-        # Round One.
-        print(f'{title} Round One')
-        self.playRound(players, 1, 19, 20, -1, 1, 6)
-        self.playRound(players, 16, 19, 20, -1, 1, 6)
-        self.playRound(players, 9, 19, 21, -1, 1, 6)
-        self.playRound(players, 8, 19, 21, -1, 1, 6)
-        self.playRound(players, 5, 19, 22, -1, 1, 6)
-        self.playRound(players, 11, 19, 22, -1, 1, 6)
-        self.playRound(players, 13, 19, 23, -1, 1, 6)
-        self.playRound(players, 4, 19, 23, -1, 1, 6)
-        self.playRound(players, 3, 19, 24, -1, 1, 6)
-        self.playRound(players, 14, 19, 24, -1, 1, 6)
-        self.playRound(players, 12, 19, 25, -1, 1, 6)
-        self.playRound(players, 6, 19, 25, -1, 1, 6)
-        self.playRound(players, 7, 19, 26, -1, 1, 6)
-        self.playRound(players, 10, 19, 26, -1, 1, 6)
-        self.playRound(players, 15, 19, 27, -1, 1, 6)
-        self.playRound(players, 2, 19, 27, -1, 1, 6)
-
-        # Round Two.
-        print(f'{title} Round Two')
-        self.playRound(players, 20, 20, 30, -2, 1, 9)
-        self.playRound(players, 21, 21, 30, -2, 1, 9)
-        self.playRound(players, 22, 22, 31, -2, 1, 9)
-        self.playRound(players, 23, 23, 31, -2, 1, 9)
-        self.playRound(players, 24, 24, 32, -2, 1, 9)
-        self.playRound(players, 25, 25, 32, -2, 1, 9)
-        self.playRound(players, 26, 26, 33, -2, 1, 9)
-        self.playRound(players, 27, 27, 33, -2, 1, 9)
-
-        # Quarter Finals.
-        print(f'{title} Quarter Finals')
-        self.playRound(players, 30, 30, 40, -3, 1, 10)
-        self.playRound(players, 31, 31, 40, -3, 1, 10)
-        self.playRound(players, 32, 32, 41, -3, 1, 10)
-        self.playRound(players, 33, 33, 41, -3, 1, 10)
-
-        # Semi Finals.
-        print(f'{title} Semi Finals')
-        self.playRound(players, 40, 40, 50, -4, 1, 13)
-        self.playRound(players, 41, 41, 50, -4, 1, 13)
-
-        print(f'{title} Final')
-        self.playRound(players, 50, 50, -6, -5, 1, 17)
+            player.round = plan.numSeeds + 1
+        if plan.numSeeds > 0:
+            for count, player in enumerate(self.getRankingIndex(players).top(plan.numSeeds), 1):
+                player.round = count
+        draw = DrawIndex(players, self.random)
+
+        # Play the draw.
+        for step in plan.steps:
+            if step[0] == bracket.ROUND:
+                self.playRound(draw, *step[1:])
+            elif step[0] == bracket.MERGE:
+                draw.moveAll(step[1], step[2])
+            else:
+                # Each round of the draw starts with its title.  Update the ratings from all the matches of the last round at once.
+                self.ratings.endRound()
+                self.output(f'{title} {step[1]}')
+        self.ratings.endRound()
+        # Skipping the delays with [space] only lasts for the matches of the tournament.
+        self.clock.stopSkipping()
 
         # Allocate ranking points and find the winner.
-        winner = None
-        for player in players:
-            if player.round == 9:
-                player.round = 0
-            elif player.round == -6:
-                winner = player
-                winner.wins += 1
-            elif player.round == -5:
-                player.runnerUp += 1
-
-            pts = [0, 1, 2, 4, 8, 16, 32][-player.round]
-            player.history.append(pts)
-            while len(player.history) > 12:
-                del player.history[0]
-            player.pts = 0
-            for pts in player.history:
-                player.pts += pts
-
-            # Prize Money.
-            moneyIndex = [0, 13, 28, 42, 56, 75, 100][-player.round]
-            actualMoney = prizeMoney * (moneyIndex / 100)
-            player.prizeMoney += actualMoney
-            player.seasonMoney += actualMoney
+        if self.profiler is not None:
+            startTime = self.profiler.clock()
+        winner = self.settleTournament(players, plan.pointsTable, plan.moneyTable, prizeMoney, plan.isWorldChampionship)
+        if self.profiler is not None:
+            self.profiler.add(profiler.SETTLEMENT, self.profiler.clock() - startTime)
+        self.random = seasonRandom
+        if self.database is not None:
+            self.database.endTournament(winner)
+        if self.careerStats is not None:
+            self.careerStats.addTournament(winner, plan.isWorldChampionship)
 
         # Wait.
-        time.sleep(1)
+        self.clock.wait(1)
 
         # Return the winner.
         return winner
 
 
 
-    def playWorldChampionshipTournament(self, players, prizeMoney):
-        ''' Play a world championship tournament. '''
-        print(f'{" " * 15}World Championship')
-        self.isWait = True
+    def playSeededTournament(self, players, title, prizeMoney, engine=None):
+        '''
+        Play a tournament with seeded players.
+        The top 16 players are seeded, the others play qualifying rounds for the other 16 places.
+        The engine selects the match engine for this tournament, None for the default.
+        '''
+        return self.playBracket(players, bracket.SEEDED, title, prizeMoney, engine)
 
-        # Sort by pts.
-        players = sorted(players, key=lambda Player: Player.pts, reverse=True)
 
-        # Seed the players.
-        count = 1
-        for player in players:
-            player.round = count
-            if count < 17:
-                count += 1
-            # print('{:>5} {:<22}{:>4}'.format(count, player.nameWithRanking(), player.round), end='\n')
-
-        # Qualifiying.
-        print('World Championship Qualifying 1')
-        self.playRound(players, 17, 17, 18, 0, 32, 10)
-
-        print('World Championship Qualifying 2')
-        self.playRound(players, 18, 18, 19, 0, 16, 10)
-
-        # Round One.
-        print('World Championship Round One')
-        self.playRound(players, 1, 19, 20, -1, 1, 10)
-        self.playRound(players, 16, 19, 20, -1, 1, 10)
-        self.playRound(players, 9, 19, 21, -1, 1, 10)
-        self.playRound(players, 8, 19, 21, -1, 1, 10)
-        self.playRound(players, 5, 19, 22, -1, 1, 10)
-        self.playRound(players, 11, 19, 22, -1, 1, 10)
-        self.playRound(players, 13, 19, 23, -1, 1, 10)
-        self.playRound(players, 4, 19, 23, -1, 1, 10)
-        self.playRound(players, 3, 19, 24, -1, 1, 10)
-        self.playRound(players, 14, 19, 24, -1, 1, 10)
-        self.playRound(players, 12, 19, 25, -1, 1, 10)
-        self.playRound(players, 6, 19, 25, -1, 1, 10)
-        self.playRound(players, 7, 19, 26, -1, 1, 10)
-        self.playRound(players, 10, 19, 26, -1, 1, 10)
-        self.playRound(players, 15, 19, 27, -1, 1, 10)
-        self.playRound(players, 2, 19, 27, -1, 1, 10)
-
-        # Round Two.
-        print('World Championship Round Two')
-        self.playRound(players, 20, 20, 30, -2, 1, 13)
-        self.playRound(players, 21, 21, 30, -2, 1, 13)
-        self.playRound(players, 22, 22, 31, -2, 1, 13)
-        self.playRound(players, 23, 23, 31, -2, 1, 13)
-        self.playRound(players, 24, 24, 32, -2, 1, 13)
-        self.playRound(players, 25, 25, 32, -2, 1, 13)
-        self.playRound(players, 26, 26, 33, -2, 1, 13)
-        self.playRound(players, 27, 27, 33, -2, 1, 13)
-
-        # Quarter Finals.
-        print('World Championship Quarter Finals')
-        self.playRound(players, 30, 30, 40, -3, 1, 13)
-        self.playRound(players, 31, 31, 40, -3, 1, 13)
-        self.playRound(players, 32, 32, 41, -3, 1, 13)
-        self.playRound(players, 33, 33, 41, -3, 1, 13)
-
-        # Semi Finals.
-        print('World Championship Semi Finals')
-        self.playRound(players, 40, 40, 50, -4, 1, 17)
-        self.playRound(players, 41, 41, 50, -4, 1, 17)
-
-        print('World Championship Final')
-        self.playRound(players, 50, 50, -6, -5, 1, 18)
 
-        # Allocate ranking points and find the winner.
-        winner = None
-        for player in players:
-            if player.round == 9:
-                player.round = 0
-            elif player.round == -6:
-                winner = player
-                winner.wins += 1
-                winner.worldChampion += 1
-            elif player.round == -5:
-                player.runnerUp += 1
+    def playWorldChampionshipTournament(self, players, prizeMoney, engine=None):
+        '''
+        Play a world championship tournament.
+        The winner is only the world champion if this game awards the world title, otherwise this is the championship of a lower division.
+        The engine selects the match engine for this tournament, None for the default.
+        '''
+        if self.isWorldTitle:
+            return self.playBracket(players, bracket.WORLD_CHAMPIONSHIP, 'World Championship', prizeMoney, engine)
+        return self.playBracket(players, bracket.DIVISION_CHAMPIONSHIP, 'Division Championship', prizeMoney, engine)
 
-            pts = [0, 2, 4, 8, 16, 32, 64][-player.round]
-            player.history.append(pts)
 
-            while len(player.history) > 12:
-                del player.history[0]
-            player.pts = 0
-            for pts in player.history:
-                player.pts += pts
 
-            # Prize Money.
-            moneyIndex = [0, 13, 28, 42, 56, 75, 100][-player.round]
-            actualMoney = prizeMoney * (moneyIndex / 100)
-            player.prizeMoney += actualMoney
-            player.seasonMoney += actualMoney
+    def playOpenTournament(self, players, title, prizeMoney, engine=None):
+        '''
+        Play a tournament with all the players.
+        The players play qualifying rounds to fill a draw of 32 which is drawn at random in every round.
+        The engine selects the match engine for this tournament, None for the default.
+        '''
+        return self.playBracket(players, bracket.OPEN, title, prizeMoney, engine)
 
-        # Wait.
-        time.sleep(1)
 
-        # Return the winner.
-        return winner
 
+    def getRankingIndex(self, players):
+        ''' Returns the index of the players in ranking points order.  The index is built the first time it is required. '''
+        if self.rankingIndex is None or self.rankingIndex.source is not players:
+            self.rankingIndex = RankingIndex(ranking_index.pointsKey, players, players)
+        return self.rankingIndex
 
 
-    def playOpenTournament(self, players, title, prizeMoney):
-        '''
-        Play a tournament with all the players.
-        Qualifying 1 80 Players 16 matches to get 64 players.
-        Qualifying 2 64 players 32 matches to get 32 players.
-        '''
-        print(f'{" " * 15}{title} (Open)')
-        self.isWait = True
 
-        for player in players:
-            player.round = 1
+    def getNameIndex(self, players):
+        ''' Returns the index of the players by name and by playerId.  The index is built the first time it is required. '''
+        if self.nameIndex is None or self.nameIndex.source is not players:
+            self.nameIndex = NameIndex(players, players)
+        return self.nameIndex
 
-        # Qualifiying.
-        print(f'{title} Qualifying 1')
-        self.playRound(players, 1, 1, 2, 0, 16, 5)
 
-        # Put the winners back into qualifying.
-        for player in players:
-            if player.round == 2:
-                player.round = 1
 
-        print(f'{title} Qualifying 2')
-        self.playRound(players, 1, 1, 2, 0, 32, 5)
+    def getWinsIndex(self, players):
+        ''' Returns the index of the active players in tournament wins order.  The index is built the first time it is required. '''
+        if self.winsIndex is None or self.winsIndex.source is not players:
+            self.winsIndex = RankingIndex(ranking_index.winsKey, players, players)
+        return self.winsIndex
+
+
 
-        # Round One.
-        print(f'{title} Round One')
-        self.playRound(players, 2, 2, 3, -1, 16, 6)
+    def topWins(self, players, retiredPlayers, numPlayers):
+        '''
+        Returns the top players in tournament wins order from the active and the retired players.
+        The top of the active players is merged with the top of the :py:class:`~hall_of_fame.HallOfFame`, nothing is sorted.
+        '''
+        active = self.getWinsIndex(players).top(numPlayers)
+        retired = retiredPlayers.topK(numPlayers)
+        return list(heapq.merge(active, retired, key=ranking_index.winsKey))[:numPlayers]
 
-        # Round Two.
-        print(f'{title} Round Two')
-        self.playRound(players, 3, 3, 4, -2, 8, 6)
 
-        # Quarter Finals.
-        print(f'{title} Quarter Finals')
-        self.playRound(players, 4, 4, 5, -3, 4, 6)
 
-        # Semi Finals.
-        print(f'{title} Semi Finals')
-        self.playRound(players, 5, 5, 6, -4, 2, 9)
+    def updateIndexes(self, player):
+        ''' Reposition the player in the ranking indexes after their pts or wins have changed. '''
+        if self.rankingIndex is not None:
+            self.rankingIndex.update(player)
+        if self.winsIndex is not None:
+            self.winsIndex.update(player)
 
-        print(f'{title} Final')
-        self.playRound(players, 6, 6, -6, -5, 1, 10)
 
-        # Allocate ranking points and find the winner.
+
+    def settleTournament(self, players, pointsTable, moneyTable, prizeMoney, isWorldChampionship):
+        '''
+        Allocate the ranking points and prize money at the end of a tournament.
+        Returns the winner of the tournament.
+
+        :param list players: The players in the tournament.  The round of each player is minus the stage they reached.
+        :param list pointsTable: The ranking points for each stage.  The last stage is the winner.
+        :param list moneyTable: The percentage of the prize money for each stage.
+        :param float prizeMoney: The prize money for the winner.
+        :param bool isWorldChampionship: True if the winner is the world champion.
+        '''
+        if isinstance(players, PlayerTable):
+            winner = self.settleTournamentTable(players, pointsTable, moneyTable, prizeMoney, isWorldChampionship)
+            self.lastWinner = winner
+            return winner
+
+        winnerRound = 1 - len(pointsTable)
+        ranking = self.getRankingIndex(players)
         winner = None
         for player in players:
-            if player.round == -6:
+            if player.round == winnerRound:
                 winner = player
                 winner.wins += 1
-            elif player.round == -5:
+                if isWorldChampionship:
+                    winner.worldChampion += 1
+            elif player.round == winnerRound + 1:
                 player.runnerUp += 1
-            pts = [0, 1, 2, 4, 8, 16, 32][-player.round]
-            player.history.append(pts)
-            while len(player.history) > 12:
-                del player.history[0]
-            player.pts = 0
-            for pts in player.history:
-                player.pts += pts
+
+            player.addPoints(pointsTable[-player.round])
 
             # Prize Money.
-            moneyIndex = [0, 13, 28, 42, 56, 75, 100][-player.round]
+            moneyIndex = moneyTable[-player.round]
             actualMoney = prizeMoney * (moneyIndex / 100)
             player.prizeMoney += actualMoney
             player.seasonMoney += actualMoney
 
-        # Wait.
-        time.sleep(1)
+        # Reposition all the players in the ranking order at once.
+        ranking.updateMany(players)
+        if self.winsIndex is not None:
+            self.winsIndex.updateMany(player for player in players if player.round <= winnerRound + 1)
 
-        # Return the winner.
+        self.lastWinner = winner
         return winner
 
 
 
-    def showRanking(self, players, isUpdate, numShow):  # pylint: disable=no-self-use
+    def settleTournamentTable(self, table, pointsTable, moneyTable, prizeMoney, isWorldChampionship):
+        ''' Vectorized version of :py:meth:`settleTournament` for a :py:class:`~player_table.PlayerTable`. '''
+        ranking = self.getRankingIndex(table)
+        stage = -table.round
+        winnerStage = len(pointsTable) - 1
+        winnerIndex = int(numpy.argmax(stage == winnerStage))
+        table.wins[winnerIndex] += 1
+        if isWorldChampionship:
+            table.worldChampion[winnerIndex] += 1
+        table.runnerUp[stage == winnerStage - 1] += 1
+        if self.winsIndex is not None:
+            self.winsIndex.updateMany(table[index] for index in numpy.flatnonzero(stage >= winnerStage - 1))
+
+        oldPts = table.pts
+        table.addHistory(numpy.asarray(pointsTable)[stage])
+        ranking.updateMany(table[index] for index in numpy.flatnonzero(table.pts != oldPts))
+
+        # Prize Money.
+        actualMoney = prizeMoney * (numpy.asarray(moneyTable)[stage] / 100)
+        table.prizeMoney += actualMoney
+        table.seasonMoney += actualMoney
+
+        return table[winnerIndex]
+
+
+
+    def showRanking(self, players, isUpdate, numShow):
         ''' Display the players in ranking points order. '''
-        # Sort by pts.
-        players = sorted(players, key=lambda Player: Player.pts, reverse=True)
-        # players = sorted(players, key=attrgetter('pts'), reverse=True)
+        if self.profiler is not None:
+            startTime = self.profiler.clock()
+
+        # The players in pts order.
+        players = self.getRankingIndex(players)
 
-        print(f'Top {numShow}')
+        self.output(f'Top {numShow}')
         count = 1
         for player in players:
-            if count <= numShow:
-                if count == 1:
-                    player.topRanking += 1
-                if self.highlight == player.name:
+            if count == 1:
+                player.topRanking += 1
+            if count <= numShow and not self.isHeadless:
+                if player.playerId == self.highlightId:
                     colour = ansi.MAGENTA
                 elif player.age >= 40:
                     colour = ansi.BOLD_CYAN
@@ -402,31 +470,52 @@ class Game:
                     colour = ansi.YELLOW
                 else:
                     colour = ''
-                if player.round == -6:
+                if player is self.lastWinner:
                     # Winner of last tournament.
                     colour = ansi.RED
-                print(f'{count:>5} {colour}{player.nameWithRanking():<22}{player.pts:>4}', end='')
-                print(f'{player.seasonMoney:>13,.2f}', end='')
+                self.output(f'{count:>5} {colour}{player.nameWithRanking():<22}{player.pts:>4}', end='')
+                self.output(f'{player.seasonMoney:>13,.2f}', end='')
                 for pts in player.history:
-                    print(f'{pts:>3}', end='')
+                    self.output(f'{pts:>3}', end='')
 
-                print(f'      ({player.age})', end='')
-                print(f'      ({player.skill:>4})', end='')
+                self.output(f'      ({player.age})', end='')
+                self.output(f'      ({player.skill:>4})', end='')
+                self.output(f'{player.rating:>7.0f}', end='')
 
-                print(f'{ansi.RESET_ALL}')
+                self.output(f'{ansi.RESET_ALL}')
             if isUpdate:
                 player.ranking = count
+                if self.journal is not None:
+                    self.journal.write(journal.RANKING, player.playerId, 0, count, player.pts)
             count += 1
 
+        if self.profiler is not None:
+            self.profiler.add(profiler.RANKING, self.profiler.clock() - startTime)
+
         # Wait.
-        time.sleep(1)
+        self.clock.wait(1)
+
 
 
-    # pylint: disable=no-self-use
     def updateSkill(self, players):
         ''' Update the skill of the players. '''
+        if self.profiler is not None:
+            startTime = self.profiler.clock()
+        if isinstance(players, PlayerTable):
+            self.updateSkillTable(players)
+        else:
+            self.updateSkillList(players)
+        if self.profiler is not None:
+            self.profiler.add(profiler.SKILL, self.profiler.clock() - startTime)
+
+
+
+    def updateSkillList(self, players):
+        ''' Update the skill of a list of players. '''
         avgSkill = 0.0
         for player in players:
+            oldSkill = player.skill
+
             # Add age related skill.
             if player.age <= 20:
                 player.skill += 10
@@ -440,32 +529,36 @@ class Game:
                 player.skill -= 2
 
             # Add bias.
-            if self.highlight == player.name:
+            if player.playerId == self.highlightId:
                 player.skill += 3
 
             # Add random skill.
-            player.skill += random.randint(-20, 20)
+            player.skill += self.random.randint(-20, 20)
 
             # Reset the short term shifts.
             if player.skillOffset != 0:
                 if player.skillOffset > 0:
                     player.skill += 100
                     player.skillOffset -= 100
-                    print(f'{player.nameWithRanking()} is injuried ({player.skill}, {player.skillOffset})')
+                    self.output(f'{player.nameWithRanking()} is injuried ({player.skill}, {player.skillOffset})')
                 else:
                     player.skill -= 100
                     player.skillOffset += 100
-                    print(f'{player.nameWithRanking()} is boosted ({player.skill}, {player.skillOffset})')
+                    self.output(f'{player.nameWithRanking()} is boosted ({player.skill}, {player.skillOffset})')
 
             # Add some random short term shifts.
-            if random.randint(0, 1000) == 0:
-                print(f'{player.nameWithRanking()} has a boost.')
+            if self.random.randint(0, 1000) == 0:
+                self.output(f'{player.nameWithRanking()} has a boost.')
                 player.skill += 600
                 player.skillOffset -= 600
-            if random.randint(0, 100) == 0:
-                print(f'{player.nameWithRanking()} has an injury.')
+                if self.journal is not None:
+                    self.journal.write(journal.BOOST, player.playerId, 0, player.skill, player.skillOffset)
+            if self.random.randint(0, 100) == 0:
+                self.output(f'{player.nameWithRanking()} has an injury.')
                 player.skill -= 500
                 player.skillOffset += 500
+                if self.journal is not None:
+                    self.journal.write(journal.INJURY, player.playerId, 0, player.skill, player.skillOffset)
 
             # Soft skill upper limit.
             if player.skill > 999:
@@ -473,75 +566,203 @@ class Game:
 
             # Hard skill lower limit.
             player.skill = max(100, player.skill)
+            if self.journal is not None:
+                self.journal.write(journal.SKILL, player.playerId, 0, player.skill, player.skill - oldSkill)
 
             avgSkill += player.skill / len(players)
 
-        print(f'Average Skill = {avgSkill:.1f} <= {self.avgSkill:.1f}')
+        self.output(f'Average Skill = {avgSkill:.1f} <= {self.avgSkill:.1f}')
         self.avgSkill = avgSkill
 
 
 
-    def addAge(self, players, retiredPlayers):  # pylint: disable=no-self-use
-        ''' Update the age of the players. '''
-        for player in players:
-            player.age += 1
-            if player.ranking > 70 and player.age > 35:
-                print(f'{player.name} has retired, aged {player.age}. ', end='')
-                retiredPlayer = player.retire()
-                retiredPlayers.append(retiredPlayer)
-
-                player.reset()
-                player.skill = random.randint(50, 450) + random.randint(50, 450)
-                cultureIndex = 0
-                if random.randint(0, 6) == 4:
-                    cultureIndex = 1
-                player.randomName(cultureIndex)
-                print(f'{player.name} has joined the tour.')
+    def updateSkillTable(self, table):
+        ''' Vectorized version of :py:meth:`updateSkill` for a :py:class:`~player_table.PlayerTable`. '''
+        # Seed the NumPy random stream from the stream of the season.
+        generator = numpy.random.default_rng(self.random.getrandbits(64))
+        numPlayers = len(table)
+        oldSkill = table.skill.copy()
+
+        # Add age related skill.
+        age = table.age
+        table.skill += numpy.select([age <= 20, age <= 24, age >= 40, age >= 35, age >= 30], [10, 5, -20, -10, -2], 0)
+
+        # Add bias.
+        table.skill[table.playerId == self.highlightId] += 3
+
+        # Add random skill.
+        table.skill += generator.integers(-20, 21, numPlayers)
+
+        # Reset the short term shifts.
+        isInjured = table.skillOffset > 0
+        isBoosted = table.skillOffset < 0
+        table.skill += numpy.where(isInjured, 100, 0) - numpy.where(isBoosted, 100, 0)
+        table.skillOffset -= numpy.where(isInjured, 100, 0) - numpy.where(isBoosted, 100, 0)
+        if not self.isHeadless:
+            for index in numpy.flatnonzero(isInjured | isBoosted):
+                player = table[index]
+                self.output(f'{player.nameWithRanking()} is {"injuried" if isInjured[index] else "boosted"} ({player.skill}, {player.skillOffset})')
+
+        # Add some random short term shifts.
+        isNewBoost = generator.integers(0, 1001, numPlayers) == 0
+        isNewInjury = generator.integers(0, 101, numPlayers) == 0
+        if not self.isHeadless:
+            for index in numpy.flatnonzero(isNewBoost | isNewInjury):
+                if isNewBoost[index]:
+                    self.output(f'{table[index].nameWithRanking()} has a boost.')
+                if isNewInjury[index]:
+                    self.output(f'{table[index].nameWithRanking()} has an injury.')
+        table.skill += numpy.where(isNewBoost, 600, 0) - numpy.where(isNewInjury, 500, 0)
+        table.skillOffset += numpy.where(isNewInjury, 500, 0) - numpy.where(isNewBoost, 600, 0)
+
+        # Soft skill upper limit.
+        table.skill -= table.skill > 999
+
+        # Hard skill lower limit.
+        numpy.maximum(table.skill, 100, out=table.skill)
+
+        if self.journal is not None:
+            for recordType, isEvent in ((journal.BOOST, isNewBoost), (journal.INJURY, isNewInjury)):
+                self.journal.writeColumns(recordType, table.playerId[isEvent].tolist(), table.skill[isEvent].tolist(), table.skillOffset[isEvent].tolist())
+            self.journal.writeColumns(journal.SKILL, table.playerId.tolist(), table.skill.tolist(), (table.skill - oldSkill).tolist())
+
+        avgSkill = float(table.skill.mean()) if numPlayers > 0 else 0.0
+        self.output(f'Average Skill = {avgSkill:.1f} <= {self.avgSkill:.1f}')
+        self.avgSkill = avgSkill
+
+
+
+    def retirePlayer(self, player, retiredPlayers):
+        ''' Retire the player and replace them on the tour with a new player. '''
+        self.output(f'{player.name} has retired, aged {player.age}. ', end='')
+        retiredPlayer = player.retire()
+        oldPlayerId = player.playerId
+        retiredPlayers.append(retiredPlayer)
+        if self.database is not None:
+            self.database.retirePlayer(retiredPlayer)
+        if self.nameIndex is not None:
+            self.nameIndex.remove(player)
+
+        player.reset()
+        self.updateIndexes(player)
+        player.skill = self.random.randint(50, 450) + self.random.randint(50, 450)
+        cultureIndex = 0
+        if self.random.randint(0, 6) == 4:
+            cultureIndex = 1
+        isBoost = player.randomName(cultureIndex, self.random)
+        if self.nameIndex is not None:
+            # Give the new player a unique name.
+            self.nameIndex.addNew(player)
+        if isBoost:
+            self.output(f'Boost for {player.name}. ', end='')
+        self.output(f'{player.name} has joined the tour.')
+        if self.careerStats is not None:
+            self.careerStats.addRetirement(self.seasonIndex, retiredPlayer, player)
+        if self.journal is not None:
+            self.journal.write(journal.RETIREMENT, oldPlayerId, player.playerId, retiredPlayer.age, retiredPlayer.wins)
+            self.journal.write(journal.JOIN, player.playerId, 0, player.skill, player.age)
+
+
+
+    def addAge(self, players, retiredPlayers):
+        ''' Update the age of the players.  Players over 35 outside the top 7/8 of the tour (70 of 80) retire. '''
+        if self.profiler is not None:
+            startTime = self.profiler.clock()
+        retireRanking = len(players) * 7 // 8
+        if isinstance(players, PlayerTable):
+            # Vectorized version for a player table.
+            players.age += 1
+            for index in numpy.flatnonzero((players.ranking > retireRanking) & (players.age > 35)):
+                self.retirePlayer(players[index], retiredPlayers)
+        else:
+            for player in players:
+                player.age += 1
+                if player.ranking > retireRanking and player.age > 35:
+                    self.retirePlayer(player, retiredPlayers)
+        if self.profiler is not None:
+            self.profiler.add(profiler.AGE, self.profiler.clock() - startTime)
 
         # Wait.
-        time.sleep(1)
+        self.clock.wait(1)
 
         # Return the new list of retired players
         return retiredPlayers
 
 
 
-    def showWins(self, players, retiredPlayers):    # pylint: disable=no-self-use
-        ''' Display the players in ranking points order. '''
-        # Sort by pts.
-        players = sorted(players + retiredPlayers, key=lambda Player: (Player.wins, Player.runnerUp), reverse=True)
+    def showWins(self, players, retiredPlayers):
+        ''' Display the players in tournament wins order. '''
+        if self.isHeadless:
+            return
 
-        print('Wins ')
+        if self.profiler is not None:
+            startTime = self.profiler.clock()
+
+        # The top players in wins order.
+        players = self.topWins(players, retiredPlayers, self.numShowWins)
+
+        self.output('Wins ')
         count = 1
         for player in players:
-            if player.wins > 0 or player.runnerUp > 0:
-                if player.ranking > 500:
-                    print(f'{count:>5} {ansi.CYAN}{player.nameWithYearRange():<28}{player.wins:>4}{player.wins + player.runnerUp:>4}{player.worldChampion:>8}{player.topRanking / 6:>8.1f}{player.prizeMoney:>14,.2f}{ansi.RESET_ALL}', end='')
+            if player.wins == 0 and player.runnerUp == 0:
+                # The rest of the players have no wins.
+                break
+            if player.ranking > 500:
+                self.output(f'{count:>5} {ansi.CYAN}{player.nameWithYearRange():<28}{player.wins:>4}{player.wins + player.runnerUp:>4}{player.worldChampion:>8}{player.topRanking / 6:>8.1f}{player.prizeMoney:>14,.2f}{ansi.RESET_ALL}', end='')
 
+            else:
+                if player is self.lastWinner:
+                    # Winner of last tournament.
+                    self.output(f'{count:>5} {ansi.RED}{player.nameWithRanking():<28}{player.wins:>4}{player.wins + player.runnerUp:>4}{player.worldChampion:>8}{player.topRanking / 6:>8.1f}{player.prizeMoney:>14,.2f}{ansi.RESET_ALL}', end='')
                 else:
-                    if player.round == -6:
-                        # Winner of last tournament.
-                        print(f'{count:>5} {ansi.RED}{player.nameWithRanking():<28}{player.wins:>4}{player.wins + player.runnerUp:>4}{player.worldChampion:>8}{player.topRanking / 6:>8.1f}{player.prizeMoney:>14,.2f}{ansi.RESET_ALL}', end='')
-                    else:
-                        print(f'{count:>5} {player.nameWithRanking():<28}{player.wins:>4}{player.wins + player.runnerUp:>4}{player.worldChampion:>8}{player.topRanking / 6:>8.1f}{player.prizeMoney:>14,.2f}', end='')
+                    self.output(f'{count:>5} {player.nameWithRanking():<28}{player.wins:>4}{player.wins + player.runnerUp:>4}{player.worldChampion:>8}{player.topRanking / 6:>8.1f}{player.prizeMoney:>14,.2f}', end='')
 
-                print()
+            self.output()
             count += 1
 
-        # Wait.
-        time.sleep(1)
-
-
+        if self.profiler is not None:
+            self.profiler.add(profiler.RENDERING, self.profiler.clock() - startTime)
 
-    def showChampions(self, seasons, seasonYear, seasonDescription, indent):    #pylint: disable=no-self-use
-        ''' Display the previous champions. '''
-        print(f'{ansi.MAGENTA}', end='')
-        print('     World                 China                 German                UK                    Welsh                 Shanghai')
-        print(f'     Champion              Open                  Masters               Championship          Open                  Masters{ansi.RESET_ALL}')
-        for history in seasons:
-            print(history)
-        if seasonDescription != '':
-            print(f'{seasonYear} {" " * (22 * indent)}{seasonDescription}')
+        # Wait.
+        self.clock.wait(1)
+
+
+
+    def showChampions(self, seasons, seasonYear):
+        ''' Display a page of the previous champions and the winners so far in the current season. '''
+        if self.isHeadless:
+            return
+        if self.profiler is not None:
+            startTime = self.profiler.clock()
+        numPages = seasons.numPages(self.numShowSeasons)
+        self.championsPage = min(self.championsPage, numPages - 1)
+        self.output(f'{ansi.MAGENTA}', end='')
+        self.output(champions.HEADINGS[0])
+        self.output(f'{champions.HEADINGS[1]}{ansi.RESET_ALL}')
+        for history in seasons.window(self.numShowSeasons, self.championsPage):
+            self.output(history)
+        if self.championsPage == 0:
+            self.output(seasons.currentLine(seasonYear))
+        else:
+            self.output(f'{ansi.MAGENTA}Page {self.championsPage + 1} of {numPages}.  Press n for newer seasons.{ansi.RESET_ALL}')
+        if self.profiler is not None:
+            self.profiler.add(profiler.RENDERING, self.profiler.clock() - startTime)
+
+
+
+    def showOdds(self, players, tournament):
+        ''' Display the odds of the favourites for the tournament, if the odds are enabled. '''
+        if self.oddsEngine is None or self.isHeadless:
+            return
+        if self.profiler is not None:
+            startTime = self.profiler.clock()
+        odds = self.oddsEngine.odds(players, tournament, self.numOddsReplicates, self.streams.derive(rng.ODDS, self.seasonIndex, self.tournamentIndex + 1))
+        self.output(f'Odds ({odds.numReplicates} simulations)    Final  Winner')
+        for playerIndex in odds.favourites(8):
+            probabilities = odds.reachProbabilities(playerIndex)
+            self.output(f'{players[playerIndex].nameWithRanking():<22}{probabilities[-2]:>8.1%}{probabilities[-1]:>8.1%}')
+        if self.profiler is not None:
+            self.profiler.add(profiler.ODDS, self.profiler.clock() - startTime)
 
 
 
@@ -550,9 +771,16 @@ class Game:
         # reset for the season.
         for player in players:
             player.seasonMoney = 0
+        self.random = self.streams.season(seasonIndex)
+        self.tournamentIndex = 0
+        self.getNameIndex(players)
+        if self.journal is not None:
+            self.journal.season = seasonIndex
+            self.journal.tournament = 0
 
         # Play the season.
         if not self.isExitGame:
+            self.showOdds(players, tournament_odds.OPEN)
             winner = self.playOpenTournament(players, 'Shanghai Masters', 0.3 * prizeMoney)
             self.showWins(players, retiredPlayers)
             if self.isFullRanking:
@@ -560,13 +788,14 @@ class Game:
                 self.isFullRanking = False
             else:
                 self.showRanking(players, True, 17)
-            seasonDescription = f'{winner.name:<22}'
-            self.showChampions(seasons, seasonIndex, seasonDescription, 5)
+            seasons.addWinner(seasonIndex, champions.SHANGHAI_MASTERS, winner)
+            self.showChampions(seasons, seasonIndex)
             winner.firstWin = winner.firstWin if winner.firstWin is not None else seasonIndex
             winner.lastWin = seasonIndex
             self.updateSkill(players)
 
         if not self.isExitGame:
+            self.showOdds(players, tournament_odds.OPEN)
             winner = self.playOpenTournament(players, 'Welsh Open', 0.3 * prizeMoney)
             self.showWins(players, retiredPlayers)
             if self.isFullRanking:
@@ -574,13 +803,14 @@ class Game:
                 self.isFullRanking = False
             else:
                 self.showRanking(players, True, 17)
-            seasonDescription = f'{winner.name:<22}{seasonDescription}'
-            self.showChampions(seasons, seasonIndex, seasonDescription, 4)
+            seasons.addWinner(seasonIndex, champions.WELSH_OPEN, winner)
+            self.showChampions(seasons, seasonIndex)
             winner.firstWin = winner.firstWin if winner.firstWin is not None else seasonIndex
             winner.lastWin = seasonIndex
             self.updateSkill(players)
 
         if not self.isExitGame:
+            self.showOdds(players, tournament_odds.SEEDED)
             winner = self.playSeededTournament(players, 'UK Championship', 0.6 * prizeMoney)
             self.showWins(players, retiredPlayers)
             if self.isFullRanking:
@@ -588,13 +818,14 @@ class Game:
                 self.isFullRanking = False
             else:
                 self.showRanking(players, True, 17)
-            seasonDescription = f'{winner.name:<22}{seasonDescription}'
-            self.showChampions(seasons, seasonIndex, seasonDescription, 3)
+            seasons.addWinner(seasonIndex, champions.UK_CHAMPIONSHIP, winner)
+            self.showChampions(seasons, seasonIndex)
             winner.firstWin = winner.firstWin if winner.firstWin is not None else seasonIndex
             winner.lastWin = seasonIndex
             self.updateSkill(players)
 
         if not self.isExitGame:
+            self.showOdds(players, tournament_odds.OPEN)
             winner = self.playOpenTournament(players, 'German Masters', 0.3 * prizeMoney)
             self.showWins(players, retiredPlayers)
             if self.isFullRanking:
@@ -602,13 +833,14 @@ class Game:
                 self.isFullRanking = False
             else:
                 self.showRanking(players, True, 17)
-            seasonDescription = f'{winner.name:<22}{seasonDescription}'
-            self.showChampions(seasons, seasonIndex, seasonDescription, 2)
+            seasons.addWinner(seasonIndex, champions.GERMAN_MASTERS, winner)
+            self.showChampions(seasons, seasonIndex)
             winner.firstWin = winner.firstWin if winner.firstWin is not None else seasonIndex
             winner.lastWin = seasonIndex
             self.updateSkill(players)
 
         if not self.isExitGame:
+            self.showOdds(players, tournament_odds.SEEDED)
             winner = self.playSeededTournament(players, 'China Open', 0.6 * prizeMoney)
             self.showWins(players, retiredPlayers)
             if self.isFullRanking:
@@ -616,19 +848,20 @@ class Game:
                 self.isFullRanking = False
             else:
                 self.showRanking(players, True, 17)
-            seasonDescription = f'{winner.name:<22}{seasonDescription}'
-            self.showChampions(seasons, seasonIndex, seasonDescription, 1)
+            seasons.addWinner(seasonIndex, champions.CHINA_OPEN, winner)
+            self.showChampions(seasons, seasonIndex)
             winner.firstWin = winner.firstWin if winner.firstWin is not None else seasonIndex
             winner.lastWin = seasonIndex
             self.updateSkill(players)
 
         if not self.isExitGame:
+            self.showOdds(players, tournament_odds.WORLD)
             winner = self.playWorldChampionshipTournament(players, prizeMoney)
             self.showWins(players, retiredPlayers)
             self.showRanking(players, True, 80)
-            time.sleep(10)
-            seasonDescription = f'{winner.name:<22}{seasonDescription}'
-            self.showChampions(seasons, seasonIndex, seasonDescription, 0)
+            self.clock.wait(10)
+            seasons.addWinner(seasonIndex, champions.WORLD_CHAMPIONSHIP, winner)
+            self.showChampions(seasons, seasonIndex)
             winner.firstWin = winner.firstWin if winner.firstWin is not None else seasonIndex
             winner.lastWin = seasonIndex
             self.updateSkill(players)
@@ -639,118 +872,265 @@ class Game:
 
         # Wait.
         if not self.isExitGame:
-            time.sleep(10)
+            self.clock.wait(10)
 
-        # Returns the tournament winners this season.
-        return seasonDescription, retiredPlayers
+        # Returns the retired players.
+        return retiredPlayers
 
 
 
     def selectHighlight(self, player1, player2):
         ''' Select the highlighted player. '''
-        print()
-        print('Select Highlight')
-        print(f'1) {player1.name}')
-        print(f'2) {player2.name}')
-        print('3) Remove highlight')
-        print(f'4) Keep {self.highlight}')
-        keyScan = self.keyboard.scanKey()
-        # while keyScan != '1' and keyScan != '2' and keyScan != '3' and keyScan != '4':
+        self.output()
+        self.output('Select Highlight')
+        self.output(f'1) {player1.name}')
+        self.output(f'2) {player2.name}')
+        self.output('3) Remove highlight')
+        highlighted = None if self.nameIndex is None else self.nameIndex.findId(self.highlightId)
+        self.output(f'4) Keep {"" if highlighted is None else highlighted.name}')
+        if self.renderer is not None:
+            self.renderer.flush()
+        # Block until a key is pressed rather than spin on scanKey().
+        keyScan = self.keyboard.waitKey()
         while keyScan not in ('1', '2', '3', '4'):
-            keyScan = self.keyboard.scanKey()
+            keyScan = self.keyboard.waitKey()
 
         if keyScan == '1':
-            self.highlight = player1.name
+            self.highlightId = player1.playerId
         if keyScan == '2':
-            self.highlight = player2.name
+            self.highlightId = player2.playerId
         if keyScan == '3':
-            self.highlight = ''
+            self.highlightId = 0
 
 
 
     def processKeys(self, player1, player2):
         ''' Scan the keyboard for a key and deal with any key presses. '''
-        keyScan = self.keyboard.scanKey()
+        if self.keyboard is None:
+            return
+        self.processKey(self.keyboard.scanKey(), player1, player2)
+
+
+
+    def processKey(self, keyScan, player1, player2):
+        ''' Deal with a key press.  The players are the players in the current match, or None between matches. '''
         if keyScan == 'q':
             self.isExitGame = True
-            self.isWait = False
+            self.clock.skip()
+            if self.clock.isPaused:
+                self.clock.pause()
         if keyScan == ' ':
-            self.isWait = False
+            self.clock.skip()
         if keyScan == 'r':
             self.isFullRanking = True
-        if keyScan == 'h':
+        if keyScan == 'h' and player1 is not None:
             self.selectHighlight(player1, player2)
+        if keyScan == 's':
+            self.output(f'Speed is {clock.speedName(self.clock.nextSpeed())}.')
+        if keyScan == 'w':
+            self.clock.pause()
+            self.output('Paused.  Press w to resume or . to step.' if self.clock.isPaused else 'Resumed.')
+        if keyScan == '.':
+            self.clock.step()
+        if keyScan == 'p':
+            self.championsPage += 1
+        if keyScan == 'n':
+            self.championsPage = max(0, self.championsPage - 1)
 
 
 
-    def showKeys(self): # pylint: disable=no-self-use
+    def showKeys(self):
         ''' Display the keys that are used in the program. '''
-        print('Keys')
-        print('   q    Quit the program.')
-        print('[space] Complete the tournament.')
-        print('   r    Show full ranking table at the end of tournament.')
-        print('   h    Select player to highlight.')
+        self.output('Keys')
+        self.output('   q    Quit the program.')
+        self.output('[space] Complete the tournament.')
+        self.output('   r    Show full ranking table at the end of tournament.')
+        self.output('   h    Select player to highlight.')
+        self.output('   p    Show older champions.')
+        self.output('   n    Show newer champions.')
+        self.output('   s    Change the speed: real time, 10 times real time or no waits.')
+        self.output('   w    Pause or resume the game.')
+        self.output('   .    Step to the next point when paused.')
 
 
 
-    def run(self):
-        ''' Execute the sport of life game. '''
-        # Create a keyboard scan.
-        self.keyboard = InKey()
-        self.isExitGame = False
+    def idleWhilePaused(self):
+        ''' Wait for a key while the game is paused.  This is the idle function of the clock. '''
+        if self.renderer is not None:
+            self.renderer.flush()
+        keyScan = self.keyboard.waitKey(0.1)
+        if keyScan is not None:
+            self.processKey(keyScan, None, None)
+
 
-        # Create 80 players.
-        print('80 players join the tour. ', end='')
+
+    def createPlayers(self, numPlayers):
+        ''' Returns a new tour of the specified number of players. '''
+        self.output(f'{numPlayers} players join the tour. ', end='')
+        playersRandom = self.streams.stream(rng.PLAYERS)
         players = []
         self.avgSkill = 0
-        for loop in range(80):
-            player = Player(None)
-            player.skill = random.randint(100, 999)
-            player.age = random.randint(20, 36)
+        for loop in range(numPlayers):
+            player = Player(self.database)
+            player.skill = playersRandom.randint(100, 999)
+            player.age = playersRandom.randint(20, 36)
             if loop < 100:
-                player.randomName(0)
+                isBoost = player.randomName(0, playersRandom)
             else:
-                player.randomName(1)
+                isBoost = player.randomName(1, playersRandom)
+            if isBoost:
+                self.output(f'Boost for {player.name}. ', end='')
             players.append(player)
-            self.avgSkill += player.skill / 80.0
-        print()
+            self.avgSkill += player.skill / numPlayers
+        self.output()
+        if self.isPlayerTable:
+            players = PlayerTable.fromPlayers(players)
+        # New players that share a name are given a numeral.
+        self.nameIndex = NameIndex((), players)
+        for player in players:
+            self.nameIndex.addNew(player)
 
 
-        playerIndex = random.randint(0, len(players)-1)
+        playerIndex = playersRandom.randint(0, len(players)-1)
         player = players[playerIndex]
-        print(f'{player.name} has an injury.')
+        self.output(f'{player.name} has an injury.')
         player.skill -= 600
         player.skillOffset += 600
         player.skill = max(100, player.skill)
-        print(f'{player.name} {player.skill} {player.skillOffset}')
-
-        retiredPlayers = []
-        seasons = []
-        loop = 1968
-        prizeMoney = 200000.0
-        while not self.isExitGame:
-            self.showKeys()
-            seasonDescription, retiredPlayers = self.playSeason(players, seasons, retiredPlayers, loop, prizeMoney)
-
-            # Find the season end number 1 player.
-            numberOnePlayer = None
-            topMoneyPlayer = players[0]
+        self.output(f'{player.name} {player.skill} {player.skillOffset}')
+
+        if self.journal is not None:
             for player in players:
-                if player.ranking == 1:
-                    numberOnePlayer = player
-                if player.seasonMoney > topMoneyPlayer.seasonMoney:
-                    topMoneyPlayer = player
+                self.journal.write(journal.JOIN, player.playerId, 0, player.skill, player.age)
+            self.journal.write(journal.INJURY, players[playerIndex].playerId, 0, players[playerIndex].skill, players[playerIndex].skillOffset)
 
-            seasons.append(f'{loop} {seasonDescription} {numberOnePlayer.pts:>4} {numberOnePlayer.name:<22} {topMoneyPlayer.seasonMoney:>12,.2f} {topMoneyPlayer.name}')
+        return players
 
-            prizeMoney *= 1.03
-            loop += 1
 
-            # Wait.
-            time.sleep(1)
 
-        # Stop checking the keyboard.
-        self.keyboard.close()
+    def recordSeason(self, players, seasons, seasonIndex):
+        ''' Add the season end summary to the history of the champions and the database. '''
+        # Find the season end number 1 player.
+        numberOnePlayer = None
+        topMoneyPlayer = players[0]
+        for player in players:
+            if player.ranking == 1:
+                numberOnePlayer = player
+            if player.seasonMoney > topMoneyPlayer.seasonMoney:
+                topMoneyPlayer = player
+
+        seasons.addSeason(seasonIndex, numberOnePlayer, topMoneyPlayer)
+        if self.database is not None:
+            self.database.endSeason(seasonIndex, players, numberOnePlayer, topMoneyPlayer)
+
+
+
+    def run(self, numSeasons=None):
+        '''
+        Execute the sport of life game.
+        Play until the user quits or, if specified, for numSeasons seasons.
+        '''
+        # Create a keyboard scan and a renderer.
+        if not self.isHeadless:
+            self.keyboard = InKey()
+            self.clock.idle = self.idleWhilePaused
+            if self.framesPerSecond > 0:
+                self.renderer = Renderer(self.framesPerSecond)
+                self.renderer.formatLive = self.formatScore
+                self.renderer.profiler = self.profiler
+                self.output = self.renderer.write
+                self.renderer.start()
+        self.isExitGame = False
+        self.clock.profiler = self.profiler
+
+        # Create the players, unless the game was resumed from a snapshot.
+        if self.players is None:
+            self.players = self.createPlayers(self.numPlayers)
+            self.retiredPlayers = HallOfFame()
+            self.seasons = Champions()
+
+        try:
+            numPlayed = 0
+            while not self.isExitGame:
+                self.showKeys()
+                self.retiredPlayers = self.playSeason(self.players, self.seasons, self.retiredPlayers, self.seasonIndex, self.prizeMoney)
+                isSeasonComplete = not self.isExitGame
+                self.recordSeason(self.players, self.seasons, self.seasonIndex)
+                if self.careerStats is not None:
+                    self.careerStats.addSeason(self.players)
+                if self.profiler is not None:
+                    self.profiler.endSeason(self.seasonIndex)
+
+                self.prizeMoney *= 1.03
+                self.seasonIndex += 1
+                numPlayed += 1
+                if numSeasons is not None and numPlayed >= numSeasons:
+                    self.isExitGame = True
+
+                # Save the state at the end of each complete season.
+                if self.snapshotFile is not None and isSeasonComplete:
+                    snapshot.save(self.snapshotFile, self)
+
+                # Wait.
+                self.clock.wait(1)
+        finally:
+            # Stop checking the keyboard.
+            if self.keyboard is not None:
+                self.keyboard.close()
+                self.keyboard = None
+                self.clock.idle = None
+
+            # Stop the renderer.
+            if self.renderer is not None:
+                self.renderer.close()
+                self.renderer = None
+                self.output = print
+
+            # Stop the odds processes.
+            if self.oddsEngine is not None:
+                self.oddsEngine.close()
+
+            # Write the rest of the journal and the match export and close the database.
+            if self.journal is not None:
+                self.journal.close()
+            if self.matchExport is not None:
+                self.matchExport.close()
+            if self.database is not None:
+                self.database.close()
+
+            # Remove the spill file of the retired players.  Their number and the top players are still available.
+            if self.retiredPlayers is not None:
+                self.retiredPlayers.close()
+
+        return self.players, self.retiredPlayers, self.seasons
+
+
+
+    def showStats(self, seasonIndex, seasonTimes, seasonCounts):
+        ''' Display the time in each phase of a season.  This is a listener for the :py:class:`~profiler.PhaseProfiler`. '''
+        output = print if self.isHeadless else self.output
+        output(f'Season {seasonIndex} phases')
+        for line in self.profiler.report(seasonTimes, seasonCounts):
+            output(line)
+
+
+
+    def runHeadless(self, numSeasons):
+        ''' Execute the sport of life game for the specified number of seasons without a terminal.  Display a summary at the end. '''
+        self.setHeadless()
+        firstSeason = self.seasonIndex
+        startTime = time.perf_counter()
+        players, retiredPlayers, seasons = self.run(numSeasons)
+        elapsedTime = time.perf_counter() - startTime
+        numPlayed = self.seasonIndex - firstSeason
+
+        # Display the summary.
+        print(f'Played {numPlayed} seasons in {elapsedTime:.2f}s ({numPlayed / elapsedTime:,.1f} seasons/sec).')
+        print(f'{len(retiredPlayers)} players retired.  {len(players)} players on the tour.')
+        print(f'Last season: {seasons[-1]}')
+        print('Most wins')
+        for count, player in enumerate(self.topWins(players, retiredPlayers, 10), 1):
+            print(f'{count:>5} {player.nameWithYearRange():<28}{player.wins:>4}{player.wins + player.runnerUp:>4}{player.worldChampion:>8}{player.prizeMoney:>16,.2f}')
 
 
 
@@ -793,8 +1173,66 @@ if __name__ == '__main__':
     # This might end the program (--help).
     argParse = argparse.ArgumentParser(prog='sport_of_life', description='Little game to run under Linux and Windows.')
     argParse.add_argument('-n', '--names', help='Test the player names.', action='store_true')
+    argParse.add_argument('-f', '--fast', help='Play the matches with the fast match engine.', action='store_true')
+    argParse.add_argument('--headless', help='Play without a terminal and display a summary at the end.', action='store_true')
+    argParse.add_argument('-s', '--seasons', help='The number of seasons to play.', type=int, default=None)
+    argParse.add_argument('-p', '--players', help='The number of players on the tour.', type=int, default=80)
+    argParse.add_argument('-t', '--table', help='Hold the players in an array backed table (requires NumPy).', action='store_true')
+    argParse.add_argument('--fps', help='The maximum frame rate of the display.  0 to draw every point.', type=float, default=30)
+    argParse.add_argument('-o', '--odds', help='Display the odds before each tournament from this number of simulations.', type=int, default=0)
+    argParse.add_argument('-j', '--journal', help='Append the events of the game to this journal file.', default=None)
+    argParse.add_argument('-e', '--export', help='Export the result of every match to this file (.csv, .parquet or .arrow).', default=None)
+    argParse.add_argument('-d', '--database', help='Store the players, tournaments and matches in this SQLite database.', default=None)
+    argParse.add_argument('--snapshot', help='Save the state of the game to this file at the end of each season.', default=None)
+    argParse.add_argument('--resume', help='Resume the game from the snapshot file.', action='store_true')
+    argParse.add_argument('--seed', help='The master seed of the random number streams.  The same seed plays the same game.', type=int, default=None)
+    argParse.add_argument('--speed', help='The speed of the game: 1 for real time, 10 for 10 times real time or inf for no waits.', type=float, default=clock.REAL_TIME)
+    argParse.add_argument('--stats', help='Display the time spent in each phase of the game after each season and at the end.', action='store_true')
     args = argParse.parse_args()
 
+    if args.table and not player_table.isAvailable():
+        print('The --table option requires NumPy.')
+        sys.exit(1)
+    if args.export is not None and not match_export.isAvailable(args.export):
+        print(f'The --export format of "{args.export}" requires pyarrow.')
+        sys.exit(1)
+    if args.resume and args.snapshot is None:
+        print('The --resume option requires --snapshot FILE.')
+        sys.exit(1)
+    if args.players < 2:
+        print('The tour needs at least 2 players.')
+        sys.exit(1)
+    if args.speed <= 0:
+        print('The --speed must be more than 0.')
+        sys.exit(1)
+    if args.seed is not None and not 0 <= args.seed <= rng.MAX_SEED:
+        print(f'The --seed must be from 0 to {rng.MAX_SEED}.')
+        sys.exit(1)
+
+    if args.headless:
+        # Only display the summary.
+        game = Game()
+        game.isPlayerTable = args.table
+        game.numPlayers = args.players
+        if args.journal is not None:
+            game.journal = journal.Journal(args.journal)
+        if args.export is not None:
+            game.matchExport = match_export.MatchExport(args.export)
+        if args.database is not None:
+            game.database = Database(args.database)
+        game.streams = rng.RandomStreams(args.seed)
+        game.snapshotFile = args.snapshot
+        if args.resume and os.path.exists(args.snapshot):
+            snapshot.load(args.snapshot, game)
+        if args.stats:
+            game.profiler = PhaseProfiler()
+            game.profiler.addListener(game.showStats)
+        game.runHeadless(100 if args.seasons is None else args.seasons)
+        if args.stats:
+            print(f'Total phases ({game.profiler.numSeasons} seasons)')
+            print('\n'.join(game.profiler.report()))
+        sys.exit(0)
+
     # Welcome message.
     print(f'{ansi.RED}Sport Of Life{ansi.RESET_ALL} by Steve Walton 2018-2022.')
     print(f'Python Version {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro} (expecting Python 3).')
@@ -821,7 +1259,36 @@ if __name__ == '__main__':
     if isRunProgram:
         # Main loop.
         game = Game()
-        game.run()
+        game.isPlayerTable = args.table
+        game.numPlayers = args.players
+        game.framesPerSecond = args.fps
+        if args.journal is not None:
+            game.journal = journal.Journal(args.journal)
+        if args.export is not None:
+            game.matchExport = match_export.MatchExport(args.export)
+        if args.database is not None:
+            game.database = Database(args.database)
+        game.streams = rng.RandomStreams(args.seed)
+        game.snapshotFile = args.snapshot
+        if args.resume:
+            if os.path.exists(args.snapshot):
+                snapshot.load(args.snapshot, game)
+                print(f'Resume from season {game.seasonIndex}.')
+            else:
+                print(f'There is no snapshot "{args.snapshot}".  Start a new game.')
+        if args.fast:
+            game.matchEngine = match_engine.FAST
+        game.clock.speed = args.speed
+        if args.odds > 0:
+            game.oddsEngine = tournament_odds.OddsEngine()
+            game.numOddsReplicates = args.odds
+        if args.stats:
+            game.profiler = PhaseProfiler()
+            game.profiler.addListener(game.showStats)
+        game.run(args.seasons)
+        if args.stats:
+            print(f'Total phases ({game.profiler.numSeasons} seasons)')
+            print('\n'.join(game.profiler.report()))
 
     print(f'Goodbye from the {ansi.RED}Sport Of Life{ansi.RESET_ALL} program.')
 
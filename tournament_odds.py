@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+'''
+Module to estimate the tournament odds for the players in the sport of life program.
+The tournament is replayed many times with the fast match engine on copies of the players.
+The replicates are spread across a pool of processes.
+Each replicate has its own random number stream from the master seed, so the odds do not depend on the number of processes.
+'''
+
+# System libraries.
+import copy
+
+# Application Libraries.
+import bracket
+import rng
+from process_pool import ProcessPool, splitChunks
+from player_table import PlayerView
+
+
+
+# The tournaments of the game that can be replayed.  Any BracketSpec can be replayed.
+OPEN = bracket.OPEN
+SEEDED = bracket.SEEDED
+WORLD = bracket.WORLD_CHAMPIONSHIP
+
+
+
+def copyPlayers(players):
+    '''
+    Returns copies of the players that a tournament can be played with without changing the original players.
+    The rows of a :py:class:`~player_table.PlayerTable` are copied into detached players.
+    '''
+    copies = []
+    for player in players:
+        if isinstance(player, PlayerView):
+            copies.append(player.toPlayer())
+        else:
+            playerCopy = copy.copy(player)
+            playerCopy.history = copy.copy(player.history)
+            copies.append(playerCopy)
+    return copies
+
+
+
+def playReplicates(players, tournament, firstReplicate, numReplicates, seed):
+    '''
+    Returns the number of times each player finished at each stage of the tournament.
+    This is the worker function for the process pool.
+
+    :param list players: The players to play the tournament with.  These are not changed.
+    :param BracketSpec tournament: The draw of the tournament to play.
+    :param int firstReplicate: The index of the first replicate.
+    :param int numReplicates: The number of times to play the tournament.
+    :param int seed: The master seed.  Each replicate uses the tournament stream of its index.
+    '''
+    # Import here to avoid a circular import with the game module.
+    from sport_of_life import Game  # pylint: disable=import-outside-toplevel
+
+    game = Game()
+    game.setHeadless()
+    game.streams = rng.RandomStreams(seed)
+    game.tournamentIndex = firstReplicate
+
+    numStages = tournament.plan(len(players)).numStages
+    counts = [[0] * numStages for _ in players]
+    for _replicate in range(numReplicates):
+        copies = copyPlayers(players)
+        game.playBracket(copies, tournament, '', 0.0)
+        for playerIndex, player in enumerate(copies):
+            counts[playerIndex][-player.round] += 1
+
+    return counts
+
+
+
+class TournamentOdds:
+    '''
+    Class to represent the estimated odds of each player in a tournament.
+
+    :ivar list players: The players in the tournament.
+    :ivar list counts: The number of times each player finished at each stage.
+    :ivar int numReplicates: The number of times the tournament was played.
+    :ivar list stageNames: The name of each stage.  Stage 0 is losing in qualifying and the last stage is the winner.
+    '''
+
+
+
+    def __init__(self, players, counts, numReplicates, stageNames):
+        ''' Class constructor. '''
+        self.players = players
+        self.counts = counts
+        self.numReplicates = numReplicates
+        self.stageNames = stageNames
+
+
+
+    def reachProbabilities(self, playerIndex):
+        ''' Returns the probability that the specified player reaches each stage of the tournament. '''
+        probabilities = []
+        reached = self.numReplicates
+        for stage in range(len(self.stageNames)):
+            probabilities.append(reached / self.numReplicates)
+            reached -= self.counts[playerIndex][stage]
+        return probabilities
+
+
+
+    def winProbability(self, playerIndex):
+        ''' Returns the probability that the specified player wins the tournament. '''
+        return self.counts[playerIndex][-1] / self.numReplicates
+
+
+
+    def favourites(self, numShow):
+        ''' Returns the indexes of the players most likely to win the tournament. '''
+        return sorted(range(len(self.players)), key=lambda playerIndex: self.counts[playerIndex][-1], reverse=True)[:numShow]
+
+
+
+class OddsEngine:
+    '''
+    Class to estimate the tournament odds on a pool of processes.
+
+    :ivar ProcessPool pool: The pool of processes that play the replicates.
+    '''
+
+
+
+    def __init__(self, numProcesses=None):
+        '''
+        Class constructor.
+
+        :param int numProcesses: The number of processes in the pool.  None for the number of cores.
+        '''
+        self.pool = ProcessPool(numProcesses)
+
+
+
+    def close(self):
+        ''' Shutdown the pool of processes. '''
+        self.pool.close()
+
+
+
+    def odds(self, players, tournament, numReplicates, seed=None):
+        '''
+        Returns the :py:class:`TournamentOdds` for the players in the specified tournament.
+
+        :param list players: The players in the tournament.  These are not changed.
+        :param BracketSpec tournament: The draw of the tournament to play.
+        :param int numReplicates: The number of times to play the tournament.
+        :param int seed: The master seed.  None for a random master seed.
+        '''
+        # Split the replicates into chunks.
+        if seed is None:
+            seed = rng.newSeed()
+        chunks = splitChunks(numReplicates, 4 * self.pool.numProcesses)
+        results = self.pool.map(playReplicates, [(players, tournament, firstReplicate, numChunkReplicates, seed) for firstReplicate, numChunkReplicates in chunks])
+
+        # Merge the counts.
+        stageNames = tournament.plan(len(players)).stageNames
+        counts = [[0] * len(stageNames) for _ in players]
+        for result in results:
+            for playerCounts, chunkCounts in zip(counts, result):
+                for stage, count in enumerate(chunkCounts):
+                    playerCounts[stage] += count
+
+        return TournamentOdds(players, counts, numReplicates, stageNames)